@@ -0,0 +1,42 @@
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def run_periodically(name: str, interval_seconds: float, func, *args, initial_delay: float = 0):
+    """
+    Runs a blocking `func(*args)` in the default executor every
+    `interval_seconds` until cancelled. Failures are logged, never raised,
+    so one bad run doesn't kill the loop.
+    """
+    loop = asyncio.get_running_loop()
+    if initial_delay:
+        await asyncio.sleep(initial_delay)
+
+    while True:
+        try:
+            await loop.run_in_executor(None, func, *args)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception(f"Background task '{name}' failed")
+        await asyncio.sleep(interval_seconds)
+
+
+async def run_once(name: str, func, *args):
+    """Runs a blocking `func(*args)` once in the default executor (startup passes), logging failures."""
+    loop = asyncio.get_running_loop()
+    try:
+        await loop.run_in_executor(None, func, *args)
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        logger.exception(f"Background task '{name}' failed")
+
+
+async def cancel_tasks(tasks):
+    """Cancels background tasks started in the app lifespan and waits for them."""
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
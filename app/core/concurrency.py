@@ -0,0 +1,62 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait
+from fastapi import HTTPException
+from neo4j import Query
+from app.core.config import settings
+from app.core.database import db
+
+logger = logging.getLogger(__name__)
+
+# Bounded so a burst of dashboard loads can't open unlimited sessions
+_executor = ThreadPoolExecutor(
+    max_workers=settings.SUBQUERY_MAX_WORKERS,
+    thread_name_prefix="subquery",
+)
+
+
+def timed_query(cypher: str) -> Query:
+    """Wraps Cypher with a server-side timeout so abandoned sub-queries stop on the DB too."""
+    return Query(cypher, timeout=settings.SUBQUERY_TIMEOUT_SECONDS)
+
+
+def _with_session(func):
+    session = db.get_session()
+    try:
+        return func(session)
+    finally:
+        session.close()
+
+
+def run_concurrently(subqueries: dict, fallbacks: dict = None, timeout: float = None):
+    """
+    Runs independent sub-queries of a composite endpoint in parallel, each
+    on its own session, so page latency is the slowest sub-query rather
+    than the sum of all of them.
+
+    `subqueries` maps a name to a callable taking a session. Names present
+    in `fallbacks` degrade to their fallback value on error or timeout
+    (partial result); any other failure is raised, timeouts as 504.
+    """
+    fallbacks = fallbacks or {}
+    timeout = timeout or settings.SUBQUERY_TIMEOUT_SECONDS
+
+    futures = {name: _executor.submit(_with_session, fn) for name, fn in subqueries.items()}
+    wait(futures.values(), timeout=timeout)
+
+    results = {}
+    for name, future in futures.items():
+        try:
+            if not future.done():
+                future.cancel()
+                raise TimeoutError(f"sub-query '{name}' exceeded {timeout}s")
+            results[name] = future.result()
+        except HTTPException:
+            raise
+        except Exception as e:
+            if name not in fallbacks:
+                if isinstance(e, TimeoutError):
+                    raise HTTPException(status_code=504, detail="Request timed out")
+                raise
+            logger.warning(f"Sub-query '{name}' failed, serving partial result: {e}")
+            results[name] = fallbacks[name]
+    return results
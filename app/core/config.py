@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, Optional
 
 class Settings(BaseSettings):
     NEO4J_URI: str
@@ -9,13 +9,84 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
+    # Embed signed display claims (name, department, id, picture) so menus
+    # and headers render without a database hit. POST /auth/refresh re-issues
+    # the token after a profile change.
+    JWT_DISPLAY_CLAIMS: bool = True
     
+    # Password hashing process pool
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
     OPENAI_API_KEY: Optional[str] = None  
     
-    CLOUDINARY_CLOUD_NAME: str
-    CLOUDINARY_API_KEY: str
-    CLOUDINARY_API_SECRET: str
-    
+    # File storage: "cloudinary" or "local" (LOCAL_UPLOAD_DIR, served at
+    # /uploads). Cloudinary without credentials falls back to local.
+    STORAGE_BACKEND: str = "cloudinary"
+    CLOUDINARY_CLOUD_NAME: Optional[str] = None
+    CLOUDINARY_API_KEY: Optional[str] = None
+    CLOUDINARY_API_SECRET: Optional[str] = None
+    LOCAL_UPLOAD_DIR: str = "uploads"
+    LOCAL_UPLOAD_BASE_URL: str = "/uploads"  # absolute URL when the frontend is on another origin
+    UPLOAD_MAX_BYTES: int = 5 * 1024 * 1024
+    UPLOAD_CHUNK_BYTES: int = 64 * 1024
+    # Signup photo uploads are unauthenticated: per-IP cap (0 disables)
+    UPLOAD_RATE_LIMIT: int = 10
+    UPLOAD_RATE_WINDOW_SECONDS: int = 600
+
+    # Soft skill matching (see app/scripts/build_concept_similarity.py)
+    CONCEPT_SIMILARITY_TOP_N: int = 10
+    CONCEPT_SIMILARITY_MIN_WEIGHT: float = 0.6
+
+    # In-process vector index (fallback + filtered semantic search)
+    VECTOR_INDEX_REFRESH_SECONDS: int = 900
+    VECTOR_SEARCH_MAX_CANDIDATES: int = 1000
+
+    # In-memory facet counts for the browse lists (full rebuild interval)
+    FACET_INDEX_REFRESH_SECONDS: int = 900
+
+    # Concurrent sub-queries in composite endpoints
+    SUBQUERY_TIMEOUT_SECONDS: float = 10.0
+    SUBQUERY_MAX_WORKERS: int = 16
+
+    # Transactional outbox (registration side effects)
+    OUTBOX_POLL_SECONDS: float = 2.0
+    OUTBOX_BATCH_SIZE: int = 20
+    OUTBOX_MAX_ATTEMPTS: int = 8
+    OUTBOX_RETRY_BASE_SECONDS: int = 5
+    OUTBOX_LEASE_SECONDS: int = 300
+
+    # Notification push (SSE). Set the socket dir when running several
+    # workers on one host so they forward events to each other.
+    SSE_HEARTBEAT_SECONDS: int = 15
+    SSE_QUEUE_SIZE: int = 100
+    NOTIFICATION_BUS_SOCKET_DIR: Optional[str] = None
+    # Repair job for the maintained User.unread_count (0 disables)
+    UNREAD_RECOUNT_SECONDS: int = 86400
+
+    # Notification retention: TTL in days per type ("*" = any other type),
+    # separately for read and unread notifications. JSON in the env.
+    NOTIFICATION_READ_TTL_DAYS: Dict[str, int] = {"*": 30, "WELCOME": 7}
+    NOTIFICATION_UNREAD_TTL_DAYS: Dict[str, int] = {"*": 180}
+    NOTIFICATION_ARCHIVE_DIR: Optional[str] = None  # gzip JSONL archive; None = delete only
+    NOTIFICATION_RETENTION_BATCH_SIZE: int = 1000
+    NOTIFICATION_RETENTION_SECONDS: int = 86400  # 0 disables the scheduled run
+
+    # Reconcile job for Opening applicant/interest/shortlisted counters (0 disables)
+    OPENING_COUNTER_RECONCILE_SECONDS: int = 86400
+
+    # Closes openings past their deadline and drops their :ActiveOpening label (0 disables)
+    OPENING_LIFECYCLE_SECONDS: int = 3600
+
+    # Notification digests: same-type notifications about one target within
+    # a window collapse into one entry with a counter and an actor sample
+    NOTIFICATION_DIGEST_WINDOW_SECONDS: int = 3600
+    NOTIFICATION_DIGEST_SAMPLE_SIZE: int = 5
+
+    # Bulk import (app/scripts/bulk_import.py): rows per UNWIND write
+    BULK_IMPORT_BATCH_SIZE: int = 500
+
     class Config:
         env_file = ".env"
         extra = "ignore" 
@@ -0,0 +1,78 @@
+import hashlib
+import threading
+import uuid
+from collections import defaultdict
+from typing import Optional
+
+from fastapi import Request, Response
+
+# Versions live in process memory. With several uvicorn workers the
+# notification bus forwards every bump to the other workers (see
+# set_broadcast), so no worker keeps answering 304 after a write elsewhere.
+# The epoch is per process and changes on every restart, so ETags issued
+# by another worker or before a restart never match.
+_EPOCH = uuid.uuid4().hex[:8]
+_versions = defaultdict(int)
+_lock = threading.Lock()
+_broadcast = None
+
+# Shared read-model scopes: bumped by writes that change what *other* users see
+OPENINGS = "openings"   # opening lists on the student home / collaborations
+STUDENTS = "students"   # student skills feeding the faculty home matching
+
+
+def user_key(user_id: str) -> str:
+    return f"user:{user_id}"
+
+
+def set_broadcast(func):
+    """Registers `func(keys)` to forward local bumps to peer workers (None to stop)."""
+    global _broadcast
+    _broadcast = func
+
+
+def apply_bump(keys):
+    """Bumps `keys` in this process only (local writes and bumps received from peers)."""
+    with _lock:
+        for key in keys:
+            _versions[key] += 1
+
+
+def bump(*keys: str):
+    """Invalidates every cached read model built from `keys`, in every worker."""
+    keys = [key for key in keys if key]
+    if not keys:
+        return
+    apply_bump(keys)
+    if _broadcast is not None:
+        _broadcast(keys)
+
+
+def bump_users(*user_ids: str):
+    bump(*(user_key(uid) for uid in user_ids if uid))
+
+
+def current_etag(*keys: str) -> str:
+    with _lock:
+        parts = [f"{key}={_versions[key]}" for key in keys]
+    digest = hashlib.sha1("|".join(parts).encode()).hexdigest()[:16]
+    return f'W/"{_EPOCH}-{digest}"'
+
+
+def check_not_modified(request: Request, response: Response, *keys: str) -> Optional[Response]:
+    """
+    Conditional GET helper. Returns a 304 response when the client's
+    If-None-Match still matches the read model built from `keys`
+    (no database work needed); otherwise stamps the ETag on `response`
+    and returns None so the handler builds the body as usual.
+    """
+    etag = current_etag(*keys)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    candidates = {tag.strip() for tag in if_none_match.split(",") if tag.strip()}
+    if etag in candidates or "*" in candidates:
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
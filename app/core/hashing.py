@@ -0,0 +1,35 @@
+from passlib.context import CryptContext
+
+# Runs inside the password-hashing worker processes (see app/core/security.py).
+# Deliberately imports nothing from the app so spawned workers start fast.
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def configure(rounds: int):
+    """Worker initializer: sets the target bcrypt cost for hashing and `needs_update`."""
+    global pwd_context
+    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+
+
+def hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def verify_and_update(plain_password: str, hashed_password: str):
+    """
+    Returns (matches, new_hash). `new_hash` is set when the stored hash
+    verified but `needs_update` reports an outdated scheme or cost.
+    """
+    if not hashed_password:
+        return False, None
+    try:
+        if not pwd_context.verify(plain_password, hashed_password):
+            return False, None
+    except ValueError:
+        # Unrecognised / corrupt stored hash
+        return False, None
+
+    if pwd_context.needs_update(hashed_password):
+        return True, pwd_context.hash(plain_password)
+    return True, None
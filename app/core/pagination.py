@@ -0,0 +1,80 @@
+import base64
+import binascii
+import json
+from typing import Optional
+
+from fastapi import HTTPException, Response
+
+# Keyset pagination: list endpoints fetch `limit + 1` rows ordered by a
+# unique sort key, return `limit`, and hand back the last row's key as an
+# opaque cursor in the X-Next-Cursor header (absent on the last page).
+# Bodies keep their existing shape.
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def _jsonable(value):
+    # neo4j DateTime / python datetime -> ISO string (compare with datetime($x) in Cypher)
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+def encode_cursor(*values) -> str:
+    raw = json.dumps([_jsonable(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], size: int) -> Optional[list]:
+    """Returns the cursor's `size` key values, None for the first page; 400 if tampered."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, binascii.Error):
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def keyset_condition(keys: list, cursor: Optional[str], descending: bool = False):
+    """
+    Cypher predicate for "rows after the cursor" under ORDER BY `keys`
+    (all ascending or all descending), plus its params. A key is a Cypher
+    expression, or (expression, "datetime") for temporal keys whose cursor
+    value travels as an ISO string. First page: ("true", {}).
+    """
+    after = decode_cursor(cursor, len(keys))
+    if after is None:
+        return "true", {}
+
+    exprs, values = [], []
+    for i, key in enumerate(keys):
+        expr, cast = key if isinstance(key, tuple) else (key, None)
+        exprs.append(expr)
+        values.append(f"{cast}($after_{i})" if cast else f"$after_{i}")
+
+    op = "<" if descending else ">"
+    branches = []
+    for i in range(len(exprs)):
+        terms = [f"{exprs[j]} = {values[j]}" for j in range(i)] + [f"{exprs[i]} {op} {values[i]}"]
+        branches.append("(" + " AND ".join(terms) + ")")
+    return "(" + " OR ".join(branches) + ")", {f"after_{i}": v for i, v in enumerate(after)}
+
+
+def next_page(rows: list, limit: int, key):
+    """
+    Splits a `limit + 1` fetch into (page, next_cursor). `key(row)` returns
+    the tuple of sort-key values the next page continues after.
+    """
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode_cursor(*key(page[-1]))
+
+
+def set_next_cursor(response: Response, cursor: Optional[str]):
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
@@ -0,0 +1,52 @@
+import threading
+import time
+from collections import defaultdict, deque
+
+from fastapi import HTTPException, Request
+
+
+class RateLimiter:
+    """
+    Sliding-window request limit per key (usually the client IP). Like the
+    ETag versions, state lives in process memory (single uvicorn worker).
+    """
+
+    def __init__(self, limit: int, window_seconds: int):
+        self.limit = limit
+        self.window = window_seconds
+        self._hits = defaultdict(deque)
+        self._lock = threading.Lock()
+        self._calls = 0
+
+    def hit(self, key: str) -> bool:
+        """Records a request for `key`; False if it is over the limit."""
+        now = time.monotonic()
+        with self._lock:
+            self._calls += 1
+            if self._calls % 1000 == 0:
+                self._sweep(now)
+
+            hits = self._hits[key]
+            while hits and hits[0] <= now - self.window:
+                hits.popleft()
+            if len(hits) >= self.limit:
+                return False
+            hits.append(now)
+            return True
+
+    def _sweep(self, now: float):
+        # Drop clients whose whole window has expired
+        for key in [k for k, hits in self._hits.items() if not hits or hits[-1] <= now - self.window]:
+            del self._hits[key]
+
+    def check(self, request: Request):
+        """Raises 429 once the caller's IP is over the limit."""
+        if self.limit <= 0:
+            return
+        client = request.client.host if request.client else "unknown"
+        if not self.hit(client):
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests; try again later",
+                headers={"Retry-After": str(self.window)},
+            )
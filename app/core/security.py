@@ -1,27 +1,131 @@
 from datetime import datetime, timedelta
 from jose import jwt, JWTError
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from app.core.config import settings
+from app.core import hashing
+import asyncio
+import multiprocessing
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+# ---------------------------------------------------------
+# Password hashing (bcrypt in a dedicated, bounded process pool)
+# ---------------------------------------------------------
+_hash_pool = None
+_hash_stats = {
+    "pending": 0,        # queued + running right now
+    "peak_pending": 0,
+    "completed": 0,
+    "rejected": 0,       # turned away because the queue was full
+    "failed": 0,
+    "total_seconds": 0.0,
+}
+
+
+def _get_hash_pool() -> ProcessPoolExecutor:
+    global _hash_pool
+    if _hash_pool is None:
+        # spawn: never fork a process holding the Neo4j driver / event loop
+        _hash_pool = ProcessPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=hashing.configure,
+            initargs=(settings.BCRYPT_ROUNDS,),
+        )
+    return _hash_pool
+
+
+def shutdown_hash_pool():
+    global _hash_pool
+    if _hash_pool is not None:
+        _hash_pool.shutdown(wait=False, cancel_futures=True)
+        _hash_pool = None
+
+
+def hash_pool_stats() -> dict:
+    completed = _hash_stats["completed"]
+    return {
+        "workers": settings.PASSWORD_HASH_WORKERS,
+        "max_pending": settings.PASSWORD_HASH_MAX_PENDING,
+        "pending": _hash_stats["pending"],
+        "peak_pending": _hash_stats["peak_pending"],
+        "completed": completed,
+        "rejected": _hash_stats["rejected"],
+        "failed": _hash_stats["failed"],
+        "avg_ms": round(_hash_stats["total_seconds"] * 1000 / completed, 1) if completed else None,
+    }
+
+
+async def _run_in_hash_pool(func, *args):
+    """
+    Awaits `func(*args)` in the hashing pool without holding a request
+    thread. Beyond PASSWORD_HASH_MAX_PENDING outstanding jobs, callers get
+    a fast 503 instead of queueing behind a login burst.
+    """
+    global _hash_pool
+    if _hash_stats["pending"] >= settings.PASSWORD_HASH_MAX_PENDING:
+        _hash_stats["rejected"] += 1
+        logger.warning(f"Password hashing queue full ({_hash_stats['pending']} pending)")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+
+    _hash_stats["pending"] += 1
+    _hash_stats["peak_pending"] = max(_hash_stats["peak_pending"], _hash_stats["pending"])
+    started = time.perf_counter()
+    try:
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(_get_hash_pool(), func, *args)
+        _hash_stats["completed"] += 1
+        _hash_stats["total_seconds"] += time.perf_counter() - started
+        return result
+    except BrokenProcessPool:
+        _hash_stats["failed"] += 1
+        logger.exception("Password hashing pool broke; recreating on next use")
+        _hash_pool = None
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    finally:
+        _hash_stats["pending"] -= 1
+
+
+async def hash_password(password: str) -> str:
+    return await _run_in_hash_pool(hashing.hash_password, password)
+
 
+async def verify_password(plain_password: str, hashed_password: str):
+    """Returns (matches, new_hash); `new_hash` is set when the stored hash should be upgraded."""
+    return await _run_in_hash_pool(hashing.verify_and_update, plain_password, hashed_password)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
 
+# Display-only claims carried in the token (never used for authorization)
+DISPLAY_CLAIMS = ("name", "department", "id_number", "profile_picture")
 
-def create_access_token(user_id: str, role: str):
+
+def display_claims_for(user: dict) -> dict:
+    """Maps User node properties to the display claims embedded in tokens."""
+    return {
+        "name": user.get("name"),
+        "department": user.get("department"),
+        "id_number": user.get("roll_no") or user.get("employee_id"),
+        "profile_picture": user.get("profile_picture") or user.get("pic"),
+    }
+
+
+def create_access_token(user_id: str, role: str, claims: dict | None = None):
     expire = datetime.utcnow() + timedelta(
         minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
     )
@@ -32,6 +136,11 @@ def create_access_token(user_id: str, role: str):
         "exp": expire,
     }
 
+    if claims and settings.JWT_DISPLAY_CLAIMS:
+        payload["profile"] = {
+            k: claims[k] for k in DISPLAY_CLAIMS if claims.get(k) is not None
+        }
+
     return jwt.encode(
         payload,
         settings.JWT_SECRET_KEY,
@@ -58,7 +167,8 @@ def decode_token(token: str):
 def get_current_user(token: str = Depends(oauth2_scheme)):
     """
     Dependency to extract and validate the current user from JWT.
-    Returns a dict with user_id and role.
+    Returns a dict with user_id and role, plus any display claims
+    (name, department, id_number, profile_picture) the token carries.
     """
     payload = decode_token(token)
 
@@ -71,7 +181,10 @@ def get_current_user(token: str = Depends(oauth2_scheme)):
             detail="Invalid authentication credentials",
         )
 
+    profile = payload.get("profile") or {}
+
     return {
+        **{k: profile[k] for k in DISPLAY_CLAIMS if k in profile},
         "user_id": user_id,
         "role": role,
     }
@@ -3,6 +3,17 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles  # <--- THIS WAS MISSING
 from contextlib import asynccontextmanager
 from app.core.database import db
+from app.core.config import settings
+from app.core.background import run_periodically, run_once, cancel_tasks
+from app.core.security import shutdown_hash_pool, hash_pool_stats
+from app.services.vector_index import vector_index
+from app.services.facet_index import facet_index
+from app.services.outbox import process_outbox, enqueue_missing_opening_embeddings
+from app.services.notification_bus import notification_bus
+from app.services.notification_service import recount_unread_counts
+from app.services.notification_retention import prune_notifications
+from app.services.opening_counters import reconcile_opening_counters
+from app.services.opening_lifecycle import close_expired_openings, sync_opening_lifecycle
 import asyncio
 import os
 
@@ -16,27 +27,79 @@ from app.routers import (
     faculty_projects, 
     dashboard,
     applications,
-    notifications
+    notifications,
+    exports
 )
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     loop = asyncio.get_running_loop()
+    tasks = []
     try:
         # Connect to DB on startup
         await loop.run_in_executor(None, db.connect)
+        notification_bus.start(loop)
+
+        # Background jobs (don't block startup)
+        tasks.append(asyncio.create_task(run_periodically(
+            "vector-index-refresh", settings.VECTOR_INDEX_REFRESH_SECONDS, vector_index.load_from_graph
+        )))
+        tasks.append(asyncio.create_task(run_periodically(
+            "facet-index-refresh", settings.FACET_INDEX_REFRESH_SECONDS, facet_index.load_from_graph
+        )))
+        tasks.append(asyncio.create_task(run_periodically(
+            "outbox", settings.OUTBOX_POLL_SECONDS, process_outbox
+        )))
+        # Openings created before they were embedded on create
+        tasks.append(asyncio.create_task(run_once("opening-embeddings", enqueue_missing_opening_embeddings)))
+        # First recount at startup: users from before the maintained
+        # counter would otherwise read 0 unread until the first run
+        if settings.UNREAD_RECOUNT_SECONDS > 0:
+            tasks.append(asyncio.create_task(run_periodically(
+                "unread-recount", settings.UNREAD_RECOUNT_SECONDS, recount_unread_counts
+            )))
+        else:
+            tasks.append(asyncio.create_task(run_once("unread-recount", recount_unread_counts)))
+        if settings.NOTIFICATION_RETENTION_SECONDS > 0:
+            tasks.append(asyncio.create_task(run_periodically(
+                "notification-retention", settings.NOTIFICATION_RETENTION_SECONDS, prune_notifications,
+                initial_delay=60
+            )))
+        # Counters are read from the Opening: the first reconcile runs at
+        # startup so openings created before they existed aren't read as 0
+        if settings.OPENING_COUNTER_RECONCILE_SECONDS > 0:
+            tasks.append(asyncio.create_task(run_periodically(
+                "opening-counter-reconcile", settings.OPENING_COUNTER_RECONCILE_SECONDS,
+                reconcile_opening_counters
+            )))
+        else:
+            tasks.append(asyncio.create_task(run_once("opening-counter-reconcile", reconcile_opening_counters)))
+        # Browse queries MATCH :ActiveOpening, so the label backfill always
+        # runs; closing expired openings is what the setting switches off
+        lifecycle_enabled = settings.OPENING_LIFECYCLE_SECONDS > 0
+        tasks.append(asyncio.create_task(run_once(
+            "opening-lifecycle-sync", sync_opening_lifecycle, lifecycle_enabled
+        )))
+        if lifecycle_enabled:
+            tasks.append(asyncio.create_task(run_periodically(
+                "opening-lifecycle", settings.OPENING_LIFECYCLE_SECONDS, close_expired_openings,
+                initial_delay=settings.OPENING_LIFECYCLE_SECONDS
+            )))
         yield
     finally:
+        await cancel_tasks(tasks)
+        notification_bus.stop()
+        shutdown_hash_pool()
         # Close DB on shutdown
         await loop.run_in_executor(None, db.close)
 
 app = FastAPI(title="Guru Setu API", lifespan=lifespan)
 
 # 1. Ensure directory exists
-os.makedirs("uploads", exist_ok=True)
+os.makedirs(settings.LOCAL_UPLOAD_DIR, exist_ok=True)
 
 # 2. Mount static files (This line caused the error before)
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+app.mount("/uploads", StaticFiles(directory=settings.LOCAL_UPLOAD_DIR), name="uploads")
 
 # ✅ DEFINING ALLOWED ORIGINS
 origins = [
@@ -51,12 +114,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allows all methods (GET, POST, OPTIONS, etc.)
     allow_headers=["*"],  # Allows all headers (Authorization, etc.)
+    expose_headers=["ETag", "X-Next-Cursor"],  # If-None-Match + keyset pagination
 )
 
 @app.get("/")
 def read_root():
     return {"message": "Guru Setu Backend is Running 🚀"}
 
+@app.get("/health")
+def health():
+    # Queue depth of the password-hashing pool shows login bursts backing up
+    return {"status": "ok", "password_hashing": hash_pool_stats()}
+
 # Register Routers
 app.include_router(auth.router, prefix="/auth", tags=["Auth"])
 app.include_router(users.router, prefix="/users", tags=["Profiles"])
@@ -66,4 +135,5 @@ app.include_router(student_projects.router, prefix="/student-projects", tags=["S
 app.include_router(faculty_projects.router, prefix="/faculty-projects", tags=["Faculty Research"])
 app.include_router(dashboard.router, prefix="/dashboard", tags=["Dashboard"])
 app.include_router(applications.router, prefix="/applications", tags=["Applications"]) # <--- NEW REGISTER
-app.include_router(notifications.router, prefix="/notifications", tags=["Notifications"]) # <--- 2. REGISTER IT
\ No newline at end of file
+app.include_router(notifications.router, prefix="/notifications", tags=["Notifications"]) # <--- 2. REGISTER IT
+app.include_router(exports.router, prefix="/exports", tags=["Exports"])
\ No newline at end of file
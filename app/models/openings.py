@@ -14,4 +14,8 @@ class OpeningCreate(BaseModel):
     deadline: date
     
     # --- THIS FIELD IS MANDATORY FOR COLLABORATIONS ---
-    collaboration_type: Optional[str] = None
\ No newline at end of file
+    collaboration_type: Optional[str] = None
+
+class OpeningImport(OpeningCreate):
+    """One row of a bulk opening import: an opening plus the posting faculty."""
+    faculty_email: str
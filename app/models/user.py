@@ -31,6 +31,7 @@ class StudentProfileUpdate(BaseModel):
     phone: Optional[str] = None
     department: Optional[str] = None
     batch: Optional[str] = None
+    cgpa: Optional[float] = None
     bio: Optional[str] = None
     
     skills: List[str] = []
@@ -45,6 +46,12 @@ class StudentProfileUpdate(BaseModel):
             raise ValueError(f'Maximum 20 skills allowed. You have {len(v)}.')
         return v
 
+    @validator('cgpa')
+    def validate_cgpa_range(cls, v):
+        if v is not None and not 0 <= v <= 10:
+            raise ValueError('CGPA must be between 0 and 10.')
+        return v
+
 # --- Faculty Profile Model ---
 class FacultyProfileUpdate(BaseModel):
     name: Optional[str] = None
@@ -1,17 +1,62 @@
 from fastapi import APIRouter, HTTPException, Depends
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from typing import List
 from app.core.database import db
 from app.core.security import get_current_user
+from app.core.etag import bump_users
+from app.services.opening_counters import SHORTLISTED_INCREMENT, SHORTLISTED_DECREMENT
+from app.services.notification_service import (
+    NOTIFICATION_FIELDS, NOTIFICATION_MAP, publish_notification, unread_increment,
+    digest_fragment, digest_params,
+)
 from datetime import datetime
 import uuid
 
 router = APIRouter()
 
-# --- Model for Status Update ---
-class ApplicationStatusUpdate(BaseModel):
-    opening_id: str
-    student_id: str
-    status: str  # "Shortlisted" or "Rejected"
+# "X applied for Y", then "12 students applied for Y" as more arrive
+APPLICATION_DIGEST = digest_fragment(
+    "f", "u", "o.id",
+    'u.name + " applied for " + o.title',
+    'toString(n.actor_count) + " students applied for " + o.title',
+)
+
+APPLY_QUERY = f"""
+MATCH (u:User {{user_id: $uid}})
+OPTIONAL MATCH (f:User)-[:POSTED]->(o:Opening {{id: $oid}})
+// Applications made before APPLIED_TO carried a key
+OPTIONAL MATCH (u)-[legacy:APPLIED_TO]->(o) WHERE legacy.key IS NULL
+WITH u, f, o, count(legacy) > 0 AS legacy_applied
+
+// A. Create Application (no-op if it already exists)
+CALL {{
+    WITH u, o, legacy_applied
+    WITH * WHERE o IS NOT NULL AND NOT legacy_applied
+    MERGE (u)-[r:APPLIED_TO {{key: $key}}]->(o)
+    ON CREATE SET r.application_id = $app_id,
+                  r.applied_at = datetime(),
+                  r.status = 'Pending',
+                  o.applicant_count = coalesce(o.applicant_count, 0) + 1
+    RETURN collect(r.application_id) = [$app_id] AS created
+}}
+
+// B. Notify Faculty only for a new application: coalesced into one
+// digest per opening and window
+CALL {{
+    WITH u, f, o, created
+    WITH * WHERE created
+    {APPLICATION_DIGEST}
+    RETURN collect({NOTIFICATION_MAP}) AS notifications
+}}
+
+RETURN o IS NOT NULL AS found, created, f.user_id AS faculty_id,
+       notifications[0] AS notification
+"""
+
+
+def application_key(student_id: str, opening_id: str) -> str:
+    return f"{student_id}|{opening_id}"
+
 
 @router.post("/apply/{opening_id}")
 def apply_to_opening(opening_id: str, current_user: dict = Depends(get_current_user)):
@@ -23,68 +68,122 @@ def apply_to_opening(opening_id: str, current_user: dict = Depends(get_current_u
     session = db.get_session()
 
     try:
-        # 2. Check if Opening Exists & Get Faculty ID
-        # FIX 1: Changed [:POSTED_BY] to [:POSTED] to match your Opening creation logic
-        check_query = """
-        MATCH (f:User)-[:POSTED]->(o) 
-        WHERE o.id = $oid
-        RETURN o, f
-        """
-        result = session.run(check_query, oid=opening_id).single()
-        
-        if not result or not result["o"]:
+        # 2. One conditional write: opening lookup, duplicate check, create
+        # and faculty notification. The APPLIED_TO key is unique, so a
+        # double-click MERGEs onto the same application instead of racing.
+        result = session.run(
+            APPLY_QUERY,
+            uid=user_id,
+            oid=opening_id,
+            key=application_key(user_id, opening_id),
+            app_id=str(uuid.uuid4()),
+            **digest_params("Application"),
+        ).single()
+
+        if not result or not result["found"]:
             raise HTTPException(status_code=404, detail="Opening not found")
-            
-        # 3. Check if Already Applied
-        exists_query = """
-        MATCH (u:User {user_id: $uid})-[r:APPLIED_TO]->(o)
-        WHERE o.id = $oid
-        RETURN r
-        """
-        if session.run(exists_query, uid=user_id, oid=opening_id).single():
+        if not result["created"]:
             raise HTTPException(status_code=400, detail="You have already applied to this project")
 
-        # 4. Create Application & Notification
-        # FIX 2: Changed [:HAS_NOTIFICATION] to [:NOTIFIES] and reversed direction
-        # to match your dashboard.py fetch logic: MATCH (n)-[:NOTIFIES]->(u)
-        apply_query = """
-        MATCH (u:User {user_id: $uid})
-        MATCH (f:User)-[:POSTED]->(o)
-        WHERE o.id = $oid
-        
-        // A. Create Application
-        CREATE (u)-[:APPLIED_TO {
-            application_id: $app_id,
-            applied_at: datetime(),
-            status: 'Pending'
-        }]->(o)
-        
-        // B. Create Notification for Faculty
-        WITH u, o, f
-        CREATE (n:Notification {
-            id: $notif_id,
-            message: u.name + " applied for " + o.title,
-            type: "Application",
-            is_read: false,
-            created_at: datetime(),
-            trigger_id: u.user_id,
-            trigger_role: "student"
-        })
-        CREATE (n)-[:NOTIFIES]->(f)
-        
-        RETURN u.user_id
-        """
-        
-        session.run(apply_query, uid=user_id, oid=opening_id, app_id=str(uuid.uuid4()), notif_id=str(uuid.uuid4()))
+        bump_users(user_id, result["faculty_id"])
+        publish_notification(result["faculty_id"], result["notification"])
         
         return {"message": "Application submitted successfully"}
     
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Application Error: {e}")
         raise HTTPException(status_code=500, detail="Server error processing application")
     finally:
         session.close()
 
+
+# --- Model for Status Update ---
+class ApplicationStatusUpdate(BaseModel):
+    opening_id: str
+    student_id: str
+    status: str  # "Shortlisted" or "Rejected"
+
+class StudentStatus(BaseModel):
+    student_id: str
+    status: str  # "Shortlisted" or "Rejected"
+
+class BulkApplicationStatusUpdate(BaseModel):
+    opening_id: str
+    updates: List[StudentStatus] = Field(..., min_length=1, max_length=500)
+
+# Logic: Update status, manage relations, and notify student - for any
+# number of applicants of one opening in a single transaction (no APOC)
+STATUS_UPDATE_QUERY = f"""
+MATCH (f:User {{user_id: $fid}})-[:POSTED]->(o:Opening {{id: $oid}})
+UNWIND $updates AS upd
+MATCH (s:Student {{user_id: upd.student_id}})-[r:APPLIED_TO]->(o)
+
+// Update Status
+SET r.status = upd.status
+
+// Handle Logic based on status
+FOREACH (_ IN CASE WHEN upd.status = 'Shortlisted' THEN [1] ELSE [] END |
+    MERGE (o)-[:SHORTLISTED]->(s)
+    ON CREATE SET {SHORTLISTED_INCREMENT}
+)
+WITH o, s, upd
+OPTIONAL MATCH (o)-[sl:SHORTLISTED]->(s) WHERE upd.status = 'Rejected'
+FOREACH (_ IN CASE WHEN sl IS NULL THEN [] ELSE [1] END | SET {SHORTLISTED_DECREMENT})
+DELETE sl
+
+// Notify Student
+WITH o, s, upd
+CREATE (n:Notification {{
+    id: upd.notif_id,
+    message: "Your application for " + o.title + " has been " + upd.status,
+    type: "StatusUpdate",
+    is_read: false,
+    created_at: datetime(),
+    trigger_id: o.id,
+    trigger_role: "faculty"
+}})
+CREATE (n)-[:NOTIFIES]->(s)
+SET {unread_increment("s")}
+
+RETURN s.user_id AS student_id, {NOTIFICATION_FIELDS}
+"""
+
+
+def apply_status_updates(session, faculty_id: str, opening_id: str, updates: list):
+    """
+    Applies [(student_id, status)] to one opening owned by `faculty_id`.
+    Returns the student ids that were updated; students who never applied
+    are skipped. 404 if the opening isn't this faculty member's.
+    """
+    # One entry per student (last one wins)
+    latest = {student_id: status for student_id, status in updates}
+
+    owned = session.run(
+        "MATCH (:User {user_id: $fid})-[:POSTED]->(o:Opening {id: $oid}) RETURN o.id",
+        fid=faculty_id, oid=opening_id,
+    ).single()
+    if not owned:
+        raise HTTPException(status_code=404, detail="Opening not found")
+
+    records = list(session.run(
+        STATUS_UPDATE_QUERY,
+        fid=faculty_id,
+        oid=opening_id,
+        updates=[
+            {"student_id": sid, "status": status, "notif_id": str(uuid.uuid4())}
+            for sid, status in latest.items()
+        ],
+    ))
+
+    updated = [r["student_id"] for r in records]
+    bump_users(faculty_id, *updated)
+    for r in records:
+        publish_notification(r["student_id"], r)
+    return updated
+
+
 @router.put("/status")
 def update_application_status(
     data: ApplicationStatusUpdate, 
@@ -95,51 +194,44 @@ def update_application_status(
 
     session = db.get_session()
     try:
-        # Logic: Update status, manage relations, and notify student
-        cypher = """
-        MATCH (o:Opening {id: $oid})
-        MATCH (s:Student {user_id: $sid})
-        MATCH (s)-[r:APPLIED_TO]->(o)
-        
-        // Update Status
-        SET r.status = $status
-        
-        // Handle Logic based on status
-        WITH o, s, r
-        CALL apoc.do.case([
-            $status = 'Shortlisted', 'MERGE (o)-[:SHORTLISTED]->(s) RETURN true',
-            $status = 'Rejected',    'OPTIONAL MATCH (o)-[sl:SHORTLISTED]->(s) DELETE sl RETURN true'
-        ], 'RETURN false', {o:o, s:s}) YIELD value
-
-        // Notify Student
-        // FIX 3: Ensure this uses [:NOTIFIES] as well
-        WITH s, o
-        CREATE (n:Notification {
-            id: $notif_id,
-            message: "Your application for " + o.title + " has been " + $status,
-            type: "StatusUpdate",
-            is_read: false,
-            created_at: datetime(),
-            trigger_id: o.id,
-            trigger_role: "faculty"
-        })
-        CREATE (n)-[:NOTIFIES]->(s)
-        
-        RETURN s.user_id
-        """
-
-        session.run(
-            cypher, 
-            oid=data.opening_id, 
-            sid=data.student_id, 
-            status=data.status,
-            notif_id=str(uuid.uuid4())
+        apply_status_updates(
+            session, current_user["user_id"], data.opening_id, [(data.student_id, data.status)]
         )
-        
         return {"message": f"Applicant marked as {data.status}"}
 
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Status Update Error: {e}")
         raise HTTPException(status_code=500, detail="Failed to update status")
     finally:
-        session.close()
\ No newline at end of file
+        session.close()
+
+@router.put("/status/bulk")
+def update_application_status_bulk(
+    data: BulkApplicationStatusUpdate,
+    current_user: dict = Depends(get_current_user)
+):
+    if current_user["role"].lower() != "faculty":
+        raise HTTPException(status_code=403, detail="Access denied")
+
+    session = db.get_session()
+    try:
+        updated = apply_status_updates(
+            session, current_user["user_id"], data.opening_id,
+            [(u.student_id, u.status) for u in data.updates]
+        )
+        requested = {u.student_id for u in data.updates}
+        return {
+            "message": f"Updated {len(updated)} applicants",
+            "updated": updated,
+            "not_applied": sorted(requested - set(updated)),
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Bulk Status Update Error: {e}")
+        raise HTTPException(status_code=500, detail="Failed to update statuses")
+    finally:
+        session.close()
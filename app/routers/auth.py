@@ -1,22 +1,27 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+from app.core.security import get_current_user
 from app.models.auth import UserRegister, UserLogin, Token, UserVerifyIdentity, UserResetPassword
-from app.services.auth_service import register_user, login_user, verify_identity, reset_password
+from app.services.auth_service import register_user, login_user, refresh_token, verify_identity, reset_password
 
 router = APIRouter()
 
 # REMOVED: response_model=Token (This prevents the Validation Error)
 @router.post("/register")
-def register(user: UserRegister):
-    return register_user(user)
+async def register(user: UserRegister):
+    return await register_user(user)
 
 @router.post("/login", response_model=Token)
-def login(user: UserLogin):
-    return login_user(user)
+async def login(user: UserLogin):
+    return await login_user(user)
+
+@router.post("/refresh", response_model=Token)
+def refresh(current_user: dict = Depends(get_current_user)):
+    return refresh_token(current_user)
 
 @router.post("/verify-identity")
 def verify_user_identity(data: UserVerifyIdentity):
     return verify_identity(data)
 
 @router.post("/reset-password")
-def reset_user_password(data: UserResetPassword):
-    return reset_password(data)
\ No newline at end of file
+async def reset_user_password(data: UserResetPassword):
+    return await reset_password(data)
\ No newline at end of file
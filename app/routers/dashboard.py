@@ -2,13 +2,23 @@ from typing import Optional, List
 import uuid
 from datetime import datetime, date
 
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
 from pydantic import BaseModel
-import numpy as np
 
 from app.core.security import get_current_user
 from app.core.database import db
+from app.core.concurrency import run_concurrently, timed_query
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset_condition, next_page, set_next_cursor
+from app.core.etag import check_not_modified, bump, bump_users, user_key, OPENINGS, STUDENTS
 from app.services.rag_service import semantic_search_students
+from app.services.concept_similarity import expand_concept_weights
+from app.services.similarity import EmbeddingMatrix
+from app.services.facet_index import facet_index, FACET_FIELDS
+from app.services.outbox import ENQUEUE_OPENING_JOB
+from app.services.profile_projection import get_profile_document, refresh_profile_safely, works_with
+from app.services.opening_counters import SHORTLISTED_INCREMENT
+from app.services.applicant_ranking import rank_candidates
+from app.services.notification_service import create_digest_notification, list_notifications, mark_notification_read_for
 
 
 class OpeningCreate(BaseModel):
@@ -56,171 +66,128 @@ def safe_date(date_obj):
     except:
         return "N/A"
 
-def cosine_similarity(vec_a, vec_b):
-    """
-    Calculates cosine similarity between two vectors.
-    Returns float between 0.0 and 1.0.
-    """
-    if not vec_a or not vec_b:
-        return 0.0
-    try:
-        a = np.array(vec_a)
-        b = np.array(vec_b)
-        norm_a = np.linalg.norm(a)
-        norm_b = np.linalg.norm(b)
-        if norm_a == 0 or norm_b == 0:
-            return 0.0
-        return float(np.dot(a, b) / (norm_a * norm_b))
-    except Exception as e:
-        print(f"Math Error in Cosine Similarity: {e}")
-        return 0.0
-
-def create_notification(tx, user_id, message, type="INFO", trigger_id=None, trigger_role=None):
-    """
-    Helper to create a notification node in Neo4j.
-    Must be called within an active Neo4j transaction context.
-    """
-    query = """
-    MATCH (u:User {user_id: $user_id})
-    CREATE (n:Notification {
-        id: $nid,
-        message: $message,
-        type: $type,
-        is_read: false,
-        created_at: datetime(),
-        trigger_id: $trigger_id,
-        trigger_role: $trigger_role
-    })
-    CREATE (n)-[:NOTIFIES]->(u)
-    """
-    tx.run(query, 
-           user_id=user_id, 
-           nid=str(uuid.uuid4()), 
-           message=message, 
-           type=type,
-           trigger_id=trigger_id,
-           trigger_role=trigger_role
-    )
-
 # Location: backend/app/routers/dashboard.py
 
 @router.get("/faculty/home")
-def get_faculty_home(filter: Optional[str] = None, current_user: dict = Depends(get_current_user)):
+def get_faculty_home(request: Request, response: Response, filter: Optional[str] = None, current_user: dict = Depends(get_current_user)):
     if current_user["role"].lower() != "faculty":
         raise HTTPException(status_code=403, detail="Access denied")
 
-    session = db.get_session()
     user_id = current_user["user_id"]
-    
-    try:
-        # 1. FETCH FACULTY KEYWORDS (Optimized Query)
+    not_modified = check_not_modified(request, response, user_key(user_id), STUDENTS, OPENINGS)
+    if not_modified:
+        return not_modified
+
+    # 1 + 2. FACULTY KEYWORDS -> MATCHING STUDENTS (dependent, so one chain)
+    def fetch_profile_and_students(session):
         user_query = """
         MATCH (f:User {user_id: $uid})
-        OPTIONAL MATCH (n:Notification)-[:NOTIFIES]->(f) WHERE n.is_read = false
         OPTIONAL MATCH (f)-[:INTERESTED_IN|EXPERT_IN]->(concept:Concept)
         OPTIONAL MATCH (f)-[:POSTED]->(o:Opening)-[:REQUIRES]->(req:Concept)
         RETURN f.name as name, f.department as dept, f.profile_picture as pic, 
-               count(DISTINCT n) as unread_count,
+               f.embedding as embedding,
+               coalesce(f.unread_count, 0) as unread_count,
                collect(DISTINCT concept.name) + collect(DISTINCT req.name) as keywords
         """
-        user_res = session.run(user_query, uid=user_id).single()
+        user_res = session.run(timed_query(user_query), uid=user_id).single()
         
         faculty_keywords = [str(k).lower().strip() for k in user_res["keywords"] if k] if user_res else []
+        keyword_weights = expand_concept_weights(session, faculty_keywords)
 
-        # 2. FETCH STUDENTS (Removed AI Loop for Speed)
-        # We perform exact keyword matching in the Graph to avoid CPU-heavy AI processing during GET
+        # Soft keyword matching against precomputed SIMILAR_TO weights (no AI work during GET)
         students_query = """
         MATCH (s:Student)
         OPTIONAL MATCH (s)-[:HAS_SKILL|INTERESTED_IN]->(sk:Concept)
         WITH s, collect(DISTINCT toLower(sk.name)) as s_skills
         
-        // Calculate Match Score based on shared keywords
+        // Calculate Match Score based on (softly) shared keywords
         WITH s, s_skills, 
-             size([x IN s_skills WHERE x IN $f_keywords]) as matches
+             reduce(score = 0.0, x IN s_skills | score + coalesce($f_weights[x], 0.0)) as matches
         
         RETURN s.user_id as id, s.name as name, s.department as dept, 
                s.profile_picture as pic, s_skills as skills,
-               matches
+               matches,
+               CASE WHEN matches > 0 THEN s.embedding END as embedding
         ORDER BY matches DESC
-        LIMIT 10
+        LIMIT 30
         """
-# ... inside get_faculty_home function ...
+        # ✅ FIX: Only keep students with a score greater than 0
+        candidates = [r for r in session.run(timed_query(students_query), f_weights=keyword_weights)
+                      if faculty_keywords and r["matches"] > 0]
+
+        # Semantic re-scoring: one BLAS call against the faculty embedding breaks keyword ties
+        semantic = EmbeddingMatrix(range(len(candidates)), [r["embedding"] for r in candidates]) \
+            .scores(user_res["embedding"] if user_res else None)
+        ranked = sorted(range(len(candidates)), key=lambda i: (candidates[i]["matches"], semantic[i]), reverse=True)
 
-        stu_results = session.run(students_query, f_keywords=faculty_keywords)
-        
         recommended_students = []
-        for s in stu_results:
-            match_percent = (s["matches"] / len(faculty_keywords) * 100) if faculty_keywords else 0
-            
-            # ✅ FIX: Only add students with a score greater than 0
-            if match_percent > 0:
-                recommended_students.append({
-                    "student_id": s["id"],
-                    "name": s["name"],
-                    "department": s["dept"] or "General",
-                    "profile_picture": s["pic"],
-                    "matched_skills": s["skills"][:3],
-                    "match_score": f"{int(match_percent)}%"
-                })
-
-        # 3. FETCH COLLABORATIONS (Limit results)
+        for i in ranked[:10]:
+            s = candidates[i]
+            match_percent = min(s["matches"] / len(faculty_keywords) * 100, 100)
+            recommended_students.append({
+                "student_id": s["id"],
+                "name": s["name"],
+                "department": s["dept"] or "General",
+                "profile_picture": s["pic"],
+                "matched_skills": s["skills"][:3],
+                "match_score": f"{int(match_percent)}%"
+            })
+        return user_res, recommended_students
+
+    # 3. FETCH COLLABORATIONS (independent, runs alongside the chain above)
+    def fetch_collaborations(session):
         collab_query = """
-        MATCH (f:User)-[:POSTED]->(o:Opening)
+        MATCH (f:User)-[:POSTED]->(o:ActiveOpening)
         WHERE f.user_id <> $uid AND o.collaboration_type IS NOT NULL
         RETURN f.user_id as fid, f.name as name, f.profile_picture as pic, 
                o.id as pid, o.title as title, o.collaboration_type as type
         ORDER BY o.created_at DESC LIMIT 5
         """
-        collab_res = session.run(collab_query, uid=user_id)
-        collaborations = [{"id": r["pid"], "faculty_name": r["name"], "project_title": r["title"]} for r in collab_res]
+        collab_res = session.run(timed_query(collab_query), uid=user_id)
+        return [{"id": r["pid"], "faculty_name": r["name"], "project_title": r["title"]} for r in collab_res]
 
-        return {
-            "user_info": {"name": user_res["name"], "department": user_res["dept"], "pic": user_res["pic"]},
-            "unread_count": user_res["unread_count"],
-            "recommended_students": recommended_students,
-            "faculty_collaborations": collaborations,
-            "active_openings": [] # Fetch your own openings here
-        }
+    results = run_concurrently(
+        {"home": fetch_profile_and_students, "collaborations": fetch_collaborations},
+        fallbacks={"collaborations": []},
+    )
+    user_res, recommended_students = results["home"]
 
-    finally:
-        session.close()
+    return {
+        "user_info": {"name": user_res["name"], "department": user_res["dept"], "pic": user_res["pic"]},
+        "unread_count": user_res["unread_count"],
+        "recommended_students": recommended_students,
+        "faculty_collaborations": results["collaborations"],
+        "active_openings": [] # Fetch your own openings here
+    }
 
 @router.get("/student/home")
-def get_student_dashboard(current_user: dict = Depends(get_current_user)):
+def get_student_dashboard(request: Request, response: Response, current_user: dict = Depends(get_current_user)):
     if current_user["role"].lower() != "student":
         raise HTTPException(status_code=403, detail="Access denied")
 
     user_id = current_user["user_id"]
-    session = db.get_session()
-    
-    # Defaults
-    user_info = {}
-    unread_count = 0
-    recommended_final = []
-    all_openings_data = []
-
-    try:
-        # =========================================================
-        # 1. FETCH STUDENT (Skills + Interests)
-        # =========================================================
+    not_modified = check_not_modified(request, response, user_key(user_id), OPENINGS)
+    if not_modified:
+        return not_modified
+
+    # =========================================================
+    # 1. FETCH STUDENT (Skills + Interests)
+    # =========================================================
+    def fetch_student(session):
         user_query = """
         MATCH (u:User {user_id: $user_id}) 
-        OPTIONAL MATCH (n:Notification)-[:NOTIFIES]->(u) WHERE n.is_read = false
         OPTIONAL MATCH (u)-[:HAS_SKILL]->(s)
         OPTIONAL MATCH (u)-[:INTERESTED_IN]->(i)
         RETURN u.name as name, u.roll_no as roll_no,
-               count(n) as unread_count, 
+               coalesce(u.unread_count, 0) as unread_count, 
                collect(DISTINCT s.name) as skills, 
                collect(DISTINCT i.name) as interests
         """
-        user_res = session.run(user_query, user_id=user_id).single()
+        user_res = session.run(timed_query(user_query), user_id=user_id).single()
         
         my_capabilities = set()
         
         if user_res:
-            user_info = {"name": user_res["name"], "roll_no": user_res["roll_no"]}
-            unread_count = user_res["unread_count"]
-            
             # Normalize Skills
             if user_res["skills"]:
                 for s in user_res["skills"]:
@@ -231,11 +198,15 @@ def get_student_dashboard(current_user: dict = Depends(get_current_user)):
                 for i in user_res["interests"]:
                     if i: my_capabilities.add(str(i).lower().strip())
 
-        # =========================================================
-        # 2. FETCH OPENINGS & MATCH (Student Only)
-        # =========================================================
+        # Exact capabilities weigh 1.0, precomputed similar concepts weigh less
+        return user_res, expand_concept_weights(session, my_capabilities)
+
+    # =========================================================
+    # 2. FETCH OPENINGS (Student Only, independent of the student)
+    # =========================================================
+    def fetch_openings(session):
         openings_query = """
-        MATCH (o:Opening)
+        MATCH (o:ActiveOpening)
         WHERE o.collaboration_type IS NULL  // <--- FIX: Exclude Faculty Collaborations
         MATCH (f:User)-[:POSTED]->(o)
         OPTIONAL MATCH (o)-[:REQUIRES]->(req)
@@ -246,82 +217,110 @@ def get_student_dashboard(current_user: dict = Depends(get_current_user)):
         ORDER BY o.created_at DESC
         LIMIT 20
         """
-        op_results = session.run(openings_query)
-        
-        scored_openings = []
+        return list(session.run(timed_query(openings_query)))
 
-        for r in op_results:
-            # Normalize Job Requirements
-            raw_reqs = [x for x in r["req_skills"] if x]
-            normalized_reqs = [str(req).lower().strip() for req in raw_reqs]
-            
-            match_percentage = 0.0
-
-            if normalized_reqs:
-                matches_found = 0
-                for req in normalized_reqs:
-                    if req in my_capabilities:
-                        matches_found += 1
-                
-                # Formula: (Matches / Requirements) * 100
-                if len(normalized_reqs) > 0:
-                    match_percentage = (matches_found / len(normalized_reqs)) * 100.0
-            
-            # Build Object
-            opening_obj = {
-                "opening_id": r["oid"],
-                "title": r["title"],
-                "faculty_name": r["fname"] or "Faculty",
-                "department": r["fdept"] or "General",
-                "faculty_pic": r["fpic"],
-                "skills_required": raw_reqs[:3],
-                "description": r["desc"],
-                "deadline": safe_date(r["deadline"]),
-                "match_score": f"{int(match_percentage)}%", 
-                "raw_score": match_percentage
-            }
+    # Safe defaults on error: each half degrades on its own
+    results = run_concurrently(
+        {"student": fetch_student, "openings": fetch_openings},
+        fallbacks={"student": (None, {}), "openings": []},
+    )
+    user_res, capability_weights = results["student"]
 
-            scored_openings.append(opening_obj)
-            all_openings_data.append(opening_obj)
+    user_info = {}
+    unread_count = 0
+    if user_res:
+        user_info = {"name": user_res["name"], "roll_no": user_res["roll_no"]}
+        unread_count = user_res["unread_count"]
+
+    # =========================================================
+    # 3. MATCH OPENINGS
+    # =========================================================
+    all_openings_data = []
 
-        # 3. FILTER RECOMMENDATIONS (Hide 0%)
-        # Filter: Only keep jobs where score > 0
-        filtered_recs = [op for op in scored_openings if op["raw_score"] > 0]
+    for r in results["openings"]:
+        # Normalize Job Requirements
+        raw_reqs = [x for x in r["req_skills"] if x]
+        normalized_reqs = [str(req).lower().strip() for req in raw_reqs]
         
-        # Sort: Highest score first
-        filtered_recs.sort(key=lambda x: x["raw_score"], reverse=True)
+        match_percentage = 0.0
+
+        if normalized_reqs:
+            matches_found = 0.0
+            for req in normalized_reqs:
+                matches_found += capability_weights.get(req, 0.0)
+            
+            # Formula: (Matches / Requirements) * 100
+            match_percentage = (matches_found / len(normalized_reqs)) * 100.0
         
-        # Slice: Top 5 only
-        recommended_final = filtered_recs[:5]
+        # Build Object
+        all_openings_data.append({
+            "opening_id": r["oid"],
+            "title": r["title"],
+            "faculty_name": r["fname"] or "Faculty",
+            "department": r["fdept"] or "General",
+            "faculty_pic": r["fpic"],
+            "skills_required": raw_reqs[:3],
+            "description": r["desc"],
+            "deadline": safe_date(r["deadline"]),
+            "match_score": f"{int(match_percentage)}%", 
+            "raw_score": match_percentage
+        })
 
-    except Exception as e:
-        # Return safe defaults on error
-        print(f"Error in student dashboard: {e}")
-        return {
-            "user_info": user_info,
-            "unread_count": 0,
-            "recommended_openings": [],
-            "all_openings": []
-        }
-    finally:
-        session.close()
+    # 4. FILTER RECOMMENDATIONS (Hide 0%)
+    # Filter: Only keep jobs where score > 0
+    filtered_recs = [op for op in all_openings_data if op["raw_score"] > 0]
+    
+    # Sort: Highest score first
+    filtered_recs.sort(key=lambda x: x["raw_score"], reverse=True)
 
     return {
         "user_info": user_info,
         "unread_count": unread_count,
-        "recommended_openings": recommended_final,
+        "recommended_openings": filtered_recs[:5],  # Top 5 only
         "all_openings": all_openings_data
     }
 
 # =========================================================
 # 2. SIDE MENUS
 # =========================================================
+STUDENT_MENU_ITEMS = [
+    {"label": "Home", "icon": "home", "route": "/dashboard/student"},
+    {"label": "Profile", "icon": "person", "route": "/dashboard/student/profile"},
+    {"label": "Track Openings", "icon": "folder", "route": "/dashboard/student/projects"},
+    {"label": "Help & Support", "icon": "help", "route": "/dashboard/student/support"},
+    {"label": "All Faculty", "icon": "group", "route": "/dashboard/student/all-faculty"},
+    {"label": "Logout", "icon": "logout", "route": "/logout"}
+]
+
+FACULTY_MENU_ITEMS = [
+    {"label": "Profile", "icon": "person", "route": "/dashboard/faculty/profile"},
+    {"label": "My Openings", "icon": "folder", "route": "/dashboard/faculty/projects"},
+    {"label": "All Students", "icon": "group", "route": "/dashboard/faculty/all-students"},
+    {"label": "Faculty Collaborations", "icon": "link", "route": "/dashboard/faculty/collaborations"},
+    {"label": "Help & Support", "icon": "help", "route": "/dashboard/faculty/support"},
+    {"label": "Logout", "icon": "logout", "route": "/logout"}
+]
+
 @router.get("/student/menu")
-def get_student_side_menu(current_user: dict = Depends(get_current_user)):
+def get_student_side_menu(request: Request, response: Response, current_user: dict = Depends(get_current_user)):
     if current_user["role"].lower() != "student":
         raise HTTPException(status_code=403, detail="Access denied")
 
+    # Token carries the display claims: render without touching the database.
+    # (No ETag here - the body depends on the token, not the stored profile.)
+    if "name" in current_user:
+        return {
+            "name": current_user["name"],
+            "roll_no": current_user.get("id_number"),
+            "department": current_user.get("department"),
+            "profile_picture": current_user.get("profile_picture"),
+            "menu_items": STUDENT_MENU_ITEMS
+        }
+
     user_id = current_user["user_id"]
+    not_modified = check_not_modified(request, response, user_key(user_id))
+    if not_modified:
+        return not_modified
     session = db.get_session()
     
     try:
@@ -345,22 +344,29 @@ def get_student_side_menu(current_user: dict = Depends(get_current_user)):
             "department": result["dept"],
             # Return whichever field has data (prioritize new field)
             "profile_picture": result["profile_picture"] or result["pic"], 
-            "menu_items": [
-                {"label": "Home", "icon": "home", "route": "/dashboard/student"},
-                {"label": "Profile", "icon": "person", "route": "/dashboard/student/profile"},
-                {"label": "Track Openings", "icon": "folder", "route": "/dashboard/student/projects"},
-                {"label": "Help & Support", "icon": "help", "route": "/dashboard/student/support"},
-                {"label": "All Faculty", "icon": "group", "route": "/dashboard/student/all-faculty"},
-                {"label": "Logout", "icon": "logout", "route": "/logout"}
-            ]
+            "menu_items": STUDENT_MENU_ITEMS
         }
     finally:
         session.close()
 
 @router.get("/faculty/menu")
-def get_faculty_menu(current_user: dict = Depends(get_current_user)):
+def get_faculty_menu(request: Request, response: Response, current_user: dict = Depends(get_current_user)):
     if current_user["role"].lower() != "faculty":
         raise HTTPException(status_code=403, detail="Access denied")
+
+    # Token carries the display claims: render without touching the database
+    if "name" in current_user:
+        return {
+            "name": current_user["name"],
+            "employee_id": current_user.get("id_number") or "N/A",
+            "department": current_user.get("department") or "General",
+            "profile_picture": current_user.get("profile_picture"),
+            "menu_items": FACULTY_MENU_ITEMS
+        }
+
+    not_modified = check_not_modified(request, response, user_key(current_user["user_id"]))
+    if not_modified:
+        return not_modified
         
     session = db.get_session()
     try:
@@ -386,14 +392,7 @@ def get_faculty_menu(current_user: dict = Depends(get_current_user)):
             # ✅ FIX: Send the valid URL, checking both fields
             "profile_picture": res["profile_picture"] or res["pic"], 
             
-            "menu_items": [
-                {"label": "Profile", "icon": "person", "route": "/dashboard/faculty/profile"},
-                {"label": "My Openings", "icon": "folder", "route": "/dashboard/faculty/projects"},
-                {"label": "All Students", "icon": "group", "route": "/dashboard/faculty/all-students"},
-                {"label": "Faculty Collaborations", "icon": "link", "route": "/dashboard/faculty/collaborations"},
-                {"label": "Help & Support", "icon": "help", "route": "/dashboard/faculty/support"},
-                {"label": "Logout", "icon": "logout", "route": "/logout"}
-            ]
+            "menu_items": FACULTY_MENU_ITEMS
         }
     finally:
         session.close()
@@ -403,12 +402,21 @@ def get_faculty_menu(current_user: dict = Depends(get_current_user)):
 # =========================================================
 
 @router.get("/faculty/collaborations")
-def get_collaborations(search: str = None, department: str = None, collab_type: str = None, current_user: dict = Depends(get_current_user)):
+def get_collaborations(
+    response: Response,
+    search: str = None,
+    department: str = None,
+    collab_type: str = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    after, page_params = keyset_condition([("o.created_at", "datetime"), "o.id"], cursor, descending=True)
     session = db.get_session()
     try:
-        query = """
-        MATCH (f:User)-[:POSTED]->(o:Opening)
-        WHERE o.collaboration_type IS NOT NULL
+        query = f"""
+        MATCH (f:User)-[:POSTED]->(o:ActiveOpening)
+        WHERE o.collaboration_type IS NOT NULL AND {after}
         """
         
         if search:
@@ -419,15 +427,19 @@ def get_collaborations(search: str = None, department: str = None, collab_type:
             query += " AND o.collaboration_type = $type"
             
         query += """
+        WITH f, o ORDER BY o.created_at DESC, o.id DESC LIMIT $fetch
         OPTIONAL MATCH (o)-[:REQUIRES]->(c:Concept)
         WITH f, o, collect(c.name) as skills
         RETURN f.user_id as fid, f.name as fname, f.department as fdept, f.profile_picture as fpic,
                o.title as title, o.description as desc, o.collaboration_type as type, 
-               skills as tags, o.id as pid
-        ORDER BY o.created_at DESC
+               skills as tags, o.id as pid, o.created_at as created_at
+        ORDER BY o.created_at DESC, o.id DESC
         """
         
-        results = session.run(query, search=search, dept=department, type=collab_type)
+        rows = list(session.run(query, search=search, dept=department, type=collab_type,
+                                fetch=limit + 1, **page_params))
+        results, next_cursor = next_page(rows, limit, key=lambda r: (r["created_at"], r["pid"]))
+        set_next_cursor(response, next_cursor)
         projects = []
         for r in results:
             projects.append({
@@ -445,11 +457,48 @@ def get_collaborations(search: str = None, department: str = None, collab_type:
     finally:
         session.close()
 
+@router.get("/facets/{scope}")
+def get_facets(
+    scope: str,
+    department: Optional[str] = None,
+    batch: Optional[str] = None,
+    domain: Optional[str] = None,
+    collab_type: Optional[str] = None,
+    min_cgpa: Optional[float] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Result counts per department / batch / domain / collaboration type for
+    a browse list under the current filters (same params and matching as
+    the list). `search` is not supported: counts ignore the search box.
+    scope: students | faculty | collaborations
+    """
+    if scope not in FACET_FIELDS:
+        raise HTTPException(status_code=404, detail="Unknown facet scope")
+    role = current_user["role"].lower()
+    if (scope == "students" and role != "faculty") or (scope == "faculty" and role != "student"):
+        raise HTTPException(status_code=403, detail="Access denied")
+    if not facet_index.ready:
+        raise HTTPException(status_code=503, detail="Facet counts are warming up")
+
+    return facet_index.facets(scope, {
+        "department": department,
+        "batch": batch,
+        # Concepts are stored lowercased; the faculty list lowercases too
+        "domain": domain.lower() if domain else None,
+        "collaboration_type": collab_type,
+        "min_cgpa": min_cgpa,
+    })
+
 @router.get("/faculty/all-students")
 def get_all_students(
+    response: Response,
     search: Optional[str] = None, 
     department: Optional[str] = None, 
     batch: Optional[str] = None, 
+    min_cgpa: Optional[float] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     current_user: dict = Depends(get_current_user)
 ):
     if current_user["role"].lower() != "faculty":
@@ -458,39 +507,40 @@ def get_all_students(
     # A. VECTOR SEARCH (If search term exists)
     if search:
         try:
-            results = semantic_search_students(query=search, limit=20)
-            
-            # Local filtering for strict fields
-            if department:
-                results = [r for r in results if r.get('dept') == department]
-            if batch:
-                results = [r for r in results if r.get('batch') == batch]
-                
-            return results 
+            # Filters are pushed into the search so top-k stays correct.
+            # Ranked by similarity: one page of `limit` best matches, no cursor.
+            return semantic_search_students(query=search, limit=limit, department=department,
+                                            batch=batch, min_cgpa=min_cgpa)
         except Exception as e:
             print(f"Vector search failed, falling back to standard: {e}")
 
     # B. STANDARD SEARCH (Fallback)
+    after, page_params = keyset_condition(["s.name", "s.user_id"], cursor)
     session = db.get_session()
     try:
-        query = "MATCH (s:Student) WHERE s.name IS NOT NULL"
+        query = f"MATCH (s:Student) WHERE s.name IS NOT NULL AND {after}"
         if search:
             query += " AND (toLower(s.name) CONTAINS toLower($search) OR EXISTS { MATCH (s)-[:HAS_SKILL]->(k:Concept) WHERE toLower(k.name) CONTAINS toLower($search) })"
         if department:
             query += " AND s.department = $dept"
         if batch:
             query += " AND s.batch = $batch"
+        if min_cgpa is not None:
+            query += " AND s.cgpa >= $min_cgpa"
             
         query += """
+        WITH s ORDER BY s.name ASC, s.user_id ASC LIMIT $fetch
         OPTIONAL MATCH (s)-[:HAS_SKILL]->(k:Concept)
         RETURN s.user_id as id, s.name as name, s.department as dept, 
                s.batch as batch, s.profile_picture as pic,
                collect(DISTINCT k.name)[..3] as skills
-        ORDER BY s.name ASC
-        LIMIT 50
+        ORDER BY s.name ASC, s.user_id ASC
         """
         
-        results = session.run(query, search=search, dept=department, batch=batch)
+        rows = list(session.run(query, search=search, dept=department, batch=batch, min_cgpa=min_cgpa,
+                                fetch=limit + 1, **page_params))
+        results, next_cursor = next_page(rows, limit, key=lambda r: (r["name"], r["id"]))
+        set_next_cursor(response, next_cursor)
         students = []
         for r in results:
             students.append({
@@ -507,33 +557,44 @@ def get_all_students(
         session.close()
 
 @router.get("/student/all-faculty")
-def get_all_faculty(search: Optional[str] = None, department: Optional[str] = None, domain: Optional[str] = None, current_user: dict = Depends(get_current_user)):
+def get_all_faculty(
+    response: Response,
+    search: Optional[str] = None,
+    department: Optional[str] = None,
+    domain: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
     if current_user["role"].lower() != "student":
         raise HTTPException(status_code=403, detail="Access denied")
 
+    after, page_params = keyset_condition(["coalesce(f.name, '')", "f.user_id"], cursor)
     session = db.get_session()
     try:
-        query = "MATCH (f:Faculty) WHERE 1=1"
+        query = f"MATCH (f:Faculty) WHERE {after}"
         if search:
             query += " AND (toLower(f.name) CONTAINS toLower($search) OR toLower(f.department) CONTAINS toLower($search))"
         if department:
             query += " AND f.department = $dept"
+        if domain:
+            # Filter before paging (was applied to the collected domains)
+            query += " AND EXISTS { MATCH (f)-[:INTERESTED_IN]->(:Concept {name: toLower($domain)}) }"
             
         query += """
+        WITH f ORDER BY coalesce(f.name, '') ASC, f.user_id ASC LIMIT $fetch
         OPTIONAL MATCH (f)-[:INTERESTED_IN]->(c:Concept)
         WITH f, collect(c.name) as domains
-        """
-        if domain:
-            query += " WHERE $domain IN domains"
-            
-        query += """
         RETURN f.user_id as id, f.name as name, f.department as dept, 
                f.profile_picture as pic, f.designation as designation,
                domains
-        ORDER BY f.name ASC
+        ORDER BY coalesce(f.name, '') ASC, f.user_id ASC
         """
         
-        res = session.run(query, search=search, dept=department, domain=domain)
+        rows = list(session.run(query, search=search, dept=department, domain=domain,
+                                fetch=limit + 1, **page_params))
+        res, next_cursor = next_page(rows, limit, key=lambda r: (r["name"] or "", r["id"]))
+        set_next_cursor(response, next_cursor)
         results = []
         for r in res:
             results.append({
@@ -553,20 +614,32 @@ def get_all_faculty(search: Optional[str] = None, department: Optional[str] = No
 # 4. PROJECTS / OPENINGS MANAGEMENT (FACULTY)
 # =========================================================
 
+# Header totals for a faculty's openings (the list itself is paginated)
+PROJECT_STATS_QUERY = """
+MATCH (:User {user_id: $uid})-[:POSTED]->(o:Opening)
+RETURN count(CASE WHEN o.status = 'Active' THEN 1 END) as active_projects,
+       sum(coalesce(o.applicant_count, 0)) as total_applicants,
+       sum(coalesce(o.shortlisted_count, 0)) as total_shortlisted
+"""
+
 @router.get("/faculty/projects")
-def get_faculty_projects(current_user: dict = Depends(get_current_user)):
+def get_faculty_projects(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
     if current_user["role"].lower() != "faculty":
         raise HTTPException(status_code=403, detail="Not authorized")
     
+    after, page_params = keyset_condition([("o.created_at", "datetime"), "o.id"], cursor, descending=True)
     session = db.get_session()
     try:
-        query = """
-        MATCH (u:User {user_id: $user_id})-[:POSTED]->(o:Opening)
-        OPTIONAL MATCH (o)<-[:APPLIED_TO]-(s:User)
-        OPTIONAL MATCH (o)<-[:INTERESTED_IN]-(f:User)
-        
-        WITH o, count(DISTINCT s) as applicant_count, count(DISTINCT f) as interest_count
+        query = f"""
+        MATCH (u:User {{user_id: $user_id}})-[:POSTED]->(o:Opening)
+        WHERE {after}
         
+        // Pipeline counters are maintained on the Opening (see opening_counters)
         RETURN 
             o.id as id,
             o.title as title,
@@ -575,19 +648,25 @@ def get_faculty_projects(current_user: dict = Depends(get_current_user)):
             toString(o.deadline) as deadline,
             toString(o.created_at) as posted_date,
             o.collaboration_type as collaboration_type,
-            applicant_count,
-            interest_count
-        ORDER BY posted_date DESC
+            coalesce(o.applicant_count, 0) as applicant_count,
+            coalesce(o.interest_count, 0) as interest_count,
+            coalesce(o.shortlisted_count, 0) as shortlisted_count,
+            o.created_at as created_at
+        ORDER BY o.created_at DESC, o.id DESC
+        LIMIT $fetch
         """
         
-        result = session.run(query, user_id=current_user["user_id"])
-        projects = [dict(record) for record in result]
+        rows = list(session.run(query, user_id=current_user["user_id"], fetch=limit + 1, **page_params))
+        page, next_cursor = next_page(rows, limit, key=lambda r: (r["created_at"], r["id"]))
+        set_next_cursor(response, next_cursor)
+        projects = []
+        for record in page:
+            project = dict(record)
+            project.pop("created_at")
+            projects.append(project)
         
-        stats = {
-            "active_projects": len([p for p in projects if p.get("status") == "Active"]),
-            "total_applicants": sum(p.get("applicant_count", 0) for p in projects),
-            "total_shortlisted": 0 
-        }
+        # Totals cover every opening, not just this page
+        stats = dict(session.run(PROJECT_STATS_QUERY, uid=current_user["user_id"]).single())
 
         return {"stats": stats, "projects": projects}
     except Exception as e:
@@ -597,23 +676,36 @@ def get_faculty_projects(current_user: dict = Depends(get_current_user)):
         session.close()
 
 @router.get("/faculty/projects/{project_id}/applicants")
-def get_project_applicants(project_id: str, current_user: dict = Depends(get_current_user)):
+def get_project_applicants(
+    project_id: str,
+    response: Response,
+    status: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
     session = db.get_session()
     try:
-        query = """
-        MATCH (o:Opening {id: $pid})<-[:APPLIED_TO]-(s:Student)
-        WHERE NOT (o)-[:SHORTLISTED]->(s) 
-          AND NOT (o)-[:REJECTED]->(s)
-        RETURN s.user_id as id, s.name as name, s.roll_no as roll, s.department as dept, s.profile_picture as pic
-        """
-        results = session.run(query, pid=project_id)
+        # Best fit first. Without a status filter this is the review queue:
+        # applicants not yet shortlisted or rejected.
+        page = rank_candidates(
+            session, project_id, rel="APPLIED_TO", status=status,
+            exclude=None if status else "(o)-[:SHORTLISTED]->(s) OR (o)-[:REJECTED]->(s)",
+            limit=limit, cursor=cursor,
+        )
+        if page is None:
+            raise HTTPException(status_code=404, detail="Opening not found")
+        results, next_cursor = page
+        set_next_cursor(response, next_cursor)
         return [
             {
                 "student_id": r["id"], 
                 "name": r["name"], 
                 "roll_no": r["roll"], 
                 "department": r["dept"], 
-                "profile_picture": r["pic"]
+                "profile_picture": r["pic"],
+                "status": r["status"],
+                "match_score": r["match_score"]
             } 
             for r in results
         ]
@@ -621,14 +713,26 @@ def get_project_applicants(project_id: str, current_user: dict = Depends(get_cur
         session.close()
 
 @router.get("/faculty/projects/{project_id}/shortlisted")
-def get_project_shortlisted(project_id: str, current_user: dict = Depends(get_current_user)):
+def get_project_shortlisted(
+    project_id: str,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    after, page_params = keyset_condition(["coalesce(s.name, '')", "s.user_id"], cursor)
     session = db.get_session()
     try:
-        query = """
-        MATCH (o:Opening {id: $pid})-[:SHORTLISTED]->(s:Student)
+        query = f"""
+        MATCH (o:Opening {{id: $pid}})-[:SHORTLISTED]->(s:Student)
+        WHERE {after}
         RETURN s.user_id as id, s.name as name, s.roll_no as roll, s.department as dept, s.profile_picture as pic
+        ORDER BY coalesce(s.name, '') ASC, s.user_id ASC
+        LIMIT $fetch
         """
-        results = session.run(query, pid=project_id)
+        rows = list(session.run(query, pid=project_id, fetch=limit + 1, **page_params))
+        results, next_cursor = next_page(rows, limit, key=lambda r: (r["name"] or "", r["id"]))
+        set_next_cursor(response, next_cursor)
         return [
             {
                 "student_id": r["id"], 
@@ -647,21 +751,35 @@ def get_project_shortlisted(project_id: str, current_user: dict = Depends(get_cu
 # =========================================================
 
 @router.get("/student/applications")
-def get_student_applications(current_user: dict = Depends(get_current_user)):
+def get_student_applications(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
     if current_user["role"].lower() != "student":
         raise HTTPException(status_code=403, detail="Access denied")
     
+    after, page_params = keyset_condition(
+        [("coalesce(r.applied_at, datetime({epochMillis: 0}))", "datetime"), "o.id"], cursor, descending=True
+    )
     session = db.get_session()
     try:
-        query = """
-        MATCH (s:Student {user_id: $uid})-[r:APPLIED_TO]->(o:Opening)
+        query = f"""
+        MATCH (s:Student {{user_id: $uid}})-[r:APPLIED_TO]->(o:Opening)
+        WHERE {after}
+        WITH r, o, coalesce(r.applied_at, datetime({{epochMillis: 0}})) as applied_key
+        ORDER BY applied_key DESC, o.id DESC
+        LIMIT $fetch
         OPTIONAL MATCH (f:User)-[:POSTED]->(o)
         RETURN o.id as id, o.title as title, 
                f.name as faculty_name, f.department as dept, f.profile_picture as pic,
-               r.status as status, r.applied_at as applied_date
-        ORDER BY r.applied_at DESC
+               r.status as status, r.applied_at as applied_date, applied_key
+        ORDER BY applied_key DESC, o.id DESC
         """
-        results = session.run(query, uid=current_user["user_id"])
+        rows = list(session.run(query, uid=current_user["user_id"], fetch=limit + 1, **page_params))
+        results, next_cursor = next_page(rows, limit, key=lambda r: (r["applied_key"], r["id"]))
+        set_next_cursor(response, next_cursor)
         
         applications = []
         for row in results:
@@ -679,143 +797,107 @@ def get_student_applications(current_user: dict = Depends(get_current_user)):
         session.close()
 
 @router.get("/faculty/student-profile/{student_id}")
-def get_student_public_profile(student_id: str, current_user: dict = Depends(get_current_user)):
+def get_student_public_profile(student_id: str, request: Request, response: Response, current_user: dict = Depends(get_current_user)):
     if current_user["role"].lower() != "faculty":
         raise HTTPException(status_code=403, detail="Access denied")
 
+    not_modified = check_not_modified(request, response, user_key(student_id))
+    if not_modified:
+        return not_modified
+
+    # Single key lookup of the materialized profile document
     session = db.get_session()
     try:
-        profile_query = """
-        MATCH (s:Student {user_id: $sid})
-        OPTIONAL MATCH (s)-[:HAS_SKILL]->(k:Concept)
-        OPTIONAL MATCH (s)-[:INTERESTED_IN]->(i:Concept)
-        RETURN s.name as name, s.roll_no as roll_no, s.department as dept, 
-               s.batch as batch, s.bio as bio, s.email as email, s.phone as phone,
-               s.profile_picture as pic,
-               collect(DISTINCT k.name) as skills,
-               collect(DISTINCT i.name) as interests
-        """
-        profile = session.run(profile_query, sid=student_id).single()
-        
-        if not profile:
-            raise HTTPException(status_code=404, detail="Student not found")
-
-        proj_query = """
-        MATCH (s:Student {user_id: $sid})-[:WORKED_ON]->(w:Work)
-        RETURN w.title as title, w.description as desc, w.from_date as from_d, w.to_date as to_d, w.tools as tools
-        ORDER BY w.id DESC
-        """
-        projects_res = session.run(proj_query, sid=student_id)
-        projects = []
-        for p in projects_res:
-            projects.append({
-                "title": p["title"],
-                "description": p["desc"],
-                "duration": f"{p['from_d']} - {p['to_d']}",
-                "tools": p["tools"]
-            })
-
-        return {
-            "info": {
-                "name": profile["name"],
-                "roll_no": profile["roll_no"],
-                "department": profile["dept"],
-                "batch": profile["batch"],
-                "bio": profile["bio"] or "No bio added.",
-                "email": profile["email"],
-                "phone": profile["phone"],
-                "profile_picture": profile["pic"],
-                "skills": profile["skills"],
-                "interests": profile["interests"]
-            },
-            "projects": projects
-        }
+        doc = get_profile_document(session, student_id)
     finally:
         session.close()
 
+    if not doc or "Student" not in doc["labels"]:
+        raise HTTPException(status_code=404, detail="Student not found")
+
+    profile = doc["user"]
+    projects = sorted(works_with(doc, {"WORKED_ON"}), key=lambda w: w.get("id") or "", reverse=True)
+
+    return {
+        "info": {
+            "name": profile.get("name"),
+            "roll_no": profile.get("roll_no"),
+            "department": profile.get("department"),
+            "batch": profile.get("batch"),
+            "cgpa": profile.get("cgpa"),
+            "bio": profile.get("bio") or "No bio added.",
+            "email": profile.get("email"),
+            "phone": profile.get("phone"),
+            "profile_picture": profile.get("profile_picture"),
+            "skills": doc["skills"],
+            "interests": doc["interests"]
+        },
+        "projects": [{
+            "title": p.get("title"),
+            "description": p.get("description"),
+            "duration": f"{p.get('from_date')} - {p.get('to_date')}",
+            "tools": p.get("tools")
+        } for p in projects]
+    }
+
 @router.get("/student/faculty-profile/{faculty_id}")
-def get_faculty_public_profile(faculty_id: str, current_user: dict = Depends(get_current_user)):
+def get_faculty_public_profile(faculty_id: str, request: Request, response: Response, current_user: dict = Depends(get_current_user)):
     if current_user["role"].lower() not in ["student", "faculty"]:
         raise HTTPException(status_code=403, detail="Access denied")
 
+    not_modified = check_not_modified(request, response, user_key(faculty_id))
+    if not_modified:
+        return not_modified
+
+    # Single key lookup of the materialized profile document
     session = db.get_session()
     try:
-        profile_query = """
-        MATCH (f:User {user_id: $fid})
-        OPTIONAL MATCH (f)-[:INTERESTED_IN]->(c:Concept)
-        RETURN f.name as name, f.department as dept, f.designation as designation,
-               f.email as email, f.phone as phone, f.profile_picture as pic,
-               f.cabin_block as block, f.cabin_floor as floor, f.cabin_number as cabin_no,
-               f.office_hours as office_hours, 
-               f.ug_details as ug, f.pg_details as pg, f.phd_details as phd,
-               collect(DISTINCT c.name) as interests
-        """
-        profile = session.run(profile_query, fid=faculty_id).single()
-        
-        if not profile:
-            raise HTTPException(status_code=404, detail="Faculty not found")
-
-        response_data = {
-            "info": {
-                "name": profile["name"],
-                "designation": profile["designation"],
-                "department": profile["dept"],
-                "email": profile["email"],
-                "phone": profile["phone"] or "",
-                "profile_picture": profile["pic"],
-                "cabin_block": profile["block"] or "",
-                "cabin_floor": profile["floor"] or "",
-                "cabin_number": profile["cabin_no"] or "",
-                "ug_details": profile["ug"] or [],
-                "pg_details": profile["pg"] or [],
-                "phd_details": profile["phd"] or [],
-                "interests": profile["interests"],
-                "availability_status": "Available Now"
-            },
-            "schedule": profile["office_hours"] or "Mon-Fri 9AM-5PM",
-            "openings": [],
-            "previous_work": []
-        }
+        doc = get_profile_document(session, faculty_id)
+    finally:
+        session.close()
 
-# ... inside get_faculty_public_profile ...
+    if not doc:
+        raise HTTPException(status_code=404, detail="Faculty not found")
 
-        # ✅ FIX: Fetch 'collaboration_type' from the database
-        openings_query = """
-        MATCH (f:User {user_id: $fid})-[:POSTED]->(o:Opening)
-        RETURN o.id as id, o.title as title, o.description as desc, o.collaboration_type as type
-        ORDER BY o.created_at DESC
-        """
-        openings = session.run(openings_query, fid=faculty_id)
-        for o in openings:
-            response_data["openings"].append({
-                "id": o["id"],
-                "title": o["title"],
-                # ✅ Pass the type to frontend (default to 'Student Project' if null)
-                "type": o["type"] or "Student Project", 
-                "description": o["desc"]
-            })
+    profile = doc["user"]
 
-# ... rest of the function ...
+    # Same order as `ORDER BY w.year DESC` (nulls first), capped at 20
+    works = sorted(
+        works_with(doc, {"WORKED_ON", "PUBLISHED", "LED_PROJECT"}),
+        key=lambda w: (w.get("year") is None, str(w.get("year") or "")),
+        reverse=True,
+    )[:20]
 
-        work_query = """
-        MATCH (f:User {user_id: $fid})-[:WORKED_ON|PUBLISHED|LED_PROJECT]->(w:Work)
-        RETURN w.title as title, w.type as type, w.year as year, w.outcome as outcome, w.collaborators as collaborators
-        ORDER BY w.year DESC
-        LIMIT 20 
-        """
-        works = session.run(work_query, fid=faculty_id)
-        for w in works:
-            response_data["previous_work"].append({
-                "title": w["title"],
-                "type": w["type"],
-                "year": w["year"],
-                "outcome": w["outcome"],
-                "collaborators": w["collaborators"]
-            })
-
-        return response_data
-    finally:
-        session.close()
+    return {
+        "info": {
+            "name": profile.get("name"),
+            "designation": profile.get("designation"),
+            "department": profile.get("department"),
+            "email": profile.get("email"),
+            "phone": profile.get("phone") or "",
+            "profile_picture": profile.get("profile_picture"),
+            "cabin_block": profile.get("cabin_block") or "",
+            "cabin_floor": profile.get("cabin_floor") or "",
+            "cabin_number": profile.get("cabin_number") or "",
+            "ug_details": profile.get("ug_details") or [],
+            "pg_details": profile.get("pg_details") or [],
+            "phd_details": profile.get("phd_details") or [],
+            "interests": doc["interests"],
+            "availability_status": "Available Now"
+        },
+        "schedule": profile.get("office_hours") or "Mon-Fri 9AM-5PM",
+        # ✅ Pass the type to frontend (default to 'Student Project' if null)
+        "openings": [{
+            "id": o["id"],
+            "title": o["title"],
+            "type": o["collaboration_type"] or "Student Project",
+            "description": o["description"]
+        } for o in doc["openings"]],
+        "previous_work": [
+            {k: w.get(k) for k in ("title", "type", "year", "outcome", "collaborators")}
+            for w in works
+        ]
+    }
 
 # =========================================================
 # 6. ACTIONS & NOTIFICATIONS
@@ -829,11 +911,13 @@ def shortlist_student(
 ):
     session = db.get_session()
     try:
-        query = """
-        MATCH (o:Opening {id: $oid}), (s:Student {user_id: $sid})
+        query = f"""
+        MATCH (o:Opening {{id: $oid}}), (s:Student {{user_id: $sid}})
         MERGE (o)-[:SHORTLISTED]->(s)
+        ON CREATE SET {SHORTLISTED_INCREMENT}
         """
         session.run(query, oid=request.opening_id, sid=student_id)
+        bump_users(current_user["user_id"], student_id)
         return {"message": "Student shortlisted for opening"}
     finally:
         session.close()
@@ -842,7 +926,7 @@ def shortlist_student(
 def express_interest(project_id: str, current_user: dict = Depends(get_current_user)):
     session = db.get_session()
     user_id = current_user["user_id"]
-    user_name = current_user.get("name", "A user")
+    user_name = current_user.get("name")
     role = current_user["role"]
 
     try:
@@ -850,15 +934,19 @@ def express_interest(project_id: str, current_user: dict = Depends(get_current_u
         owner_query = """
         MATCH (owner:User)-[:POSTED|PUBLISHED|LED_PROJECT]->(node)
         WHERE (node:Opening OR node:Work) AND node.id = $pid
-        RETURN owner.user_id as owner_id, node.title as title, labels(node) as labels
+        OPTIONAL MATCH (me:User {user_id: $uid})
+        RETURN owner.user_id as owner_id, node.title as title, labels(node) as labels,
+               me.name as my_name
         """
-        result = session.run(owner_query, pid=project_id).single()
+        result = session.run(owner_query, pid=project_id, uid=user_id).single()
         
         if not result:
             raise HTTPException(status_code=404, detail="Project or Opening not found")
             
         owner_id = result["owner_id"]
         project_title = result["title"]
+        # Tokens issued without display claims carry no name
+        user_name = user_name or result["my_name"] or "A user"
 
         # 2. Check if already interested
         check_query = """
@@ -873,13 +961,19 @@ def express_interest(project_id: str, current_user: dict = Depends(get_current_u
         connect_query = """
         MATCH (u:User {user_id: $uid})
         MATCH (node) WHERE (node:Opening OR node:Work) AND node.id = $pid
-        MERGE (u)-[:INTERESTED_IN {date: datetime()}]->(node)
+        MERGE (u)-[r:INTERESTED_IN]->(node)
+        ON CREATE SET r.date = datetime(),
+                      node.interest_count = coalesce(node.interest_count, 0) + 1
         """
         session.run(connect_query, uid=user_id, pid=project_id)
+        bump_users(user_id)
 
         # 4. Notify Owner
         msg = f"{user_name} ({role}) is interested in your collaboration: '{project_title}'"
-        create_notification(session, owner_id, msg, "INTEREST", trigger_id=user_id, trigger_role=role)
+        create_digest_notification(
+            session, owner_id, "INTEREST", project_id, user_id, msg,
+            f"{{count}} people are interested in your collaboration: '{project_title}'"
+        )
 
         return {"message": "Interest expressed! The faculty has been notified."}
     except Exception as e:
@@ -889,18 +983,17 @@ def express_interest(project_id: str, current_user: dict = Depends(get_current_u
         session.close()
 
 @router.get("/notifications")
-def get_notifications(current_user: dict = Depends(get_current_user)):
+def get_notifications(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
     user_id = current_user["user_id"]
     session = db.get_session()
     try:
-        query = """
-        MATCH (n:Notification)-[:NOTIFIES]->(u:User {user_id: $uid})
-        RETURN n.id as id, n.message as message, n.type as type, 
-               n.is_read as is_read, n.created_at as date,
-               n.trigger_id as trigger_id, n.trigger_role as trigger_role
-        ORDER BY n.created_at DESC LIMIT 20
-        """
-        results = session.run(query, uid=user_id)
+        results, next_cursor = list_notifications(session, user_id, limit, cursor)
+        set_next_cursor(response, next_cursor)
         notifs = []
         for r in results:
             notifs.append({
@@ -920,8 +1013,8 @@ def get_notifications(current_user: dict = Depends(get_current_user)):
 def mark_notification_read(notif_id: str, current_user: dict = Depends(get_current_user)):
     session = db.get_session()
     try:
-        query = "MATCH (n:Notification {id: $nid})-[:NOTIFIES]->(u:User {user_id: $uid}) SET n.is_read = true"
-        session.run(query, nid=notif_id, uid=current_user["user_id"])
+        mark_notification_read_for(session, current_user["user_id"], notif_id)
+        bump_users(current_user["user_id"])
         return {"message": "Marked as read"}
     finally:
         session.close()
@@ -941,7 +1034,7 @@ def create_opening(opening: OpeningCreate, current_user: dict = Depends(get_curr
         # 2. Cypher Query with collaboration_type
         query = """
         MATCH (f:User {user_id: $uid})
-        CREATE (o:Opening {
+        CREATE (o:Opening:ActiveOpening {
             id: $oid,
             title: $title,
             description: $desc,
@@ -950,10 +1043,13 @@ def create_opening(opening: OpeningCreate, current_user: dict = Depends(get_curr
             deadline: $deadline,
             created_at: datetime(),
             status: 'Active',
+            applicant_count: 0,
+            interest_count: 0,
+            shortlisted_count: 0,
             collaboration_type: $collab_type  // ✅ SAVING THE TYPE
         })
         MERGE (f)-[:POSTED]->(o)
-        
+        """ + ENQUEUE_OPENING_JOB + """
         // 3. Link Skills
         FOREACH (skill_name IN $skills |
             MERGE (sk:Concept {name: toLower(skill_name)})
@@ -978,9 +1074,14 @@ def create_opening(opening: OpeningCreate, current_user: dict = Depends(get_curr
             deadline=opening.deadline,
             skills=opening.required_skills,
             years=opening.target_years,
-            collab_type=opening.collaboration_type # ✅ Passing the value
+            collab_type=opening.collaboration_type, # ✅ Passing the value
+            opening_job_id=str(uuid.uuid4())
         )
         
+        refresh_profile_safely(session, user_id)
+        facet_index.refresh_opening(session, opening_id)
+        bump_users(user_id)
+        bump(OPENINGS)
         return {"message": "Opening created successfully", "id": opening_id}
         
     except Exception as e:
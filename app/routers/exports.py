@@ -0,0 +1,123 @@
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
+from typing import Literal
+from app.core.database import db
+from app.core.security import get_current_user
+import csv
+import io
+import json
+import logging
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Rows are pulled from the Neo4j result cursor as they arrive (the driver
+# fetches in batches) and written out in chunks, so memory stays flat
+# however large the export is.
+CHUNK_ROWS = 500
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+APPLICANTS_QUERY = """
+MATCH (f:User {user_id: $uid})-[:POSTED]->(o:Opening)<-[r:APPLIED_TO]-(s:Student)
+RETURN o.id AS opening_id, o.title AS opening_title,
+       s.user_id AS student_id, s.name AS name, s.roll_no AS roll_no, s.email AS email,
+       s.department AS department, s.batch AS batch, s.cgpa AS cgpa,
+       coalesce(r.status, 'Pending') AS status, r.applied_at AS applied_at
+ORDER BY o.created_at, r.applied_at
+"""
+
+# Contact details and CGPA only for students who applied to (or showed
+# interest in) one of the faculty's own openings
+STUDENTS_QUERY = """
+MATCH (s:Student)
+WHERE s.name IS NOT NULL
+  AND EXISTS { MATCH (:User {user_id: $uid})-[:POSTED]->(:Opening)<-[:APPLIED_TO|INTERESTED_IN]-(s) }
+RETURN s.user_id AS student_id, s.name AS name, s.roll_no AS roll_no, s.email AS email,
+       s.department AS department, s.batch AS batch, s.cgpa AS cgpa,
+       COLLECT { MATCH (s)-[:HAS_SKILL]->(k:Concept) RETURN k.name } AS skills
+ORDER BY s.name
+"""
+
+OPENINGS_QUERY = """
+MATCH (f:User {user_id: $uid})-[:POSTED]->(o:Opening)
+RETURN o.id AS opening_id, o.title AS title, o.description AS description,
+       f.user_id AS faculty_id, f.name AS faculty_name, f.department AS department,
+       o.collaboration_type AS collaboration_type, o.status AS status,
+       o.deadline AS deadline, o.min_cgpa AS min_cgpa, o.target_years AS target_years,
+       COLLECT { MATCH (o)-[:REQUIRES]->(c:Concept) RETURN c.name } AS required_skills,
+       o.applicant_count AS applicant_count, o.interest_count AS interest_count,
+       o.shortlisted_count AS shortlisted_count, o.created_at AS created_at
+ORDER BY o.created_at
+"""
+
+
+def _jsonable(value):
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+def _csv_cell(value):
+    if isinstance(value, (list, tuple)):
+        return ";".join(str(v) for v in value if v is not None)
+    return "" if value is None else _jsonable(value)
+
+
+def _export_rows(query: str, fmt: str, **params):
+    """Yields the query result encoded as NDJSON or CSV, CHUNK_ROWS records at a time."""
+    session = db.get_session()
+    try:
+        buffer = io.StringIO()
+        writer = None
+        for i, record in enumerate(session.run(query, **params), start=1):
+            if fmt == "csv":
+                if writer is None:
+                    writer = csv.writer(buffer)
+                    writer.writerow(record.keys())
+                writer.writerow([_csv_cell(v) for v in record.values()])
+            else:
+                buffer.write(json.dumps({k: _jsonable(v) for k, v in record.items()}) + "\n")
+
+            if i % CHUNK_ROWS == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+    except Exception:
+        # Headers are already sent; the truncated body is all we can signal
+        logger.exception("Export stream failed")
+        raise
+    finally:
+        session.close()
+
+
+def _stream(name: str, query: str, fmt: str, **params) -> StreamingResponse:
+    return StreamingResponse(
+        _export_rows(query, fmt, **params),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+    )
+
+
+@router.get("/applicants")
+def export_applicants(format: Literal["ndjson", "csv"] = "ndjson", current_user: dict = Depends(get_current_user)):
+    """Every applicant to the current faculty's openings."""
+    if current_user["role"].lower() != "faculty":
+        raise HTTPException(status_code=403, detail="Access denied")
+    return _stream("applicants", APPLICANTS_QUERY, format, uid=current_user["user_id"])
+
+
+@router.get("/students")
+def export_students(format: Literal["ndjson", "csv"] = "ndjson", current_user: dict = Depends(get_current_user)):
+    """Students who applied to or are interested in the current faculty's openings, with skills."""
+    if current_user["role"].lower() != "faculty":
+        raise HTTPException(status_code=403, detail="Access denied")
+    return _stream("students", STUDENTS_QUERY, format, uid=current_user["user_id"])
+
+
+@router.get("/openings")
+def export_openings(format: Literal["ndjson", "csv"] = "ndjson", current_user: dict = Depends(get_current_user)):
+    """The current faculty's openings (open and closed) with their required skills."""
+    if current_user["role"].lower() != "faculty":
+        raise HTTPException(status_code=403, detail="Access denied")
+    return _stream("openings", OPENINGS_QUERY, format, uid=current_user["user_id"])
@@ -1,7 +1,12 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from typing import Optional
 from app.core.security import get_current_user
 from app.models.project import StudentWorkCreate  # (Recommended rename later)
 from app.core.database import db
+from app.core.etag import bump_users
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset_condition, next_page, set_next_cursor
+from app.services.applicant_ranking import rank_candidates
+from app.services.profile_projection import refresh_profile_safely
 import uuid
 
 router = APIRouter()
@@ -109,6 +114,8 @@ def add_faculty_research(
             collaboration_type=work.collaboration_type,
             tools=tools
         )
+        refresh_profile_safely(session, secure_user_id)
+        bump_users(secure_user_id)
 
         return {
             "message": "Research added successfully to faculty profile",
@@ -128,29 +135,43 @@ def add_faculty_research(
     finally:
         session.close()
 
+# Applicants here are INTERESTED_IN users (see get_my_projects)
+MY_PROJECT_STATS_QUERY = """
+MATCH (:Faculty {user_id: $uid})-[:POSTED]->(o:Opening)
+RETURN count(CASE WHEN coalesce(o.status, 'Active') = 'Active' THEN 1 END) as active_projects,
+       sum(coalesce(o.interest_count, 0)) as total_applicants,
+       sum(coalesce(o.shortlisted_count, 0)) as total_shortlisted
+"""
+
 @router.get("/my-projects")
-def get_my_projects(current_user: dict = Depends(get_current_user)):
+def get_my_projects(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
     """
-    Fetches Openings with APPLICANT count and SHORTLISTED count.
+    Fetches Openings with APPLICANT count and SHORTLISTED count, newest
+    first and keyset-paginated. Stats cover all of the faculty's openings.
     """
     if current_user["role"].lower() != "faculty":
         raise HTTPException(status_code=403, detail="Access denied")
 
     user_id = current_user["user_id"]
+    after, page_params = keyset_condition([("o.created_at", "datetime"), "o.id"], cursor, descending=True)
     session = db.get_session()
 
     try:
         # UPDATED QUERY: Counts both Applicants and Shortlisted
-        query = """
-        MATCH (f:Faculty {user_id: $uid})-[:POSTED]->(o:Opening)
+        query = f"""
+        MATCH (f:Faculty {{user_id: $uid}})-[:POSTED]->(o:Opening)
+        WHERE {after}
+        WITH f, o ORDER BY o.created_at DESC, o.id DESC LIMIT $fetch
         
-        // Count Applicants (INTERESTED_IN)
-        OPTIONAL MATCH (s:Student)-[:INTERESTED_IN]->(o)
-        WITH f, o, count(s) as applicant_count
-
-        // Count Shortlisted (SHORTLISTED)
-        OPTIONAL MATCH (o)-[:SHORTLISTED]->(s_short:Student)
-        WITH f, o, applicant_count, count(s_short) as shortlisted_count
+        // Applicants here are INTERESTED_IN users; both counts are
+        // maintained on the Opening (see app/services/opening_counters.py)
+        WITH f, o, coalesce(o.interest_count, 0) as applicant_count,
+             coalesce(o.shortlisted_count, 0) as shortlisted_count
 
         // Get Domains
         OPTIONAL MATCH (o)-[:REQUIRES]->(c:Concept)
@@ -163,17 +184,16 @@ def get_my_projects(current_user: dict = Depends(get_current_user)):
                domains,
                applicant_count,
                shortlisted_count
-        ORDER BY o.created_at DESC
+        ORDER BY o.created_at DESC, o.id DESC
         """
 
-        results = session.run(query, uid=user_id)
+        rows = list(session.run(query, uid=user_id, fetch=limit + 1, **page_params))
+        results, next_cursor = next_page(rows, limit, key=lambda r: (r["posted_date"], r["id"]))
+        set_next_cursor(response, next_cursor)
         
         projects = []
-        stats = {
-            "active_projects": 0,
-            "total_applicants": 0,
-            "total_shortlisted": 0
-        }
+        # Totals over every opening, not just this page
+        stats = dict(session.run(MY_PROJECT_STATS_QUERY, uid=user_id).single())
 
         for r in results:
             status = r["status"] if r["status"] else "Active"
@@ -189,11 +209,6 @@ def get_my_projects(current_user: dict = Depends(get_current_user)):
                 "shortlisted_count": r["shortlisted_count"] # <--- Added this
             })
 
-            if status == "Active":
-                stats["active_projects"] += 1
-            stats["total_applicants"] += r["applicant_count"]
-            stats["total_shortlisted"] += r["shortlisted_count"]
-
         return {
             "stats": stats,
             "projects": projects
@@ -228,20 +243,32 @@ def get_my_projects(current_user: dict = Depends(get_current_user)):
 
 
 @router.get("/my-projects/{project_id}/shortlisted")
-def get_project_shortlisted(project_id: str, current_user: dict = Depends(get_current_user)):
+def get_project_shortlisted(
+    project_id: str,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
     """ Get students who have been shortlisted """
     if current_user["role"].lower() != "faculty":
         raise HTTPException(status_code=403, detail="Access denied")
 
+    after, page_params = keyset_condition(["coalesce(s.name, '')", "s.user_id"], cursor)
     session = db.get_session()
     try:
         # Query looks for the SHORTLISTED relationship
-        query = """
-        MATCH (o:Opening {id: $pid})-[r:SHORTLISTED]->(s:Student)
+        query = f"""
+        MATCH (o:Opening {{id: $pid}})-[r:SHORTLISTED]->(s:Student)
+        WHERE {after}
         RETURN s.user_id as id, s.name as name, s.roll_no as roll_no, 
                s.department as dept, s.profile_picture as pic
+        ORDER BY coalesce(s.name, '') ASC, s.user_id ASC
+        LIMIT $fetch
         """
-        results = session.run(query, pid=project_id)
+        rows = list(session.run(query, pid=project_id, fetch=limit + 1, **page_params))
+        results, next_cursor = next_page(rows, limit, key=lambda r: (r["name"] or "", r["id"]))
+        set_next_cursor(response, next_cursor)
         return [{"student_id": r["id"], "name": r["name"], "roll_no": r["roll_no"], 
                  "department": r["dept"], "profile_picture": r["pic"]} for r in results]
     finally:
@@ -249,9 +276,18 @@ def get_project_shortlisted(project_id: str, current_user: dict = Depends(get_cu
 
 
 @router.get("/my-projects/{project_id}/applicants")
-def get_project_applicants(project_id: str, current_user: dict = Depends(get_current_user)):
+def get_project_applicants(
+    project_id: str,
+    response: Response,
+    status: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
     """
-    Fetches the list of students who applied to a specific project.
+    Fetches the students who applied to a specific project, ranked by
+    skill + semantic fit (best first) and keyset-paginated.
+    Optional `status`: "Pending" or "Shortlisted".
     """
     if current_user["role"].lower() != "faculty":
         raise HTTPException(status_code=403, detail="Access denied")
@@ -259,33 +295,33 @@ def get_project_applicants(project_id: str, current_user: dict = Depends(get_cur
     session = db.get_session()
 
     try:
-        query = """
-        MATCH (o:Opening {id: $pid})
-        MATCH (s:Student)-[r:INTERESTED_IN]->(o)
-        RETURN s.user_id as id, 
-               s.name as name, 
-               s.roll_no as roll_no, 
-               s.department as dept, 
-               s.profile_picture as pic,
-               r.date as applied_date
-        ORDER BY r.date DESC
-        """
-        
-        results = session.run(query, pid=project_id)
+        page = rank_candidates(
+            session, project_id, rel="INTERESTED_IN", status=status,
+            limit=limit, cursor=cursor,
+        )
+        if page is None:
+            raise HTTPException(status_code=404, detail="Project not found")
+        results, next_cursor = page
+        set_next_cursor(response, next_cursor)
+
         applicants = []
         
         for r in results:
             applicants.append({
                 "student_id": r["id"],
                 "name": r["name"],
-                "roll_no": r["roll_no"],
+                "roll_no": r["roll"],
                 "department": r["dept"],
                 "profile_picture": r["pic"],
-                "applied_date": r["applied_date"].isoformat().split('T')[0] if r["applied_date"] else "Recent"
+                "applied_date": r["interested_at"].isoformat().split('T')[0] if r["interested_at"] else "Recent",
+                "status": r["status"],
+                "match_score": r["match_score"]
             })
             
         return applicants
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     finally:
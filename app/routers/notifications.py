@@ -1,22 +1,43 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from fastapi.security import OAuth2PasswordBearer
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from app.core.config import settings
 from app.core.database import db
-from app.core.security import get_current_user
+from app.core.security import get_current_user, decode_token
+from app.core.etag import bump_users
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, set_next_cursor
+from app.services.notification_bus import notification_bus
+from app.services.notification_service import (
+    REPLAY_PAGE_SIZE, notifications_since, list_notifications, mark_notification_read_for,
+    mark_notifications_read, mark_all_notifications_read,
+)
+import asyncio
+import json
 
 router = APIRouter()
 
+# EventSource can't set headers, so the stream also accepts ?token=
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
+
+class NotificationIds(BaseModel):
+    ids: List[str] = Field(..., min_length=1, max_length=500)
+
 @router.get("/")
-def get_notifications(current_user: dict = Depends(get_current_user)):
+def get_notifications(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
     user_id = current_user["user_id"]
     session = db.get_session()
     try:
         # Match notifications linked to the current user (Student OR Faculty)
-        query = """
-        MATCH (n:Notification)-[:NOTIFIES]->(u:User {user_id: $uid})
-        RETURN n.id as id, n.message as message, n.type as type, 
-               n.is_read as is_read, n.created_at as date
-        ORDER BY n.created_at DESC LIMIT 20
-        """
-        results = session.run(query, uid=user_id)
+        results, next_cursor = list_notifications(session, user_id, limit, cursor)
+        set_next_cursor(response, next_cursor)
         
         notifs = []
         for r in results:
@@ -31,15 +52,106 @@ def get_notifications(current_user: dict = Depends(get_current_user)):
     finally:
         session.close()
 
+@router.put("/read")
+def mark_notifications_read_bulk(data: NotificationIds, current_user: dict = Depends(get_current_user)):
+    session = db.get_session()
+    try:
+        marked = mark_notifications_read(session, current_user["user_id"], data.ids)
+        bump_users(current_user["user_id"])
+        return {"message": "Marked as read", "marked": marked}
+    finally:
+        session.close()
+
+@router.put("/read-all")
+def mark_all_read(current_user: dict = Depends(get_current_user)):
+    session = db.get_session()
+    try:
+        marked = mark_all_notifications_read(session, current_user["user_id"])
+        bump_users(current_user["user_id"])
+        return {"message": "All notifications marked as read", "marked": marked}
+    finally:
+        session.close()
+
 @router.put("/{notif_id}/read")
 def mark_notification_read(notif_id: str, current_user: dict = Depends(get_current_user)):
     session = db.get_session()
     try:
-        query = """
-        MATCH (n:Notification {id: $nid})-[:NOTIFIES]->(u:User {user_id: $uid}) 
-        SET n.is_read = true
-        """
-        session.run(query, nid=notif_id, uid=current_user["user_id"])
+        mark_notification_read_for(session, current_user["user_id"], notif_id)
+        bump_users(current_user["user_id"])
         return {"message": "Marked as read"}
     finally:
-        session.close()
\ No newline at end of file
+        session.close()
+
+
+def _load_missed(user_id: str, last_event_id: str):
+    session = db.get_session()
+    try:
+        return notifications_since(session, user_id, last_event_id)
+    finally:
+        session.close()
+
+
+def _sse(event: dict) -> str:
+    return f"id: {event['id']}\nevent: notification\ndata: {json.dumps(event)}\n\n"
+
+
+@router.get("/stream")
+async def stream_notifications(
+    request: Request,
+    token: Optional[str] = None,
+    last_event_id: Optional[str] = None,
+    header_token: Optional[str] = Depends(optional_oauth2_scheme),
+):
+    """
+    Server-Sent Events: pushes each new notification as it is created.
+    Reconnects send `Last-Event-ID` (or ?last_event_id=) and receive
+    everything created since that notification before going live.
+    """
+    raw_token = header_token or token
+    if not raw_token:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+    user_id = decode_token(raw_token).get("sub")
+    if not user_id:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication credentials")
+
+    resume_from = request.headers.get("last-event-id") or last_event_id
+
+    async def event_stream():
+        # Subscribe before replaying so nothing created in between is lost
+        sub = notification_bus.subscribe(user_id)
+        # Keyed on (id, date): digests keep their id but move their date on
+        # every update, so only exact copies of a replayed event are skipped
+        seen = set()
+        try:
+            yield f"retry: {settings.SSE_HEARTBEAT_SECONDS * 1000}\n\n"
+
+            # Replay the whole backlog a page at a time
+            after = resume_from
+            while after:
+                page = await run_in_threadpool(_load_missed, user_id, after)
+                for event in page:
+                    seen.add((event["id"], event["date"]))
+                    yield _sse(event)
+                after = page[-1]["id"] if len(page) == REPLAY_PAGE_SIZE else None
+
+            while not sub.overflowed:
+                try:
+                    event = await asyncio.wait_for(sub.queue.get(), timeout=settings.SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keep-alive\n\n"
+                    continue
+                if (event["id"], event["date"]) in seen:
+                    continue
+                yield _sse(event)
+            # On overflow the stream ends; the client reconnects with
+            # Last-Event-ID and catches up from the database.
+        finally:
+            notification_bus.unsubscribe(sub)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
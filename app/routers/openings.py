@@ -2,6 +2,10 @@ from fastapi import APIRouter, HTTPException, Depends
 from app.models.openings import OpeningCreate
 from app.core.database import db
 from app.core.security import get_current_user
+from app.core.etag import bump, bump_users, OPENINGS
+from app.services.facet_index import facet_index
+from app.services.outbox import ENQUEUE_OPENING_JOB
+from app.services.profile_projection import refresh_profile_safely
 import uuid
 
 router = APIRouter(tags=["Openings"])
@@ -23,7 +27,7 @@ def create_opening(
         query = """
         MATCH (f:User {user_id: $faculty_id})
 
-        CREATE (o:Opening {
+        CREATE (o:Opening:ActiveOpening {
             id: $opening_id,
             title: $title,
             description: $description,
@@ -33,11 +37,14 @@ def create_opening(
             deadline: $deadline,
             collaboration_type: $collab_type,  // <--- SAVING TO DB
             status: 'Active',
+            applicant_count: 0,
+            interest_count: 0,
+            shortlisted_count: 0,
             created_at: datetime()
         })
 
         MERGE (f)-[:POSTED]->(o)
-
+        """ + ENQUEUE_OPENING_JOB + """
         WITH o
         UNWIND $skills AS skill_name
         MERGE (c:Concept {name: toLower(skill_name)})
@@ -57,9 +64,14 @@ def create_opening(
             target_years=opening.target_years,
             min_cgpa=opening.min_cgpa,
             deadline=str(opening.deadline),
-            collab_type=opening.collaboration_type  # <--- PASSING THE VALUE
+            collab_type=opening.collaboration_type,  # <--- PASSING THE VALUE
+            opening_job_id=str(uuid.uuid4())
         )
 
+        refresh_profile_safely(session, faculty_id)
+        facet_index.refresh_opening(session, opening_id)
+        bump_users(faculty_id)
+        bump(OPENINGS)
         return {"message": "Opening created!", "opening_id": opening_id}
 
     except Exception as e:
@@ -84,7 +96,11 @@ def delete_opening(opening_id: str, current_user: dict = Depends(get_current_use
         
         if not result or result["deleted"] == 0:
             raise HTTPException(status_code=404, detail="Opening not found")
-            
+
+        refresh_profile_safely(session, current_user["user_id"])
+        facet_index.remove_openings([opening_id])
+        bump_users(current_user["user_id"])
+        bump(OPENINGS)
         return {"message": "Deleted successfully"}
     finally:
         session.close()
\ No newline at end of file
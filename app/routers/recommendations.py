@@ -112,21 +112,26 @@ def get_opening_recommendations(
 def semantic_student_search(
     q: str = Query(..., description="Search query"),
     limit: int = 5,
+    department: str = None,
+    batch: str = None,
+    min_cgpa: float = None,
     current_user: dict = Depends(get_current_user)
 ):
     """
     Semantic search for students using vector similarity.
+    Optional department / batch / min_cgpa filters are applied in the search.
     Example queries:
     - "machine learning and NLP"
     - "python backend developer"
     """
-    return semantic_search_students(q, limit)
+    return semantic_search_students(q, limit, department=department, batch=batch, min_cgpa=min_cgpa)
 
 
 @router.get("/search/faculty")
 def semantic_faculty_search(
     q: str = Query(..., description="Search query"),
     limit: int = 5,
+    department: str = None,
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -135,4 +140,4 @@ def semantic_faculty_search(
     - "computer networks security"
     - "deep learning researcher"
     """
-    return semantic_search_faculty(q, limit)
+    return semantic_search_faculty(q, limit, department=department)
@@ -2,6 +2,8 @@ from fastapi import APIRouter, HTTPException, Depends
 from app.core.security import get_current_user 
 from app.models.project import StudentWorkCreate
 from app.core.database import db
+from app.core.etag import bump_users
+from app.services.profile_projection import refresh_profile_safely
 import uuid
 
 router = APIRouter()
@@ -65,6 +67,8 @@ def add_student_project(
             type=work.type,
             tools=work.tools_used
         )
+        refresh_profile_safely(session, secure_user_id)
+        bump_users(secure_user_id)
         return {"message": "Project added to student portfolio!", "id": work_id}
 
     except Exception as e:
@@ -1,108 +1,114 @@
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from app.models.user import StudentProfileUpdate, FacultyProfileUpdate
 from app.core.database import db
 from app.core.security import get_current_user
+from app.core.etag import check_not_modified, bump, bump_users, user_key, OPENINGS, STUDENTS
+from app.services.vector_index import vector_index
+from app.services.facet_index import facet_index
+from app.services.profile_projection import get_profile_document, refresh_profile_safely, works_with
+from app.core.config import settings
+from app.core.rate_limit import RateLimiter
+from app.services.storage import store_image, parse_upload_form, PROFILE_PICTURE_FOLDER
 import shutil
 import uuid
 import os
 from datetime import datetime
 
 router = APIRouter()
-import cloudinary
-import cloudinary.uploader
-from app.core.config import settings
 
-# Configure Cloudinary (Move this to your app startup or config)
-cloudinary.config(
-    cloud_name=settings.CLOUDINARY_CLOUD_NAME,
-    api_key=settings.CLOUDINARY_API_KEY,
-    api_secret=settings.CLOUDINARY_API_SECRET,
-    secure=True
-)
+upload_limiter = RateLimiter(settings.UPLOAD_RATE_LIMIT, settings.UPLOAD_RATE_WINDOW_SECONDS)
+
+# The body is parsed by hand (parse_upload_form) so the size cap applies
+# before anything is spooled; this keeps the file field in the docs.
+UPLOAD_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {"multipart/form-data": {"schema": {
+            "type": "object",
+            "properties": {"file": {"type": "string", "format": "binary"}},
+            "required": ["file"],
+        }}},
+    }
+}
 
 # ✅ FIXED: Removed 'Depends(get_current_user)' so anyone can upload a signup photo
-@router.post("/upload-profile-picture")
-async def upload_profile_picture(file: UploadFile = File(...)):
+# (rate-limited per IP, size-capped and sniffed as an image instead; see app/services/storage.py)
+@router.post("/upload-profile-picture", openapi_extra=UPLOAD_REQUEST_BODY)
+async def upload_profile_picture(request: Request):
+    upload_limiter.check(request)
+    form, file = await parse_upload_form(request)
     try:
-        # 1. Upload to Cloudinary
-        upload_result = cloudinary.uploader.upload(
-            file.file,
-            folder="guru_setu_profiles",
-            transformation=[{"width": 400, "height": 400, "crop": "fill", "gravity": "face"}]
-        )
-        
-        # 2. Return the URL
-        return {"url": upload_result.get("secure_url")}
+        # Streamed to the configured backend (Cloudinary or local uploads/)
+        url = await store_image(file, PROFILE_PICTURE_FOLDER)
+        return {"url": url}
         
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"Cloudinary Error: {e}")
+        print(f"Upload Error: {e}")
         raise HTTPException(status_code=500, detail="Failed to upload image")
+    finally:
+        await form.close()
 
 # --- B. GET Student Profile ---
 @router.get("/student/profile/{user_id}")
-def get_student_profile(user_id: str, current_user: dict = Depends(get_current_user)):
+def get_student_profile(user_id: str, request: Request, response: Response, current_user: dict = Depends(get_current_user)):
+    not_modified = check_not_modified(request, response, user_key(user_id))
+    if not_modified:
+        return not_modified
     return get_generic_profile(user_id)
 
 # --- C. GET Faculty Profile ---
 @router.get("/faculty/profile/{user_id}")
-def get_faculty_profile(user_id: str, current_user: dict = Depends(get_current_user)):
+def get_faculty_profile(user_id: str, request: Request, response: Response, current_user: dict = Depends(get_current_user)):
+    not_modified = check_not_modified(request, response, user_key(user_id))
+    if not_modified:
+        return not_modified
+
     session = db.get_session()
     try:
-        query = """
-        MATCH (u:User {user_id: $uid})
-        OPTIONAL MATCH (u)-[:INTERESTED_IN]->(i:Concept)
-        RETURN u, collect(DISTINCT i.name) as domain_interests
-        """
-        result = session.run(query, uid=user_id).single()
-        
-        if not result:
-            raise HTTPException(status_code=404, detail="Faculty not found")
-            
-        user_data = dict(result["u"])
-        user_data["domain_interests"] = result["domain_interests"]
-
-        work_query = """
-        MATCH (u:User {user_id: $uid})-[:WORKED_ON]->(w:Work)
-        RETURN w.title as title, w.type as type, w.year as year, 
-               w.outcome as outcome, w.collaborators as collaborators
-        """
-        previous_work = [dict(record) for record in session.run(work_query, uid=user_id)]
-        
-        return {**user_data, "previous_work": previous_work}
+        doc = get_profile_document(session, user_id)
     finally:
         session.close()
 
+    if not doc:
+        raise HTTPException(status_code=404, detail="Faculty not found")
+
+    previous_work = [
+        {k: w.get(k) for k in ("title", "type", "year", "outcome", "collaborators")}
+        for w in works_with(doc, {"WORKED_ON"})
+    ]
+    return {**doc["user"], "domain_interests": doc["interests"], "previous_work": previous_work}
+
 # Helper Function
 def get_generic_profile(user_id):
+    # Single key lookup of the materialized profile document
     session = db.get_session()
     try:
-        query = """
-        MATCH (u:User {user_id: $uid})
-        OPTIONAL MATCH (u)-[:HAS_SKILL]->(s:Concept)
-        OPTIONAL MATCH (u)-[:INTERESTED_IN]->(i:Concept)
-        RETURN u, collect(DISTINCT s.name) as skills, collect(DISTINCT i.name) as interests
-        """
-        result = session.run(query, uid=user_id).single()
-        if not result: raise HTTPException(status_code=404, detail="User not found")
-        
-        user_data = dict(result["u"])
-        user_data["skills"] = result["skills"]
-        user_data["interests"] = result["interests"]
-        
-        # ✅ Ensure roll_no is explicitly checked
-        if "roll_no" not in user_data:
-            user_data["roll_no"] = ""
-
-        proj_query = "MATCH (u:User {user_id: $uid})-[:WORKED_ON]->(w:Work {type: 'Student Project'}) RETURN w.title as title, w.description as description, w.duration as duration, w.from_date as from_date, w.to_date as to_date, w.tools as tools"
-        projects = [dict(record) for record in session.run(proj_query, uid=user_id)]
-        
-        pub_query = "MATCH (u:User {user_id: $uid})-[:PUBLISHED]->(w:Work {type: 'Publication'}) RETURN w.title as title, w.year as year, w.publisher as publisher, w.link as link"
-        publications = [dict(record) for record in session.run(pub_query, uid=user_id)]
-        
-        return {**user_data, "projects": projects, "publications": publications}
+        doc = get_profile_document(session, user_id)
     finally:
         session.close()
 
+    if not doc: raise HTTPException(status_code=404, detail="User not found")
+    
+    user_data = dict(doc["user"])
+    user_data["skills"] = doc["skills"]
+    user_data["interests"] = doc["interests"]
+    
+    # ✅ Ensure roll_no is explicitly checked
+    if "roll_no" not in user_data:
+        user_data["roll_no"] = ""
+
+    projects = [
+        {k: w.get(k) for k in ("title", "description", "duration", "from_date", "to_date", "tools")}
+        for w in works_with(doc, {"WORKED_ON"}, "Student Project")
+    ]
+    publications = [
+        {k: w.get(k) for k in ("title", "year", "publisher", "link")}
+        for w in works_with(doc, {"PUBLISHED"}, "Publication")
+    ]
+    return {**user_data, "projects": projects, "publications": publications}
+
 # --- D. UPDATE Student Profile ---
 @router.put("/student/profile")
 def update_student_profile(
@@ -127,6 +133,7 @@ def update_student_profile(
             u.phone = $phone,
             u.department = $dept,
             u.batch = $batch,
+            u.cgpa = $cgpa,
             u.bio = $bio
 
         WITH u
@@ -176,10 +183,11 @@ def update_student_profile(
             CREATE (u)-[:PUBLISHED]->(w)
         )
         
-        RETURN u.user_id
+        RETURN u.name AS name, u.department AS department, u.batch AS batch,
+               u.profile_picture AS profile_picture, u.cgpa AS cgpa
         """
 
-        session.run(
+        stored = session.run(
             query,
             user_id=user_id,
             name=data.name,
@@ -187,12 +195,20 @@ def update_student_profile(
             phone=data.phone,
             dept=data.department,
             batch=data.batch,
+            cgpa=data.cgpa,
             bio=data.bio,
             skills=data.skills,
             interests=data.interests,
             projects=projects_data,
             publications=publications_data
-        )
+        ).single()
+        # Stored values, so fields the update cleared are cleared in the index too
+        if stored:
+            vector_index.update_attributes(user_id, **stored.data())
+        refresh_profile_safely(session, user_id)
+        facet_index.refresh_user(session, user_id)
+        bump_users(user_id)
+        bump(STUDENTS)
         return {"message": "Profile updated successfully"}
     except Exception as e:
         print(f"Student Update Error: {e}")
@@ -263,10 +279,11 @@ def update_faculty_profile(
             CREATE (f)-[:WORKED_ON]->(w)
         )
 
-        RETURN f.user_id
+        RETURN f.name AS name, f.department AS department, f.designation AS designation,
+               f.profile_picture AS profile_picture
         """
 
-        session.run(
+        stored = session.run(
             query,
             user_id=user_id,
             name=data.name,
@@ -284,7 +301,13 @@ def update_faculty_profile(
             phd_details=data.phd_details,
             domain_interests=data.domain_interests,
             previous_work=work_data
-        )
+        ).single()
+        if stored:
+            vector_index.update_attributes(user_id, **stored.data())
+        refresh_profile_safely(session, user_id)
+        facet_index.refresh_user(session, user_id)
+        bump_users(user_id)
+        bump(OPENINGS)  # faculty name/department/picture appear on opening cards
 
         return {"message": "Faculty profile updated successfully"}
 
@@ -0,0 +1,102 @@
+from app.core.database import db
+from app.core.config import settings
+from app.services.embedding import generate_embeddings
+from app.services.similarity import normalize_rows, many_vs_many, top_k
+import logging
+import sys
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+WRITE_BATCH_SIZE = 1000
+BLOCK_SIZE = 1024
+
+
+def top_neighbours(names, vectors, top_n, min_weight):
+    """
+    Returns [(source, target, weight), ...] keeping at most `top_n`
+    neighbours per concept with cosine similarity >= `min_weight`.
+    """
+    matrix = normalize_rows(vectors)
+    pairs = []
+    if len(names) < 2:
+        return pairs
+
+    # Score in row blocks so memory stays O(BLOCK_SIZE * n)
+    for start in range(0, len(names), BLOCK_SIZE):
+        block = many_vs_many(matrix[start:start + BLOCK_SIZE], matrix)
+        for offset, row in enumerate(block):
+            i = start + offset
+            row[i] = -1.0  # never a neighbour of itself
+            for j in top_k(row, top_n):
+                if row[j] < min_weight:
+                    break
+                pairs.append((names[i], names[j], round(float(row[j]), 4)))
+    return pairs
+
+
+def build_concept_similarity(top_n: int, min_weight: float):
+    """
+    Embeds every Concept once and stores its nearest neighbours as
+    (:Concept)-[:SIMILAR_TO {w}]->(:Concept) for soft skill matching.
+    """
+    session = None
+    logger.info("🚧 Building concept similarity graph...")
+
+    try:
+        session = db.get_session()
+
+        names = [r["name"] for r in session.run(
+            "MATCH (c:Concept) WHERE c.name IS NOT NULL RETURN c.name AS name"
+        )]
+        logger.info(f"Embedding {len(names)} concepts")
+
+        vectors = generate_embeddings(names)
+        usable = [(n, v) for n, v in zip(names, vectors) if v]
+        if len(usable) < 2:
+            logger.info("Not enough concepts to compare. Nothing to do.")
+            return
+
+        pairs = top_neighbours(
+            [n for n, _ in usable], [v for _, v in usable], top_n, min_weight
+        )
+        logger.info(f"Computed {len(pairs)} neighbour edges")
+
+        session.run("""
+        MATCH (:Concept)-[r:SIMILAR_TO]->(:Concept)
+        CALL { WITH r DELETE r } IN TRANSACTIONS OF 10000 ROWS
+        """)
+
+        write_query = """
+        UNWIND $pairs AS p
+        MATCH (a:Concept {name: p.source})
+        MATCH (b:Concept {name: p.target})
+        CREATE (a)-[:SIMILAR_TO {w: p.w}]->(b)
+        """
+        for start in range(0, len(pairs), WRITE_BATCH_SIZE):
+            chunk = pairs[start:start + WRITE_BATCH_SIZE]
+            session.run(write_query, pairs=[
+                {"source": s, "target": t, "w": w} for s, t, w in chunk
+            ])
+
+        logger.info("🎉 Concept similarity graph built successfully!")
+
+    finally:
+        if session is not None:
+            session.close()
+            logger.info("🔒 Database session closed.")
+
+
+if __name__ == "__main__":
+    try:
+        db.connect()
+        build_concept_similarity(
+            top_n=settings.CONCEPT_SIMILARITY_TOP_N,
+            min_weight=settings.CONCEPT_SIMILARITY_MIN_WEIGHT,
+        )
+    except Exception:
+        logger.exception("💥 Concept similarity build failed. Aborting.")
+        sys.exit(1)
+    finally:
+        db.close()
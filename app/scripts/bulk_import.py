@@ -0,0 +1,48 @@
+from app.core.database import db
+from app.services.bulk_import import import_users, import_openings
+import argparse
+import json
+import logging
+import sys
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+IMPORTERS = {"users": import_users, "openings": import_openings}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Bulk-create users or openings from a CSV or JSONL file. "
+                    "CSV list columns (required_skills, target_years) separate values with ';'."
+    )
+    parser.add_argument("kind", choices=sorted(IMPORTERS))
+    parser.add_argument("path", help=".csv or .jsonl file")
+    parser.add_argument("--batch-size", type=int, help="Rows per write (defaults to BULK_IMPORT_BATCH_SIZE)")
+    parser.add_argument("--workers", type=int, help="Password hashing processes (users only)")
+    parser.add_argument("--errors-out", help="Write rejected rows here as JSONL")
+    args = parser.parse_args()
+
+    options = {"batch_size": args.batch_size}
+    if args.kind == "users":
+        options["workers"] = args.workers
+
+    try:
+        db.connect()
+        logger.info(f"🚧 Importing {args.kind} from {args.path}...")
+        report = IMPORTERS[args.kind](args.path, **options)
+
+        for error in report["errors"]:
+            logger.warning(f"Line {error['line']}: {error['error']}")
+        if args.errors_out:
+            with open(args.errors_out, "w", encoding="utf-8") as f:
+                for error in report["errors"]:
+                    f.write(json.dumps(error) + "\n")
+
+        logger.info(f"🎉 Created {report['created']} {args.kind}, rejected {len(report['errors'])} rows")
+    except Exception:
+        logger.exception("💥 Bulk import failed. Aborting.")
+        sys.exit(1)
+    finally:
+        db.close()
@@ -18,10 +18,22 @@ def create_constraints():
 
     queries = [
         # --- 1. Uniqueness Constraints ---
+        "CREATE CONSTRAINT user_id_unique IF NOT EXISTS FOR (u:User) REQUIRE u.user_id IS UNIQUE",
         "CREATE CONSTRAINT user_email_unique IF NOT EXISTS FOR (u:User) REQUIRE u.email IS UNIQUE",
         "CREATE CONSTRAINT student_roll_unique IF NOT EXISTS FOR (s:Student) REQUIRE s.roll_no IS UNIQUE",
         "CREATE CONSTRAINT faculty_emp_unique IF NOT EXISTS FOR (f:Faculty) REQUIRE f.employee_id IS UNIQUE",
         "CREATE CONSTRAINT concept_name_unique IF NOT EXISTS FOR (c:Concept) REQUIRE c.name IS UNIQUE",
+        "CREATE CONSTRAINT outbox_job_id_unique IF NOT EXISTS FOR (j:OutboxJob) REQUIRE j.id IS UNIQUE",
+        "CREATE CONSTRAINT notification_id_unique IF NOT EXISTS FOR (n:Notification) REQUIRE n.id IS UNIQUE",
+        "CREATE CONSTRAINT applied_to_key_unique IF NOT EXISTS FOR ()-[r:APPLIED_TO]-() REQUIRE r.key IS UNIQUE",
+        "CREATE CONSTRAINT notification_digest_key_unique IF NOT EXISTS FOR (n:Notification) REQUIRE n.digest_key IS UNIQUE",
+
+        # --- Lookup Indexes ---
+        "CREATE INDEX outbox_job_due IF NOT EXISTS FOR (j:OutboxJob) ON (j.status, j.available_at)",
+        "CREATE INDEX notification_created_at IF NOT EXISTS FOR (n:Notification) ON (n.created_at)",
+        "CREATE INDEX notification_created_at_id IF NOT EXISTS FOR (n:Notification) ON (n.created_at, n.id)",
+        "CREATE INDEX active_opening_created_at IF NOT EXISTS FOR (o:ActiveOpening) ON (o.created_at)",
+        "CREATE INDEX active_opening_deadline IF NOT EXISTS FOR (o:ActiveOpening) ON (o.deadline)",
 
         # --- 2. Vector Indexes ---
         """
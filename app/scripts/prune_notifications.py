@@ -0,0 +1,28 @@
+from app.core.database import db
+from app.services.notification_retention import prune_notifications
+import argparse
+import logging
+import sys
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Delete notifications past their retention TTL.")
+    parser.add_argument("--archive-dir", help="Append deleted notifications to gzip JSONL here first "
+                                              "(defaults to NOTIFICATION_ARCHIVE_DIR)")
+    args = parser.parse_args()
+
+    try:
+        db.connect()
+        logger.info("🚧 Pruning expired notifications...")
+        report = prune_notifications(archive_dir=args.archive_dir)
+        logger.info(f"🎉 Removed {report['removed']} notifications"
+                    + (f", archived to {report['archive']}" if report["archive"] else ""))
+    except Exception:
+        logger.exception("💥 Notification retention failed. Aborting.")
+        sys.exit(1)
+    finally:
+        db.close()
@@ -0,0 +1,21 @@
+from app.core.database import db
+from app.services.opening_counters import reconcile_opening_counters
+import logging
+import sys
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+if __name__ == "__main__":
+    try:
+        db.connect()
+        logger.info("🚧 Reconciling opening pipeline counters...")
+        reconcile_opening_counters()
+        logger.info("🎉 Opening counters reconciled!")
+    except Exception:
+        logger.exception("💥 Opening counter reconcile failed. Aborting.")
+        sys.exit(1)
+    finally:
+        db.close()
@@ -0,0 +1,21 @@
+from app.core.database import db
+from app.services.notification_service import recount_unread_counts
+import logging
+import sys
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+if __name__ == "__main__":
+    try:
+        db.connect()
+        logger.info("🚧 Recounting unread notifications for every user...")
+        recount_unread_counts()
+        logger.info("🎉 Unread counters repaired!")
+    except Exception:
+        logger.exception("💥 Unread counter repair failed. Aborting.")
+        sys.exit(1)
+    finally:
+        db.close()
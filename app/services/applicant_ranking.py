@@ -0,0 +1,77 @@
+from app.core.pagination import decode_cursor, next_page
+from app.services.concept_similarity import expand_concept_weights
+
+# Share of the final score coming from skill overlap vs. profile semantics
+SKILL_WEIGHT = 0.7
+SEMANTIC_WEIGHT = 0.3
+
+# How each candidate relationship exposes a pipeline status
+STATUS_EXPRESSIONS = {
+    "APPLIED_TO": "coalesce(r.status, 'Pending')",
+    "INTERESTED_IN": "CASE WHEN (o)-[:SHORTLISTED]->(s) THEN 'Shortlisted' ELSE 'Pending' END",
+}
+
+
+def _required_concepts(session, opening_id: str):
+    """Names of the concepts an opening REQUIRES; None if it doesn't exist."""
+    record = session.run("""
+    MATCH (o:Opening {id: $pid})
+    OPTIONAL MATCH (o)-[:REQUIRES]->(c:Concept)
+    RETURN collect(DISTINCT c.name) AS required
+    """, pid=opening_id).single()
+    return record["required"] if record else None
+
+
+def rank_candidates(session, opening_id: str, rel: str = "APPLIED_TO", status: str = None,
+                    exclude: str = None, limit: int = 20, cursor: str = None):
+    """
+    One page of an opening's candidates (students linked by `rel`), best
+    fit first. Fit = soft skill overlap with the opening's REQUIRES
+    concepts (SIMILAR_TO-expanded) blended with embedding similarity, both
+    scored in Cypher so only the page leaves the database. `status` keeps
+    one pipeline status; `exclude` is a Cypher predicate on (o, s, r) for
+    default views. Keyset-paginated on (score DESC, user_id); returns
+    (items, next_cursor), or None if the opening doesn't exist.
+    """
+    after = decode_cursor(cursor, 2)
+    required = _required_concepts(session, opening_id)
+    if required is None:
+        return None
+
+    weights = expand_concept_weights(session, required)
+    status_expr = STATUS_EXPRESSIONS[rel]
+
+    # o.embedding is written by the outbox worker when the opening is created;
+    # until then (or for students without one) the skill score stands alone.
+    # vector.similarity.cosine already maps cosine into [0, 1].
+    query = f"""
+    MATCH (o:Opening {{id: $pid}})<-[r:{rel}]-(s:Student)
+    WITH o, s, r, {status_expr} AS status
+    WHERE ($status IS NULL OR status = $status) {f"AND NOT ({exclude})" if exclude else ""}
+    WITH o, s, r, status,
+         reduce(acc = 0.0, k IN COLLECT {{ MATCH (s)-[:HAS_SKILL]->(sk:Concept) RETURN DISTINCT toLower(sk.name) }}
+                | acc + coalesce($weights[k], 0.0)) / $required AS overlap,
+         CASE WHEN o.embedding IS NOT NULL AND s.embedding IS NOT NULL
+                   AND size(o.embedding) = size(s.embedding)
+              THEN vector.similarity.cosine(o.embedding, s.embedding) END AS semantic
+    WITH s, r, status, semantic, CASE WHEN overlap > 1 THEN 1.0 ELSE overlap END AS skill
+    WITH s, r, status,
+         round(100 * CASE WHEN semantic IS NULL THEN skill
+                          WHEN NOT $has_required THEN semantic
+                          ELSE $skill_weight * skill + $semantic_weight * semantic END, 2) AS match_score
+    WHERE $after_score IS NULL OR match_score < $after_score
+       OR (match_score = $after_score AND s.user_id > $after_id)
+    RETURN s.user_id AS id, s.name AS name, s.roll_no AS roll, s.department AS dept,
+           s.profile_picture AS pic, status, r.applied_at AS applied_at, r.date AS interested_at,
+           match_score
+    ORDER BY match_score DESC, id
+    LIMIT $fetch
+    """
+    after_score, after_id = after or (None, None)
+    rows = [r.data() for r in session.run(
+        query, pid=opening_id, status=status, weights=weights,
+        required=float(max(len(required), 1)), has_required=bool(required),
+        skill_weight=SKILL_WEIGHT, semantic_weight=SEMANTIC_WEIGHT,
+        after_score=after_score, after_id=after_id, fetch=limit + 1,
+    )]
+    return next_page(rows, limit, key=lambda row: (row["match_score"], row["id"]))
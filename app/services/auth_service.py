@@ -1,24 +1,34 @@
 import uuid
 import logging
 from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
 from app.core.database import db
-from app.core.security import hash_password, verify_password, create_access_token
+from app.core.security import hash_password, verify_password, create_access_token, display_claims_for
+from app.core.etag import bump, STUDENTS
 from app.models.auth import UserRegister, UserLogin, UserVerifyIdentity, UserResetPassword
-from app.services.embedding import generate_embedding
+from app.services.outbox import ENQUEUE_USER_JOB, USER_REGISTERED, job_params
 
 logger = logging.getLogger(__name__)
 
-def register_user(user: UserRegister):
+async def register_user(user: UserRegister):
+    # Reject duplicates before paying for a bcrypt hash; _create_user
+    # re-checks in case of a concurrent signup
+    if await run_in_threadpool(_find_user_by_email, user.email.strip().lower()):
+        raise HTTPException(status_code=400, detail="Email already registered")
+
+    # bcrypt runs in the hashing process pool; DB work on the threadpool
+    hashed_pw = await hash_password(user.password.strip())
+    return await run_in_threadpool(_create_user, user, hashed_pw)
+
+def _create_user(user: UserRegister, hashed_pw: str):
     session = db.get_session()
     try:
         clean_email = user.email.strip().lower()
-        clean_password = user.password.strip()
 
         # Check existing
         result = session.run("MATCH (u:User {email: $email}) RETURN u", email=clean_email).single()
         if result: raise HTTPException(status_code=400, detail="Email already registered")
 
-        hashed_pw = hash_password(clean_password)
         user_id = str(uuid.uuid4())
         
         # Safe inputs
@@ -30,9 +40,6 @@ def register_user(user: UserRegister):
         # (Default to None if not provided, or an empty string if you prefer)
         profile_pic = getattr(user, "profile_picture", None) 
 
-        profile_text = f"{user.name} {user.role} {dept}"
-        embedding = generate_embedding(profile_text)
-
         role_lower = user.role.lower()
         
         if role_lower == "student":
@@ -46,12 +53,12 @@ def register_user(user: UserRegister):
                 roll_no: $roll, 
                 department: $dept, 
                 profile_picture: $pic,  // <--- ADDED THIS FIELD
-                embedding: $emb, 
+                embedding_pending: true,  // filled in by the outbox worker
                 is_active: true
-            }) RETURN u.user_id"""
+            })""" + ENQUEUE_USER_JOB + "RETURN u.user_id"
             
             session.run(query, uid=user_id, email=clean_email, pw=hashed_pw, name=user.name, 
-                        roll=roll_no, dept=dept, pic=profile_pic, emb=embedding)
+                        roll=roll_no, dept=dept, pic=profile_pic, **job_params(USER_REGISTERED))
         
         elif role_lower == "faculty":
             query = """
@@ -64,12 +71,17 @@ def register_user(user: UserRegister):
                 employee_id: $empid, 
                 department: $dept, 
                 profile_picture: $pic,  // <--- ADDED THIS FIELD
-                embedding: $emb, 
+                embedding_pending: true,  // filled in by the outbox worker
                 is_active: true
-            }) RETURN u.user_id"""
+            })""" + ENQUEUE_USER_JOB + "RETURN u.user_id"
             
             session.run(query, uid=user_id, email=clean_email, pw=hashed_pw, name=user.name, 
-                        empid=emp_id, dept=dept, pic=profile_pic, emb=embedding)
+                        empid=emp_id, dept=dept, pic=profile_pic, **job_params(USER_REGISTERED))
+
+        # Embedding, vector-index insert and welcome notification run in
+        # the outbox worker (app/services/outbox.py)
+        if role_lower == "student":
+            bump(STUDENTS)
 
         return {"message": "User registered successfully", "user_id": user_id}
 
@@ -79,29 +91,78 @@ def register_user(user: UserRegister):
         raise HTTPException(status_code=500, detail=str(e))
     finally: session.close()
 
-def login_user(user: UserLogin):
+async def login_user(user: UserLogin):
+    clean_email = user.email.strip().lower()
+
+    # Fetch user
+    found = await run_in_threadpool(_find_user_by_email, clean_email)
+
+    # Check if user exists and password matches (bcrypt off the request thread)
+    matches, new_hash = (False, None)
+    if found:
+        matches, new_hash = await verify_password(user.password.strip(), found.get("password_hash", ""))
+    if not matches:
+        raise HTTPException(status_code=400, detail="Invalid email or password")
+
+    # Stored hash uses an outdated cost/scheme: upgrade it transparently
+    if new_hash:
+        await run_in_threadpool(_store_password_hash, found["user_id"], new_hash)
+
+    # ✅ Get the actual role from the database
+    db_role = found.get("role", "").lower()
+
+    # Generate Token
+    token = create_access_token(
+        user_id=found["user_id"], role=db_role,
+        claims=display_claims_for(found)
+    )
+
+    # Return role so frontend can verify context
+    return {
+        "access_token": token, 
+        "token_type": "bearer", 
+        "role": db_role,  # Sending this allows frontend to block mismatches
+        "user_id": found["user_id"]
+    }
+
+def _find_user_by_email(email: str):
     session = db.get_session()
     try:
-        clean_email = user.email.strip().lower()
-        
-        # Fetch user
-        result = session.run("MATCH (u:User {email: $email}) RETURN u", email=clean_email).single()
-        
-        # Check if user exists and password matches
-        if not result or not verify_password(user.password.strip(), result["u"].get("password_hash", "")):
-            raise HTTPException(status_code=400, detail="Invalid email or password")
-            
-        # ✅ Get the actual role from the database
+        result = session.run("MATCH (u:User {email: $email}) RETURN u", email=email).single()
+        return dict(result["u"]) if result else None
+    finally: session.close()
+
+def _store_password_hash(user_id: str, password_hash: str):
+    session = db.get_session()
+    try:
+        session.run("MATCH (u:User {user_id: $uid}) SET u.password_hash = $pw", uid=user_id, pw=password_hash)
+    except Exception:
+        # Login already succeeded; the upgrade is retried on the next login
+        logger.exception(f"Password rehash failed for {user_id}")
+    finally: session.close()
+
+def refresh_token(current_user: dict):
+    """
+    Re-issues a token with up-to-date display claims. Clients call this
+    after a profile change so menus rendered from the token stay current.
+    """
+    session = db.get_session()
+    try:
+        result = session.run(
+            "MATCH (u:User {user_id: $uid}) RETURN u", uid=current_user["user_id"]
+        ).single()
+        if not result:
+            raise HTTPException(status_code=401, detail="User no longer exists")
+
         db_role = result["u"].get("role", "").lower()
-        
-        # Generate Token
-        token = create_access_token(user_id=result["u"]["user_id"], role=db_role)
-        
-        # Return role so frontend can verify context
+        token = create_access_token(
+            user_id=result["u"]["user_id"], role=db_role,
+            claims=display_claims_for(dict(result["u"]))
+        )
         return {
-            "access_token": token, 
-            "token_type": "bearer", 
-            "role": db_role,  # Sending this allows frontend to block mismatches
+            "access_token": token,
+            "token_type": "bearer",
+            "role": db_role,
             "user_id": result["u"]["user_id"]
         }
     finally: session.close()
@@ -118,11 +179,13 @@ def verify_identity(data: UserVerifyIdentity):
         return {"message": "Verified"}
     finally: session.close()
 
-def reset_password(data: UserResetPassword):
+async def reset_password(data: UserResetPassword):
+    new_pw = await hash_password(data.new_password.strip())
+    return await run_in_threadpool(_set_password, data.email.strip().lower(), new_pw)
+
+def _set_password(email: str, new_pw: str):
     session = db.get_session()
     try:
-        email = data.email.strip().lower()
-        new_pw = hash_password(data.new_password.strip())
         session.run("MATCH (u:User {email: $email}) SET u.password_hash = $pw", email=email, pw=new_pw)
         return {"message": "Password updated"}
     finally: session.close()
\ No newline at end of file
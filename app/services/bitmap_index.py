@@ -0,0 +1,93 @@
+from collections import defaultdict
+import numpy as np
+
+
+def _values(value):
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [v for v in value if v is not None]
+    return [value]
+
+
+class BitmapIndex:
+    """
+    Attribute -> row bitmap index. Each (field, value) pair owns a Python
+    int used as a bitset over row numbers, so filters are a handful of
+    bitwise ANDs and counts are popcounts. Multi-valued attributes
+    (lists) set one bit per value.
+
+    Not thread-safe on its own; owners guard it with their own lock.
+    """
+
+    def __init__(self):
+        self._bitmaps = defaultdict(int)
+        self._row_keys = {}
+
+    def set_row(self, row: int, attrs: dict):
+        self.clear_row(row)
+        bit = 1 << row
+        keys = []
+        for field, value in attrs.items():
+            for v in _values(value):
+                key = (field, v)
+                self._bitmaps[key] |= bit
+                keys.append(key)
+        self._row_keys[row] = keys
+
+    def clear_row(self, row: int):
+        keys = self._row_keys.pop(row, None)
+        if not keys:
+            return
+        mask = ~(1 << row)
+        for key in keys:
+            remaining = self._bitmaps[key] & mask
+            if remaining:
+                self._bitmaps[key] = remaining
+            else:
+                del self._bitmaps[key]
+
+    def bitmap(self, field: str, value) -> int:
+        return self._bitmaps.get((field, value), 0)
+
+    def match(self, filters: dict, universe: int) -> int:
+        """
+        ANDs `universe` with the bitmap of every non-empty filter.
+        A list value means "any of these" (OR within a field).
+        """
+        result = universe
+        for field, value in filters.items():
+            values = _values(value)
+            if not values:
+                continue
+            field_bits = 0
+            for v in values:
+                field_bits |= self._bitmaps.get((field, v), 0)
+            result &= field_bits
+            if not result:
+                break
+        return result
+
+    def values(self, field: str) -> list:
+        """Every value of `field` that currently has at least one row."""
+        return [value for (f, value) in self._bitmaps if f == field]
+
+    def counts(self, field: str, mask: int) -> dict:
+        """Number of rows in `mask` per value of `field` (zero counts omitted)."""
+        counts = {}
+        for (f, value), bits in self._bitmaps.items():
+            if f != field:
+                continue
+            n = (bits & mask).bit_count()
+            if n:
+                counts[value] = n
+        return counts
+
+
+def bitmap_to_mask(bitmap: int, size: int) -> np.ndarray:
+    """Expands an int bitset into a numpy bool mask of length `size`."""
+    if size == 0:
+        return np.zeros(0, dtype=bool)
+    raw = bitmap.to_bytes((size + 7) // 8, "little")
+    bits = np.unpackbits(np.frombuffer(raw, dtype=np.uint8), bitorder="little")
+    return bits[:size].astype(bool)
@@ -0,0 +1,313 @@
+import csv
+import json
+import logging
+import multiprocessing
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from pydantic import ValidationError
+
+from app.core import hashing
+from app.core.config import settings
+from app.core.database import db
+from app.models.auth import UserRegister
+from app.models.openings import OpeningImport
+from app.services.outbox import USER_REGISTERED, enqueue_user_job, enqueue_opening_job
+from app.services.profile_projection import refresh_profile_safely
+
+logger = logging.getLogger(__name__)
+
+# CSV cells holding several values separate them with ";"
+LIST_FIELDS = {"required_skills", "target_years"}
+
+# ---------------------------------------------------------
+# Reading + validation (streamed: one batch in memory at a time)
+# ---------------------------------------------------------
+
+def read_rows(path: str):
+    """
+    Yields (line, row, error) for every record of a .csv or .jsonl file.
+    `row` is None when the line itself couldn't be parsed.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.lower().endswith(".csv"):
+            reader = csv.DictReader(f)
+            for row in reader:
+                clean = {}
+                for key, value in row.items():
+                    value = (value or "").strip()
+                    if not key or not value:
+                        continue
+                    clean[key.strip()] = [v.strip() for v in value.split(";") if v.strip()] \
+                        if key.strip() in LIST_FIELDS else value
+                yield reader.line_num, clean, None
+        else:
+            for line, text in enumerate(f, start=1):
+                if not text.strip():
+                    continue
+                try:
+                    row = json.loads(text)
+                except ValueError as e:
+                    yield line, None, f"Invalid JSON: {e}"
+                    continue
+                if not isinstance(row, dict):
+                    yield line, None, "Expected a JSON object"
+                    continue
+                yield line, row, None
+
+
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in err['loc']) or 'row'}: {err['msg']}" for err in exc.errors()
+    )
+
+
+def _validated(path: str, model, report: dict):
+    """Parsed rows that pass `model`, as (line, instance); everything else lands in the report."""
+    for line, row, error in read_rows(path):
+        if error is None:
+            try:
+                yield line, model(**row)
+                continue
+            except ValidationError as e:
+                error = _validation_message(e)
+        report["errors"].append({"line": line, "error": error})
+
+
+def _batches(iterable, size: int):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _new_report() -> dict:
+    return {"created": 0, "errors": []}
+
+
+def _write_batch(session, query: str, rows: list, report: dict, **params):
+    """
+    Writes `rows` in one UNWIND transaction. If the batch fails (e.g. a
+    constraint race), retries row by row so only the bad rows are reported.
+    """
+    try:
+        session.run(query, rows=rows, **params).consume()
+        report["created"] += len(rows)
+        return rows
+    except Exception as e:
+        logger.warning(f"Batch write failed ({e}); retrying {len(rows)} rows individually")
+
+    written = []
+    for row in rows:
+        try:
+            session.run(query, rows=[row], **params).consume()
+            report["created"] += 1
+            written.append(row)
+        except Exception as e:
+            report["errors"].append({"line": row["line"], "error": str(e)})
+    return written
+
+
+# ---------------------------------------------------------
+# Users
+# ---------------------------------------------------------
+
+USER_BATCH_QUERY = """
+UNWIND $rows AS row
+CREATE (u:User:%(label)s {
+    user_id: row.user_id,
+    email: row.email,
+    password_hash: row.password_hash,
+    name: row.name,
+    role: '%(label)s',
+    roll_no: row.roll_no,
+    employee_id: row.employee_id,
+    department: row.department,
+    profile_picture: row.profile_picture,
+    embedding_pending: true,  // filled in by the outbox worker
+    is_active: true
+})
+"""
+
+ENQUEUE_ROW_JOB = enqueue_user_job("row.job_id", "$job_type")
+
+USER_CONFLICTS_QUERY = """
+UNWIND $rows AS row
+OPTIONAL MATCH (u:User {email: row.email})
+OPTIONAL MATCH (s:Student {roll_no: row.roll_no})
+OPTIONAL MATCH (f:Faculty {employee_id: row.employee_id})
+WITH row, u, s, f
+WHERE u IS NOT NULL OR s IS NOT NULL OR f IS NOT NULL
+RETURN row.line AS line,
+       CASE WHEN u IS NOT NULL THEN 'Email already registered'
+            WHEN s IS NOT NULL THEN 'Roll number already registered'
+            ELSE 'Employee ID already registered' END AS error
+"""
+
+
+def _user_row(line: int, user: UserRegister) -> dict:
+    # Same normalisation as /auth/register
+    return {
+        "line": line,
+        "user_id": str(uuid.uuid4()),
+        "job_id": str(uuid.uuid4()),
+        "email": user.email.strip().lower(),
+        "name": user.name,
+        "role": user.role.lower(),
+        "roll_no": user.roll_no.strip() if user.roll_no else None,
+        "employee_id": user.employee_id.strip() if user.employee_id else None,
+        "department": user.department.strip() if user.department else "General",
+        "profile_picture": user.profile_picture,
+        "password": user.password.strip(),
+    }
+
+
+def _hash_pool(workers: int = None) -> ProcessPoolExecutor:
+    # spawn: never fork a process holding the Neo4j driver
+    return ProcessPoolExecutor(
+        max_workers=workers or settings.PASSWORD_HASH_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=hashing.configure,
+        initargs=(settings.BCRYPT_ROUNDS,),
+    )
+
+
+def import_users(path: str, batch_size: int = None, workers: int = None) -> dict:
+    """
+    Streams users from `path` (same fields as POST /auth/register) and
+    creates them in UNWIND batches. Passwords are hashed across a process
+    pool; each user gets an outbox job, so embeddings, vector-index inserts
+    and welcome notifications follow through the outbox worker in batches.
+    Returns {"created": n, "errors": [{"line", "error"}]}.
+    """
+    report = _new_report()
+    seen = set()
+    pool = _hash_pool(workers)
+    session = db.get_session()
+    try:
+        for batch in _batches(_validated(path, UserRegister, report), batch_size or settings.BULK_IMPORT_BATCH_SIZE):
+            rows = []
+            for line, user in batch:
+                row = _user_row(line, user)
+                if row["role"] not in ("student", "faculty"):
+                    report["errors"].append({"line": line, "error": "role: must be student or faculty"})
+                    continue
+                keys = {("email", row["email"]), ("roll_no", row["roll_no"]), ("employee_id", row["employee_id"])}
+                keys = {key for key in keys if key[1]}
+                if keys & seen:
+                    report["errors"].append({"line": line, "error": "Duplicate of an earlier row in this file"})
+                    continue
+                seen |= keys
+                rows.append(row)
+
+            keys = [{k: row[k] for k in ("line", "email", "roll_no", "employee_id")} for row in rows]
+            conflicts = {r["line"]: r["error"] for r in session.run(USER_CONFLICTS_QUERY, rows=keys)}
+            report["errors"].extend({"line": line, "error": error} for line, error in conflicts.items())
+            rows = [row for row in rows if row["line"] not in conflicts]
+            if not rows:
+                continue
+
+            chunksize = max(1, len(rows) // ((workers or settings.PASSWORD_HASH_WORKERS) * 4))
+            hashes = pool.map(hashing.hash_password, [row.pop("password") for row in rows], chunksize=chunksize)
+            for row, password_hash in zip(rows, hashes):
+                row["password_hash"] = password_hash
+
+            for role, label in (("student", "Student"), ("faculty", "Faculty")):
+                role_rows = [row for row in rows if row["role"] == role]
+                if role_rows:
+                    _write_batch(session, USER_BATCH_QUERY % {"label": label} + ENQUEUE_ROW_JOB, role_rows, report,
+                                 job_type=USER_REGISTERED)
+            logger.info(f"Imported {report['created']} users so far")
+    finally:
+        session.close()
+        pool.shutdown()
+    return report
+
+
+# ---------------------------------------------------------
+# Openings
+# ---------------------------------------------------------
+
+OPENING_BATCH_QUERY = """
+UNWIND $rows AS row
+MATCH (f:Faculty {user_id: row.faculty_id})
+CREATE (o:Opening:ActiveOpening {
+    id: row.id,
+    title: row.title,
+    description: row.description,
+    expected_duration: row.expected_duration,
+    target_years: row.target_years,
+    min_cgpa: row.min_cgpa,
+    deadline: row.deadline,
+    collaboration_type: row.collaboration_type,
+    status: 'Active',
+    applicant_count: 0,
+    interest_count: 0,
+    shortlisted_count: 0,
+    created_at: datetime()
+})
+CREATE (f)-[:POSTED]->(o)
+%s
+WITH o, row
+CALL {
+    WITH o, row
+    UNWIND row.skills AS skill_name
+    MATCH (c:Concept {name: skill_name})
+    CREATE (o)-[:REQUIRES]->(c)
+}
+""" % enqueue_opening_job("row.job_id")
+
+
+def import_openings(path: str, batch_size: int = None) -> dict:
+    """
+    Streams openings from `path` (OpeningCreate fields plus
+    `faculty_email`) and creates them in UNWIND batches. Concepts are
+    MERGEd once per batch rather than once per opening.
+    Returns {"created": n, "errors": [{"line", "error"}]}.
+    """
+    report = _new_report()
+    session = db.get_session()
+    try:
+        for batch in _batches(_validated(path, OpeningImport, report), batch_size or settings.BULK_IMPORT_BATCH_SIZE):
+            emails = list({opening.faculty_email.strip().lower() for _, opening in batch})
+            faculty = {r["email"]: r["user_id"] for r in session.run(
+                "UNWIND $emails AS e MATCH (f:Faculty {email: e}) RETURN e AS email, f.user_id AS user_id",
+                emails=emails,
+            )}
+
+            rows = []
+            for line, opening in batch:
+                faculty_id = faculty.get(opening.faculty_email.strip().lower())
+                if not faculty_id:
+                    report["errors"].append({"line": line, "error": "faculty_email: no faculty with this email"})
+                    continue
+                rows.append({
+                    "line": line,
+                    "id": str(uuid.uuid4()),
+                    "job_id": str(uuid.uuid4()),
+                    "faculty_id": faculty_id,
+                    "title": opening.title,
+                    "description": opening.description,
+                    "expected_duration": opening.expected_duration,
+                    "target_years": opening.target_years,
+                    "min_cgpa": opening.min_cgpa,
+                    "deadline": str(opening.deadline),
+                    "collaboration_type": opening.collaboration_type,
+                    "skills": sorted({s.strip().lower() for s in opening.required_skills if s.strip()}),
+                })
+            if not rows:
+                continue
+
+            concepts = sorted({skill for row in rows for skill in row["skills"]})
+            session.run("UNWIND $names AS name MERGE (:Concept {name: name})", names=concepts).consume()
+
+            written = _write_batch(session, OPENING_BATCH_QUERY, rows, report)
+            for faculty_id in {row["faculty_id"] for row in written}:
+                refresh_profile_safely(session, faculty_id)
+            logger.info(f"Imported {report['created']} openings so far")
+    finally:
+        session.close()
+    return report
@@ -0,0 +1,32 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def expand_concept_weights(session, names):
+    """
+    Maps concept names to soft-match weights against `names`.
+    Exact names weigh 1.0; neighbours precomputed as
+    (:Concept)-[:SIMILAR_TO {w}]->(:Concept) weigh their best similarity.
+    Returns {} when there is nothing to match.
+    """
+    clean = sorted({str(n).lower().strip() for n in names if n})
+    if not clean:
+        return {}
+
+    weights = {}
+    try:
+        query = """
+        UNWIND $names AS name
+        MATCH (:Concept {name: name})-[r:SIMILAR_TO]->(n:Concept)
+        RETURN n.name AS name, max(r.w) AS w
+        """
+        for r in session.run(query, names=clean):
+            weights[r["name"]] = float(r["w"])
+    except Exception as e:
+        # Soft matching is an enhancement; exact matching still works without it
+        logger.warning(f"Concept similarity lookup failed: {e}")
+
+    for name in clean:
+        weights[name] = 1.0
+    return weights
@@ -32,4 +32,23 @@ def generate_embedding(text: str):
         
     except Exception as e:
         logger.error(f"Error generating embedding: {e}")
-        return []
\ No newline at end of file
+        return []
+
+def generate_embeddings(texts: list, batch_size: int = 64):
+    """
+    Batch version of generate_embedding for offline jobs.
+    Returns one vector per input text (empty list for unusable inputs).
+    """
+    valid = [(i, t) for i, t in enumerate(texts) if t and isinstance(t, str)]
+    vectors = [[] for _ in texts]
+    if not valid:
+        return vectors
+
+    try:
+        ai_model = get_model()
+        encoded = ai_model.encode([t for _, t in valid], batch_size=batch_size)
+        for (i, _), vec in zip(valid, encoded):
+            vectors[i] = vec.tolist()
+    except Exception as e:
+        logger.error(f"Error generating batch embeddings: {e}")
+    return vectors
@@ -0,0 +1,208 @@
+import logging
+import threading
+
+from app.core.database import db
+from app.services.bitmap_index import BitmapIndex
+
+logger = logging.getLogger(__name__)
+
+# Facets per browse list, matching the filters its endpoint accepts:
+#   students       - GET /dashboard/faculty/all-students
+#   faculty        - GET /dashboard/student/all-faculty
+#   collaborations - GET /dashboard/faculty/collaborations
+FACET_FIELDS = {
+    "students": ("department", "batch", "domain"),
+    "faculty": ("department", "domain"),
+    "collaborations": ("department", "domain", "collaboration_type"),
+}
+
+# Filters the lists don't apply as an exact match, as
+# (indexed field, test(indexed value, filter value)). They are expanded to
+# every indexed value passing the test, so counts use the list's semantics.
+# Free-text `search` has no facet equivalent and is not applied to counts.
+FILTER_TESTS = {
+    "students": {"min_cgpa": ("cgpa", lambda cgpa, minimum: cgpa >= minimum)},
+    "collaborations": {"department": ("department", lambda dept, part: isinstance(dept, str) and part in dept)},
+}
+
+# Matches no bitmap: an expanded filter with no passing values selects nothing
+_NO_MATCH = object()
+
+# One row per indexed entity; `{where}` narrows the load to one user or
+# opening for incremental refreshes. `poster` (collaborations only) is an
+# internal field so a faculty edit can re-read all of their openings;
+# `cgpa` (students) only backs the min_cgpa filter.
+ROW_QUERIES = {
+    "students": """
+    MATCH (s:Student) WHERE s.name IS NOT NULL {where}
+    OPTIONAL MATCH (s)-[:HAS_SKILL]->(c:Concept)
+    RETURN s.user_id AS key, s.department AS department, s.batch AS batch, s.cgpa AS cgpa,
+           collect(DISTINCT c.name) AS domain
+    """,
+    "faculty": """
+    MATCH (f:Faculty) WHERE true {where}
+    OPTIONAL MATCH (f)-[:INTERESTED_IN]->(c:Concept)
+    RETURN f.user_id AS key, f.department AS department,
+           collect(DISTINCT c.name) AS domain
+    """,
+    "collaborations": """
+    MATCH (f:User)-[:POSTED]->(o:ActiveOpening)
+    WHERE o.collaboration_type IS NOT NULL {where}
+    OPTIONAL MATCH (o)-[:REQUIRES]->(c:Concept)
+    RETURN o.id AS key, f.user_id AS poster, f.department AS department,
+           o.collaboration_type AS collaboration_type, collect(DISTINCT c.name) AS domain
+    """,
+}
+
+USER_FILTERS = {
+    "students": "AND s.user_id = $uid",
+    "faculty": "AND f.user_id = $uid",
+    "collaborations": "AND f.user_id = $uid",
+}
+
+
+class _Facets:
+    """Bitmaps of one browse list; rows are never reused until the next full load."""
+
+    def __init__(self):
+        self.index = BitmapIndex()
+        self.rows = {}
+        self.alive = 0
+
+    def upsert(self, key, attrs: dict):
+        row = self.rows.get(key)
+        if row is None:
+            row = self.rows[key] = len(self.rows)
+        self.index.set_row(row, attrs)
+        self.alive |= 1 << row
+
+    def remove(self, key):
+        row = self.rows.get(key)
+        if row is None:
+            return
+        self.index.clear_row(row)
+        self.alive &= ~(1 << row)
+
+    def keys_where(self, field, value):
+        bits = self.index.bitmap(field, value) & self.alive
+        return [key for key, row in self.rows.items() if bits >> row & 1]
+
+
+class FacetIndex:
+    """
+    In-memory facet counts for the browse lists. Loaded from the graph at
+    startup (and periodically, as a drift safety net) and updated
+    incrementally by the writes that change a facet value. Counts are
+    disjunctive: each facet is counted under every filter except its own,
+    so the UI can show how many results picking another value would give.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._scopes = {scope: _Facets() for scope in FACET_FIELDS}
+        self.ready = False
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def load_from_graph(self):
+        """Rebuilds every scope from the graph."""
+        fresh = {scope: _Facets() for scope in FACET_FIELDS}
+        session = db.get_session()
+        try:
+            for scope, query in ROW_QUERIES.items():
+                for r in session.run(query.format(where="")):
+                    record = r.data()
+                    fresh[scope].upsert(record.pop("key"), record)
+        finally:
+            session.close()
+
+        with self._lock:
+            self._scopes = fresh
+            self.ready = True
+        logger.info("Facet index loaded: " + ", ".join(
+            f"{scope}={facets.alive.bit_count()}" for scope, facets in fresh.items()
+        ))
+
+    def refresh_user(self, session, user_id: str):
+        """Re-reads a user's row (and, for faculty, their open collaborations) after a write."""
+        try:
+            for scope in FACET_FIELDS:
+                rows = {r["key"]: r.data() for r in session.run(
+                    ROW_QUERIES[scope].format(where=USER_FILTERS[scope]), uid=user_id
+                )}
+                with self._lock:
+                    facets = self._scopes[scope]
+                    stale = facets.keys_where("poster", user_id) if scope == "collaborations" else [user_id]
+                    self._apply(facets, rows, stale)
+        except Exception as e:
+            logger.error(f"Facet refresh failed for user {user_id}: {e}")
+
+    def refresh_opening(self, session, opening_id: str):
+        """Re-reads one opening after create/delete; drops it if it no longer qualifies."""
+        try:
+            rows = {r["key"]: r.data() for r in session.run(
+                ROW_QUERIES["collaborations"].format(where="AND o.id = $oid"), oid=opening_id
+            )}
+            with self._lock:
+                self._apply(self._scopes["collaborations"], rows, [opening_id])
+        except Exception as e:
+            logger.error(f"Facet refresh failed for opening {opening_id}: {e}")
+
+    def remove_openings(self, opening_ids):
+        with self._lock:
+            for opening_id in opening_ids:
+                self._scopes["collaborations"].remove(opening_id)
+
+    @staticmethod
+    def _apply(facets, rows, stale):
+        for key in stale:
+            if key not in rows:
+                facets.remove(key)
+        for key, record in rows.items():
+            record.pop("key")
+            facets.upsert(key, record)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _resolve(facets, scope: str, filters: dict) -> dict:
+        """List filters -> {indexed field: value or list of values}."""
+        tests = FILTER_TESTS.get(scope, {})
+        resolved = {}
+        for name, value in filters.items():
+            if value is None or value == "":
+                continue
+            if name in tests:
+                field, test = tests[name]
+                matching = [v for v in facets.index.values(field) if test(v, value)]
+                resolved[field] = matching or [_NO_MATCH]
+            elif name in FACET_FIELDS[scope]:
+                resolved[name] = value
+        return resolved
+
+    def facets(self, scope: str, filters: dict) -> dict:
+        """
+        {"total": matches for all `filters`, "facets": {field: {value: count}}}
+        where each field's counts apply every filter but that field's own.
+        `filters` are the list endpoint's params (see FILTER_TESTS).
+        """
+        fields = FACET_FIELDS[scope]
+        with self._lock:
+            facets = self._scopes[scope]
+            filters = self._resolve(facets, scope, filters)
+            total = facets.index.match(filters, facets.alive).bit_count()
+            counts = {}
+            for field in fields:
+                others = {k: v for k, v in filters.items() if k != field}
+                mask = facets.index.match(others, facets.alive)
+                counts[field] = dict(sorted(
+                    facets.index.counts(field, mask).items(), key=lambda item: (-item[1], str(item[0]))
+                ))
+        return {"total": total, "facets": counts}
+
+
+facet_index = FacetIndex()
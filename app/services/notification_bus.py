@@ -0,0 +1,152 @@
+import asyncio
+import glob
+import json
+import logging
+import os
+import socket
+from collections import defaultdict
+
+from app.core import etag
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Unix datagrams comfortably fit one notification event
+MAX_DATAGRAM_BYTES = 64 * 1024
+
+
+class Subscription:
+    """One open stream. `overflowed` tells it to end so the client resumes from the DB."""
+
+    def __init__(self, user_id: str):
+        self.user_id = user_id
+        self.queue = asyncio.Queue(maxsize=settings.SSE_QUEUE_SIZE)
+        self.overflowed = False
+
+
+class NotificationBus:
+    """
+    In-process fan-out of new notifications to open SSE streams.
+
+    `publish` may be called from any thread (sync routes run in the
+    threadpool); delivery hops onto the event loop. With
+    NOTIFICATION_BUS_SOCKET_DIR set, every worker process also binds a
+    Unix datagram socket in that directory and forwards what it publishes
+    to its peers - a dependency-free stand-in for Redis pub/sub when
+    running several uvicorn workers on one host. The same sockets carry
+    ETag version bumps, so conditional GETs stay correct on every worker.
+    """
+
+    def __init__(self):
+        self._loop = None
+        self._subscribers = defaultdict(set)
+        self._sock = None
+        self._sock_path = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        socket_dir = settings.NOTIFICATION_BUS_SOCKET_DIR
+        if not socket_dir:
+            return
+        os.makedirs(socket_dir, exist_ok=True)
+        self._sock_path = os.path.join(socket_dir, f"worker-{os.getpid()}.sock")
+        if os.path.exists(self._sock_path):
+            os.unlink(self._sock_path)
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.bind(self._sock_path)
+        self._sock.setblocking(False)
+        loop.add_reader(self._sock.fileno(), self._on_datagram)
+        etag.set_broadcast(self.publish_bump)
+        logger.info(f"Notification bus listening on {self._sock_path}")
+
+    def stop(self):
+        if self._sock is not None:
+            etag.set_broadcast(None)
+            self._loop.remove_reader(self._sock.fileno())
+            self._sock.close()
+            self._sock = None
+            try:
+                os.unlink(self._sock_path)
+            except FileNotFoundError:
+                pass
+        self._loop = None
+
+    # ------------------------------------------------------------------
+    # Subscribers (event loop only)
+    # ------------------------------------------------------------------
+
+    def subscribe(self, user_id: str) -> Subscription:
+        sub = Subscription(user_id)
+        self._subscribers[user_id].add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        subs = self._subscribers.get(sub.user_id)
+        if subs is not None:
+            subs.discard(sub)
+            if not subs:
+                del self._subscribers[sub.user_id]
+
+    def _deliver(self, user_id: str, event: dict):
+        for sub in self._subscribers.get(user_id, ()):
+            try:
+                sub.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                sub.overflowed = True
+
+    # ------------------------------------------------------------------
+    # Publishing (any thread)
+    # ------------------------------------------------------------------
+
+    def publish(self, user_id: str, event: dict):
+        if self._loop is None or not user_id:
+            return  # not running inside the API (scripts, workers)
+        self._loop.call_soon_threadsafe(self._deliver, user_id, event)
+        if self._sock is not None:
+            self._forward({"user_id": user_id, "event": event})
+
+    def publish_bump(self, keys):
+        """Forwards ETag bumps to the other workers (any thread)."""
+        if self._sock is not None:
+            self._forward({"bump": list(keys)})
+
+    def _forward(self, message: dict):
+        payload = json.dumps(message, default=str).encode()
+        if len(payload) > MAX_DATAGRAM_BYTES:
+            logger.warning("Notification bus message too large to forward")
+            return
+        for path in glob.glob(os.path.join(settings.NOTIFICATION_BUS_SOCKET_DIR, "worker-*.sock")):
+            if path == self._sock_path:
+                continue
+            try:
+                self._sock.sendto(payload, path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                # Peer exited without cleaning up
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+            except BlockingIOError:
+                logger.warning(f"Notification bus peer {path} is not draining; message dropped")
+
+    def _on_datagram(self):
+        while True:
+            try:
+                data = self._sock.recv(MAX_DATAGRAM_BYTES)
+            except BlockingIOError:
+                return
+            try:
+                message = json.loads(data)
+                if "bump" in message:
+                    etag.apply_bump(message["bump"])
+                else:
+                    self._deliver(message["user_id"], message["event"])
+            except (ValueError, KeyError, TypeError):
+                logger.warning("Ignoring malformed notification bus datagram")
+
+
+notification_bus = NotificationBus()
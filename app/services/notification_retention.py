@@ -0,0 +1,126 @@
+import gzip
+import json
+import logging
+import os
+from datetime import datetime
+
+from app.core.config import settings
+from app.core.database import db
+from app.core.etag import bump_users
+
+logger = logging.getLogger(__name__)
+
+# A notification is expired once it is older than the TTL for its type and
+# read state; "*" is the fallback for types without their own entry.
+EXPIRED = """
+n.created_at < datetime() - duration({days: coalesce(
+    CASE WHEN coalesce(n.is_read, false) THEN $read_ttl[n.type] ELSE $unread_ttl[n.type] END,
+    CASE WHEN coalesce(n.is_read, false) THEN $read_ttl['*'] ELSE $unread_ttl['*'] END
+)})
+"""
+
+# Deletes `n`, keeping the recipient's maintained unread counter in step
+DELETE_SUBQUERY = """
+CALL {
+    WITH n
+    OPTIONAL MATCH (n)-[:NOTIFIES]->(u:User)
+    WITH n, u, coalesce(n.is_read, false) AS was_read
+    FOREACH (_ IN CASE WHEN was_read OR u IS NULL THEN [] ELSE [1] END |
+        SET u.unread_count = CASE WHEN coalesce(u.unread_count, 0) > 0 THEN u.unread_count - 1 ELSE 0 END
+    )
+    DETACH DELETE n
+    RETURN u.user_id AS recipient
+} IN TRANSACTIONS OF $batch ROWS
+RETURN count(*) AS removed, collect(DISTINCT recipient) AS recipients
+"""
+
+PRUNE_QUERY = f"""
+MATCH (n:Notification)
+WHERE n.created_at < datetime() - duration({{days: $min_ttl}}) AND {EXPIRED}
+{DELETE_SUBQUERY}
+"""
+
+SELECT_EXPIRED_QUERY = f"""
+MATCH (n:Notification)
+WHERE n.created_at < datetime() - duration({{days: $min_ttl}}) AND {EXPIRED}
+OPTIONAL MATCH (n)-[:NOTIFIES]->(u:User)
+RETURN properties(n) AS notification, u.user_id AS recipient
+ORDER BY n.created_at
+LIMIT $batch
+"""
+
+DELETE_IDS_QUERY = f"""
+UNWIND $ids AS nid
+MATCH (n:Notification {{id: nid}})
+{DELETE_SUBQUERY}
+"""
+
+
+def _ttl_params(batch_size: int) -> dict:
+    read_ttl = {"*": 30, **settings.NOTIFICATION_READ_TTL_DAYS}
+    unread_ttl = {"*": 180, **settings.NOTIFICATION_UNREAD_TTL_DAYS}
+    return {
+        "read_ttl": read_ttl,
+        "unread_ttl": unread_ttl,
+        # Index-friendly prefilter: nothing younger than the shortest TTL can expire
+        "min_ttl": min(list(read_ttl.values()) + list(unread_ttl.values())),
+        "batch": batch_size,
+    }
+
+
+def _jsonable(value):
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+def prune_notifications(archive_dir: str = None, batch_size: int = None) -> dict:
+    """
+    Deletes notifications past their per-type TTL in batched transactions.
+    With `archive_dir` (default NOTIFICATION_ARCHIVE_DIR) each batch is
+    first appended to a gzip JSONL file, so nothing is deleted before it
+    is archived. Returns {"removed": n, "archive": path or None}.
+    """
+    archive_dir = archive_dir if archive_dir is not None else settings.NOTIFICATION_ARCHIVE_DIR
+    params = _ttl_params(batch_size or settings.NOTIFICATION_RETENTION_BATCH_SIZE)
+
+    session = db.get_session()
+    removed, recipients, archive_path = 0, set(), None
+    try:
+        if not archive_dir:
+            record = session.run(PRUNE_QUERY, **params).single()
+            removed = record["removed"] if record else 0
+            recipients.update(record["recipients"] if record else [])
+        else:
+            os.makedirs(archive_dir, exist_ok=True)
+            archive_path = os.path.join(
+                archive_dir, f"notifications-{datetime.utcnow():%Y%m%d-%H%M%S}.jsonl.gz"
+            )
+            with gzip.open(archive_path, "at", encoding="utf-8") as archive:
+                while True:
+                    rows = list(session.run(SELECT_EXPIRED_QUERY, **params))
+                    if not rows:
+                        break
+                    for r in rows:
+                        entry = {k: _jsonable(v) for k, v in r["notification"].items()}
+                        entry["recipient"] = r["recipient"]
+                        archive.write(json.dumps(entry) + "\n")
+                    archive.flush()
+
+                    record = session.run(
+                        DELETE_IDS_QUERY,
+                        ids=[r["notification"]["id"] for r in rows],
+                        batch=params["batch"],
+                    ).single()
+                    removed += record["removed"]
+                    recipients.update(record["recipients"])
+                    if not record["removed"]:
+                        break  # rows without an id; never loop on them
+            if not removed:
+                os.unlink(archive_path)
+                archive_path = None
+    finally:
+        session.close()
+
+    bump_users(*recipients)
+    logger.info(f"Notification retention removed {removed} notifications"
+                + (f" (archived to {archive_path})" if archive_path else ""))
+    return {"removed": removed, "archive": archive_path}
@@ -0,0 +1,237 @@
+import uuid
+
+from app.core.config import settings
+from app.core.database import db
+from app.core.pagination import decode_cursor, next_page
+from app.core.etag import bump_users
+from app.services.notification_bus import notification_bus
+
+# Projection shared by list endpoints, the SSE stream and write queries
+# (which RETURN it so the new notification can be pushed without a re-read)
+NOTIFICATION_FIELDS = """
+n.id as id, n.message as message, n.type as type,
+n.is_read as is_read, n.created_at as date,
+n.trigger_id as trigger_id, n.trigger_role as trigger_role,
+n.actor_count as count, n.actors as actors
+"""
+
+
+# Same fields as a map, for queries that collect() the notification
+# inside a subquery (e.g. conditional writes)
+NOTIFICATION_MAP = """
+n {.id, .message, .type, .is_read, date: n.created_at, .trigger_id, .trigger_role,
+   count: n.actor_count, actors: n.actors}
+"""
+
+
+def write_lock(var: str) -> str:
+    """
+    Cypher taking `var`'s write lock for the rest of the transaction before
+    anything about it is read (Neo4j's explicit-lock idiom: the property is
+    removed in the same statement, so nothing is left on the node).
+    """
+    return f"SET {var}._lock = true\nREMOVE {var}._lock\n"
+
+
+def unread_increment(var: str) -> str:
+    """
+    SET item bumping a recipient's maintained unread counter (same
+    transaction as the CREATE). A single self-referencing SET runs under
+    the node's write lock, so concurrent notifications never lose an increment.
+    """
+    return f"{var}.unread_count = coalesce({var}.unread_count, 0) + 1"
+
+
+def serialize_notification(record) -> dict:
+    date = record["date"]
+    return {
+        "id": record["id"],
+        "message": record["message"],
+        "type": record["type"],
+        "is_read": record["is_read"],
+        "date": date.isoformat() if date else "",
+        "trigger_id": record["trigger_id"],
+        "trigger_role": record["trigger_role"],
+        # Digest notifications only (see digest_fragment)
+        "count": record["count"],
+        "actors": record["actors"],
+    }
+
+
+def publish_notification(user_id: str, record):
+    """Pushes a freshly created notification to the recipient's open streams."""
+    if record is not None:
+        notification_bus.publish(user_id, serialize_notification(record))
+
+
+# Every read-marking query first takes the recipient's write lock, so
+# concurrent marks serialize per user and never double-decrement.
+LOCK_USER = """
+MATCH (u:User {user_id: $uid})
+""" + write_lock("u") + """WITH u
+"""
+
+MARK_READ_QUERY = LOCK_USER + """
+UNWIND $ids AS nid
+MATCH (n:Notification {id: nid})-[:NOTIFIES]->(u)
+WHERE coalesce(n.is_read, false) = false
+SET n.is_read = true
+WITH u, count(n) AS marked
+SET u.unread_count = CASE WHEN coalesce(u.unread_count, 0) > marked THEN u.unread_count - marked ELSE 0 END
+RETURN marked
+"""
+
+MARK_ALL_READ_QUERY = LOCK_USER + """
+OPTIONAL MATCH (n:Notification)-[:NOTIFIES]->(u)
+WHERE n.is_read = false
+SET n.is_read = true
+WITH u, count(n) AS marked
+SET u.unread_count = 0
+RETURN marked
+"""
+
+
+def mark_notifications_read(session, user_id: str, notif_ids: list) -> int:
+    """Marks the user's notifications in `notif_ids` read in one write; returns how many changed."""
+    if not notif_ids:
+        return 0
+    record = session.run(MARK_READ_QUERY, uid=user_id, ids=list(notif_ids)).single()
+    return record["marked"] if record else 0
+
+
+def mark_notification_read_for(session, user_id: str, notif_id: str) -> int:
+    return mark_notifications_read(session, user_id, [notif_id])
+
+
+def mark_all_notifications_read(session, user_id: str) -> int:
+    record = session.run(MARK_ALL_READ_QUERY, uid=user_id).single()
+    return record["marked"] if record else 0
+
+
+def list_notifications(session, user_id: str, limit: int, cursor: str = None):
+    """
+    One page of the user's notifications, newest first, keyset-paginated
+    on (created_at, id). Returns (records, next_cursor).
+    """
+    after = decode_cursor(cursor, 2)
+    query = f"""
+    MATCH (n:Notification)-[:NOTIFIES]->(u:User {{user_id: $uid}})
+    WHERE $after_ts IS NULL
+       OR n.created_at < datetime($after_ts)
+       OR (n.created_at = datetime($after_ts) AND n.id < $after_id)
+    RETURN {NOTIFICATION_FIELDS}
+    ORDER BY n.created_at DESC, n.id DESC
+    LIMIT $fetch
+    """
+    rows = list(session.run(
+        query, uid=user_id, fetch=limit + 1,
+        after_ts=after[0] if after else None,
+        after_id=after[1] if after else None,
+    ))
+    return next_page(rows, limit, key=lambda r: (r["date"], r["id"]))
+
+
+RECOUNT_UNREAD_QUERY = """
+MATCH (u:User)
+CALL {
+    WITH u
+    OPTIONAL MATCH (n:Notification)-[:NOTIFIES]->(u)
+    WHERE n.is_read = false
+    WITH u, count(n) AS unread
+    SET u.unread_count = unread
+} IN TRANSACTIONS OF 1000 ROWS
+"""
+
+
+def recount_unread_counts():
+    """Repair job: recomputes every User.unread_count from the Notification nodes."""
+    session = db.get_session()
+    try:
+        session.run(RECOUNT_UNREAD_QUERY).consume()
+    finally:
+        session.close()
+
+
+def digest_fragment(recipient: str, actor: str, target: str, single_message: str, many_message: str) -> str:
+    """
+    Cypher that coalesces same-type notifications about one target into a
+    single digest per recipient and DIGEST window, leaving it bound as `n`.
+    `recipient` / `actor` are bound User variables, `target` an expression
+    identifying the target; `many_message` may reference n.actor_count.
+    A read digest that gains an actor becomes unread again (and counts
+    once more towards unread_count). Params: see digest_params().
+    """
+    return f"""
+    WITH *, $digest_type + '|' + {target} + '|' + {recipient}.user_id + '|'
+            + toString(datetime().epochSeconds / $digest_window) AS digest_key
+    MERGE (n:Notification {{digest_key: digest_key}})
+    ON CREATE SET n.id = $notif_id, n.type = $digest_type, n.first_at = datetime(),
+                  n.is_read = true, n.actor_count = 0, n.actors = []
+    // Lock before reading so concurrent actors don't lose counts
+    {write_lock("n")}    WITH *, n.is_read AS was_read
+    SET n.actor_count = n.actor_count + 1,
+        n.actors = CASE WHEN {actor}.name IN n.actors OR size(n.actors) >= $digest_sample
+                        THEN n.actors ELSE n.actors + {actor}.name END
+    SET n.message = CASE WHEN n.actor_count = 1 THEN {single_message} ELSE {many_message} END,
+        n.trigger_id = {actor}.user_id,
+        n.trigger_role = toLower({actor}.role),
+        n.is_read = false,
+        n.created_at = datetime()
+    MERGE (n)-[:NOTIFIES]->({recipient})
+    FOREACH (_ IN CASE WHEN was_read THEN [1] ELSE [] END | SET {unread_increment(recipient)})
+    """
+
+
+def digest_params(notif_type: str) -> dict:
+    return {
+        "digest_type": notif_type,
+        "digest_window": settings.NOTIFICATION_DIGEST_WINDOW_SECONDS,
+        "digest_sample": settings.NOTIFICATION_DIGEST_SAMPLE_SIZE,
+        "notif_id": str(uuid.uuid4()),
+    }
+
+
+def create_digest_notification(tx, user_id, type, target_id, actor_id, message, many_message):
+    """
+    Creates or updates a recipient's digest notification for `target_id`
+    and pushes it to their open streams. The first actor reads as
+    `message`; later ones in the same window update it to `many_message`
+    with "{count}" replaced by the number of actors.
+    """
+    digest = digest_fragment(
+        "recipient", "actor", "$target_id", "$message",
+        "replace($many_message, '{count}', toString(n.actor_count))",
+    )
+    query = f"""
+    MATCH (recipient:User {{user_id: $user_id}})
+    MATCH (actor:User {{user_id: $actor_id}})
+    {digest}
+    RETURN {NOTIFICATION_FIELDS}
+    """
+    record = tx.run(query, user_id=user_id, actor_id=actor_id, target_id=target_id,
+                    message=message, many_message=many_message, **digest_params(type)).single()
+    bump_users(user_id)
+    publish_notification(user_id, record)
+    return record
+
+
+# Notifications per query when replaying a resumed stream
+REPLAY_PAGE_SIZE = 100
+
+
+def notifications_since(session, user_id: str, last_event_id: str, limit: int = REPLAY_PAGE_SIZE):
+    """
+    Up to `limit` notifications created after `last_event_id` (oldest
+    first), for resuming a stream. Callers page on with the last id
+    returned until a short page. Unknown ids replay nothing.
+    """
+    query = f"""
+    MATCH (last:Notification {{id: $last}})-[:NOTIFIES]->(u:User {{user_id: $uid}})
+    MATCH (n:Notification)-[:NOTIFIES]->(u)
+    WHERE n.created_at > last.created_at
+       OR (n.created_at = last.created_at AND n.id > last.id)
+    RETURN {NOTIFICATION_FIELDS}
+    ORDER BY n.created_at, n.id
+    LIMIT $limit
+    """
+    return [serialize_notification(r) for r in session.run(query, uid=user_id, last=last_event_id, limit=limit)]
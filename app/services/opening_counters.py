@@ -0,0 +1,37 @@
+import logging
+
+from app.core.database import db
+
+logger = logging.getLogger(__name__)
+
+# Pipeline counters kept on each Opening, updated in the same write as the
+# relationship they count:
+#   applicant_count   - (:Student)-[:APPLIED_TO]->(o)     apply_to_opening
+#   interest_count    - (:User)-[:INTERESTED_IN]->(o)     express_interest
+#   shortlisted_count - (o)-[:SHORTLISTED]->(:Student)    shortlist / status updates
+
+SHORTLISTED_INCREMENT = "o.shortlisted_count = coalesce(o.shortlisted_count, 0) + 1"
+SHORTLISTED_DECREMENT = (
+    "o.shortlisted_count = CASE WHEN coalesce(o.shortlisted_count, 0) > 0 "
+    "THEN o.shortlisted_count - 1 ELSE 0 END"
+)
+
+RECONCILE_QUERY = """
+MATCH (o:Opening)
+CALL {
+    WITH o
+    SET o.applicant_count = COUNT { (:User)-[:APPLIED_TO]->(o) },
+        o.interest_count = COUNT { (:User)-[:INTERESTED_IN]->(o) },
+        o.shortlisted_count = COUNT { (o)-[:SHORTLISTED]->(:Student) }
+} IN TRANSACTIONS OF 1000 ROWS
+"""
+
+
+def reconcile_opening_counters():
+    """Repair job: recomputes every Opening's pipeline counters from the graph."""
+    session = db.get_session()
+    try:
+        summary = session.run(RECONCILE_QUERY).consume()
+        logger.info(f"Reconciled pipeline counters ({summary.counters.properties_set} properties set)")
+    finally:
+        session.close()
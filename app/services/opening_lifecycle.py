@@ -0,0 +1,75 @@
+import logging
+from datetime import date
+
+from app.core.database import db
+from app.core.etag import bump, OPENINGS
+from app.services.facet_index import facet_index
+
+logger = logging.getLogger(__name__)
+
+# Open openings carry a second :ActiveOpening label. Browse and
+# recommendation queries MATCH that label, so their cost follows the number
+# of live openings rather than the whole history. Openings are created with
+# it and lose it (status 'Closed') once their deadline has passed.
+ACTIVE_LABEL = "ActiveOpening"
+
+# `deadline` is stored as an ISO date string; anything else never expires
+CLOSE_EXPIRED_QUERY = """
+MATCH (o:ActiveOpening)
+WHERE o.deadline =~ '\\\\d{4}-\\\\d{2}-\\\\d{2}.*' AND left(o.deadline, 10) < $today
+CALL {
+    WITH o
+    SET o.status = 'Closed', o.closed_at = datetime()
+    REMOVE o:ActiveOpening
+} IN TRANSACTIONS OF 1000 ROWS
+RETURN collect(o.id) AS closed
+"""
+
+# One-off for openings created before the label existed
+BACKFILL_QUERY = """
+MATCH (o:Opening)
+WHERE NOT o:ActiveOpening AND coalesce(o.status, 'Active') = 'Active'
+CALL {
+    WITH o
+    SET o:ActiveOpening
+} IN TRANSACTIONS OF 1000 ROWS
+RETURN count(o) AS labelled
+"""
+
+
+def close_expired_openings(today: date = None) -> int:
+    """Closes active openings whose deadline is before `today`; returns how many."""
+    session = db.get_session()
+    try:
+        record = session.run(CLOSE_EXPIRED_QUERY, today=(today or date.today()).isoformat()).single()
+        closed = record["closed"] if record else []
+    finally:
+        session.close()
+
+    if closed:
+        facet_index.remove_openings(closed)
+        bump(OPENINGS)
+        logger.info(f"Closed {len(closed)} openings past their deadline")
+    return len(closed)
+
+
+def backfill_active_openings() -> int:
+    """Labels legacy open openings :ActiveOpening; returns how many."""
+    session = db.get_session()
+    try:
+        record = session.run(BACKFILL_QUERY).single()
+        labelled = record["labelled"] if record else 0
+    finally:
+        session.close()
+
+    if labelled:
+        bump(OPENINGS)
+        logger.info(f"Labelled {labelled} open openings :{ACTIVE_LABEL}")
+    return labelled
+
+
+def sync_opening_lifecycle(close_expired: bool = True):
+    """Startup pass: backfill the label, then (if enabled) close whatever has expired since."""
+    backfill_active_openings()
+    if close_expired:
+        close_expired_openings()
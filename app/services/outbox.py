@@ -0,0 +1,254 @@
+import logging
+import uuid
+
+from app.core.config import settings
+from app.core.database import db
+from app.core.etag import bump, bump_users, OPENINGS, STUDENTS
+from app.services.embedding import generate_embedding, generate_embeddings
+from app.services.facet_index import facet_index
+from app.services.notification_service import NOTIFICATION_FIELDS, publish_notification, unread_increment
+from app.services.vector_index import vector_index
+
+logger = logging.getLogger(__name__)
+
+USER_REGISTERED = "user_registered"
+OPENING_CREATED = "opening_created"
+
+def enqueue_user_job(job_id: str = "$job_id", job_type: str = "$job_type") -> str:
+    """
+    Cypher appended to a write query that has the new user bound as `u`,
+    so the user and its job commit (or fail) together. UNWIND batches pass
+    per-row expressions (e.g. "row.job_id").
+    """
+    return f"""
+    CREATE (:OutboxJob {{
+        id: {job_id},
+        type: {job_type},
+        user_id: u.user_id,
+        status: 'pending',
+        attempts: 0,
+        created_at: datetime(),
+        available_at: datetime()
+    }})
+    """
+
+
+# Single-user form. Params: $job_id, $job_type.
+ENQUEUE_USER_JOB = enqueue_user_job()
+
+
+def enqueue_opening_job(job_id: str = "$opening_job_id") -> str:
+    """
+    Same as enqueue_user_job for a new opening bound as `o`. The job embeds
+    it for applicant ranking and, since openings can also be created by the
+    bulk import process, refreshes this server's OPENINGS ETag and facets.
+    """
+    return f"""
+    CREATE (:OutboxJob {{
+        id: {job_id},
+        type: '{OPENING_CREATED}',
+        opening_id: o.id,
+        status: 'pending',
+        attempts: 0,
+        created_at: datetime(),
+        available_at: datetime()
+    }})
+    """
+
+
+# Single-opening form. Param: $opening_job_id.
+ENQUEUE_OPENING_JOB = enqueue_opening_job()
+
+
+def job_params(job_type: str) -> dict:
+    return {"job_id": str(uuid.uuid4()), "job_type": job_type}
+
+
+# ---------------------------------------------------------
+# Handlers (must be idempotent: a job may run more than once)
+# ---------------------------------------------------------
+
+def _profile_text(user) -> str:
+    return f"{user['name']} {user['role']} {user['department']}"
+
+
+def _handle_user_registered(session, job):
+    user = session.run("""
+    MATCH (u:User {user_id: $uid})
+    RETURN u.name AS name, u.role AS role, u.department AS department,
+           u.profile_picture AS profile_picture, u.embedding_pending AS pending
+    """, uid=job["user_id"]).single()
+    if not user:
+        logger.warning(f"Outbox job {job['id']}: user {job['user_id']} no longer exists")
+        return
+
+    role = (user["role"] or "").lower()
+
+    if user["pending"]:
+        embedding = job.get("embedding") or generate_embedding(_profile_text(user))
+        if not embedding:
+            raise RuntimeError("embedding model returned no vector")
+        session.run("""
+        MATCH (u:User {user_id: $uid})
+        SET u.embedding = $emb
+        REMOVE u.embedding_pending
+        """, uid=job["user_id"], emb=embedding)
+
+        if role in ("student", "faculty"):
+            vector_index.upsert(job["user_id"], role, embedding, name=user["name"],
+                                department=user["department"],
+                                profile_picture=user["profile_picture"])
+        if role == "student":
+            bump(STUDENTS)
+
+    facet_index.refresh_user(session, job["user_id"])
+
+    # Deterministic id: a retried job never sends a second welcome
+    welcome = session.run(f"""
+    MATCH (u:User {{user_id: $uid}})
+    MERGE (n:Notification {{id: $nid}})
+    ON CREATE SET n.message = $message, n.type = 'WELCOME', n.is_read = false,
+                  n.created_at = datetime(), {unread_increment("u")}
+    MERGE (n)-[:NOTIFIES]->(u)
+    RETURN {NOTIFICATION_FIELDS}
+    """, uid=job["user_id"], nid=f"welcome-{job['user_id']}",
+         message=f"Welcome to Guru Setu, {user['name']}! Complete your profile to get better matches.").single()
+    bump_users(job["user_id"])
+    publish_notification(job["user_id"], welcome)
+
+
+def opening_text(opening) -> str:
+    return " ".join(filter(None, [opening["title"], opening["description"], *opening["required"]]))
+
+
+def _handle_opening_created(session, job):
+    opening = session.run("""
+    MATCH (o:Opening {id: $oid})
+    OPTIONAL MATCH (o)-[:REQUIRES]->(c:Concept)
+    RETURN o.title AS title, o.description AS description, collect(DISTINCT c.name) AS required
+    """, oid=job["opening_id"]).single()
+    if not opening:
+        logger.warning(f"Outbox job {job['id']}: opening {job['opening_id']} no longer exists")
+        return
+
+    # Idempotent, so done before the embedding (which may fail and retry)
+    facet_index.refresh_opening(session, job["opening_id"])
+    bump(OPENINGS)
+
+    embedding = generate_embedding(opening_text(opening))
+    if not embedding:
+        raise RuntimeError("embedding model returned no vector")
+    session.run("MATCH (o:Opening {id: $oid}) SET o.embedding = $emb", oid=job["opening_id"], emb=embedding)
+
+
+HANDLERS = {
+    USER_REGISTERED: _handle_user_registered,
+    OPENING_CREATED: _handle_opening_created,
+}
+
+
+# Openings created before they were embedded on create
+ENQUEUE_MISSING_OPENINGS_QUERY = f"""
+MATCH (o:Opening)
+WHERE o.embedding IS NULL
+  AND NOT EXISTS {{ MATCH (j:OutboxJob {{type: '{OPENING_CREATED}', opening_id: o.id}}) }}
+{enqueue_opening_job("randomUUID()")}
+RETURN count(*) AS queued
+"""
+
+
+def enqueue_missing_opening_embeddings():
+    """Startup pass: queues an embedding job for every opening that lacks one."""
+    session = db.get_session()
+    try:
+        record = session.run(ENQUEUE_MISSING_OPENINGS_QUERY).single()
+        if record and record["queued"]:
+            logger.info(f"Queued embeddings for {record['queued']} openings")
+    finally:
+        session.close()
+
+
+# ---------------------------------------------------------
+# Worker
+# ---------------------------------------------------------
+
+CLAIM_QUERY = """
+MATCH (j:OutboxJob)
+WHERE (j.status = 'pending' AND j.available_at <= datetime())
+   OR (j.status = 'processing' AND j.locked_at < datetime() - duration({seconds: $lease}))
+WITH j ORDER BY j.available_at LIMIT $limit
+SET j.status = 'processing', j.locked_at = datetime()
+RETURN j.id AS id, j.type AS type, j.user_id AS user_id, j.opening_id AS opening_id,
+       j.attempts AS attempts
+"""
+
+
+def _prefetch_embeddings(session, jobs):
+    """
+    Embeds every pending registration in the claimed batch with one model
+    call (bulk imports queue hundreds at once). Handlers fall back to a
+    single embedding for anything missing here.
+    """
+    ids = [job["user_id"] for job in jobs if job["type"] == USER_REGISTERED]
+    if len(ids) < 2:
+        return
+    try:
+        users = list(session.run("""
+        UNWIND $ids AS uid
+        MATCH (u:User {user_id: uid})
+        WHERE u.embedding_pending
+        RETURN u.user_id AS user_id, u.name AS name, u.role AS role, u.department AS department
+        """, ids=ids))
+        vectors = generate_embeddings([_profile_text(u) for u in users])
+    except Exception as e:
+        logger.error(f"Batch embedding for outbox jobs failed: {e}")
+        return
+    by_user = {u["user_id"]: vector for u, vector in zip(users, vectors) if vector}
+    for job in jobs:
+        if job["type"] == USER_REGISTERED and job["user_id"] in by_user:
+            job["embedding"] = by_user[job["user_id"]]
+
+
+def _retry_delay(attempts: int) -> int:
+    return min(settings.OUTBOX_RETRY_BASE_SECONDS * (2 ** attempts), 3600)
+
+
+def process_outbox(batch_size: int = None):
+    """
+    Claims due jobs and runs their handlers. Failed jobs are retried with
+    exponential backoff; after OUTBOX_MAX_ATTEMPTS they are parked as
+    'failed' for inspection. Jobs left 'processing' by a crashed worker
+    are reclaimed once their lease expires.
+    """
+    session = db.get_session()
+    try:
+        jobs = [r.data() for r in session.run(
+            CLAIM_QUERY,
+            limit=batch_size or settings.OUTBOX_BATCH_SIZE,
+            lease=settings.OUTBOX_LEASE_SECONDS,
+        )]
+        _prefetch_embeddings(session, jobs)
+
+        for job in jobs:
+            handler = HANDLERS.get(job["type"])
+            try:
+                if handler is None:
+                    raise RuntimeError(f"no handler for job type '{job['type']}'")
+                handler(session, job)
+                session.run("MATCH (j:OutboxJob {id: $id}) DELETE j", id=job["id"])
+            except Exception as e:
+                attempts = (job["attempts"] or 0) + 1
+                failed = attempts >= settings.OUTBOX_MAX_ATTEMPTS
+                logger.error(f"Outbox job {job['id']} ({job['type']}) attempt {attempts} failed: {e}")
+                session.run("""
+                MATCH (j:OutboxJob {id: $id})
+                SET j.attempts = $attempts,
+                    j.last_error = $error,
+                    j.status = $status,
+                    j.available_at = datetime() + duration({seconds: $delay})
+                REMOVE j.locked_at
+                """, id=job["id"], attempts=attempts, error=str(e)[:500],
+                     status="failed" if failed else "pending", delay=_retry_delay(attempts))
+        return len(jobs)
+    finally:
+        session.close()
@@ -0,0 +1,126 @@
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Internal / bulky User properties never copied into the profile document
+PRIVATE_FIELDS = {"password_hash", "embedding", "embedding_pending", "profile_doc", "profile_doc_at",
+                  "unread_count"}
+
+BUILD_QUERY = """
+MATCH (u:User {user_id: $uid})
+CALL {
+    WITH u
+    OPTIONAL MATCH (u)-[:HAS_SKILL]->(s:Concept)
+    RETURN collect(DISTINCT s.name) AS skills
+}
+CALL {
+    WITH u
+    OPTIONAL MATCH (u)-[:INTERESTED_IN]->(i:Concept)
+    RETURN collect(DISTINCT i.name) AS interests
+}
+CALL {
+    WITH u
+    OPTIONAL MATCH (u)-[rel:WORKED_ON|PUBLISHED|LED_PROJECT|COMPLETED|AUTHORED]->(w:Work)
+    RETURN collect(CASE WHEN w IS NULL THEN NULL ELSE {rel: type(rel), work: properties(w)} END) AS works
+}
+CALL {
+    WITH u
+    OPTIONAL MATCH (u)-[:POSTED]->(o:Opening)
+    WITH o ORDER BY o.created_at DESC
+    RETURN collect(CASE WHEN o IS NULL THEN NULL ELSE {
+        id: o.id, title: o.title, description: o.description,
+        collaboration_type: o.collaboration_type
+    } END) AS openings
+}
+RETURN labels(u) AS labels, properties(u) AS user, skills, interests, works, openings
+"""
+
+
+def _jsonable(value):
+    if isinstance(value, dict):
+        return {k: _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def build_profile_document(session, user_id: str):
+    """
+    Collects everything the profile views need into one denormalized
+    document. Returns None if the user doesn't exist.
+    """
+    record = session.run(BUILD_QUERY, uid=user_id).single()
+    if not record:
+        return None
+
+    works = []
+    for item in record["works"]:
+        work = _jsonable(item["work"])
+        work["rel"] = item["rel"]
+        works.append(work)
+
+    return {
+        "labels": record["labels"],
+        "user": _jsonable({k: v for k, v in record["user"].items() if k not in PRIVATE_FIELDS}),
+        "skills": record["skills"],
+        "interests": record["interests"],
+        "works": works,
+        "openings": record["openings"],
+    }
+
+
+def refresh_profile_document(session, user_id: str):
+    """
+    Rebuilds and stores the profile document on the User node.
+    Call after any committed write that changes what a profile shows.
+    """
+    doc = build_profile_document(session, user_id)
+    if doc is None:
+        return None
+    session.run(
+        "MATCH (u:User {user_id: $uid}) SET u.profile_doc = $doc, u.profile_doc_at = datetime()",
+        uid=user_id, doc=json.dumps(doc),
+    )
+    return doc
+
+
+def get_profile_document(session, user_id: str):
+    """
+    Profile read path: a single indexed lookup of the stored document.
+    Users without one yet (created before projections existed) get it
+    built on first read.
+    """
+    record = session.run(
+        "MATCH (u:User {user_id: $uid}) RETURN u.profile_doc AS doc", uid=user_id
+    ).single()
+    if not record:
+        return None
+    if record["doc"]:
+        try:
+            return json.loads(record["doc"])
+        except ValueError:
+            logger.warning(f"Corrupt profile document for {user_id}, rebuilding")
+    return refresh_profile_document(session, user_id)
+
+
+def refresh_profile_safely(session, user_id: str):
+    """Best-effort refresh after a write; a failure only means a rebuild on next read."""
+    try:
+        refresh_profile_document(session, user_id)
+    except Exception as e:
+        logger.error(f"Profile projection refresh failed for {user_id}: {e}")
+        try:
+            session.run("MATCH (u:User {user_id: $uid}) REMOVE u.profile_doc", uid=user_id)
+        except Exception:
+            pass
+
+
+def works_with(doc, rels, work_type=None):
+    """Works linked by one of `rels` (optionally of one `type`), in stored order."""
+    return [
+        w for w in doc["works"]
+        if w["rel"] in rels and (work_type is None or w.get("type") == work_type)
+    ]
@@ -467,7 +467,9 @@
 
 import logging
 from app.core.database import db
+from app.core.config import settings
 from app.services.embedding import generate_embedding
+from app.services.vector_index import vector_index
 
 logger = logging.getLogger(__name__)
 
@@ -557,7 +559,7 @@ def recommend_openings_for_student(student_id: str, limit: int = 5):
         OPTIONAL MATCH (s)-[:HAS_SKILL]->(skill:Concept)
         WITH s, collect(id(skill)) AS skill_ids
 
-        MATCH (o:Opening)-[:REQUIRES]->(req:Concept)
+        MATCH (o:ActiveOpening)-[:REQUIRES]->(req:Concept)
         WITH o, skill_ids, collect(id(req)) AS req_ids
 
         WITH o,
@@ -621,60 +623,129 @@ def recommend_faculty_for_student(student_id: str, limit: int = 5):
 # 3. SEMANTIC SEARCH (VECTOR-BASED)
 # ============================================================================
 
-def semantic_search_students(query: str, limit: int = 5):
+# Candidate pool multipliers tried in turn when filters discard vector hits
+OVERSAMPLE_FACTORS = (4, 16, 64)
+
+
+def _filter_clause(department=None, batch=None, min_cgpa=None):
+    conditions, params = [], {}
+    if department:
+        conditions.append("node.department = $department")
+        params["department"] = department
+    if batch:
+        conditions.append("node.batch = $batch")
+        params["batch"] = batch
+    if min_cgpa is not None:
+        conditions.append("node.cgpa >= $min_cgpa")
+        params["min_cgpa"] = min_cgpa
+    return " AND ".join(conditions), params
+
+
+def _vector_query(index_name: str, return_clause: str, embedding, limit: int, **filters):
+    """
+    Runs db.index.vector.queryNodes with the filters pushed into the query.
+    queryNodes ranks before filtering, so a filtered query asks for
+    limit x 4, x 16, ... candidates until `limit` rows survive or the
+    VECTOR_SEARCH_MAX_CANDIDATES budget is spent.
+    """
+    where, params = _filter_clause(**filters)
+    budget = max(settings.VECTOR_SEARCH_MAX_CANDIDATES, limit)
+    factors = OVERSAMPLE_FACTORS if where else (1,)
+
+    cypher = f"""
+    CALL db.index.vector.queryNodes('{index_name}', $candidates, $embedding)
+    YIELD node, score
+    {"WHERE " + where if where else ""}
+    RETURN {return_clause},
+           round(score * 100, 2) AS similarity_score
+    ORDER BY similarity_score DESC
+    LIMIT $limit
+    """
+
+    session = db.get_session()
+    try:
+        results = []
+        for factor in factors:
+            candidates = min(limit * factor, budget)
+            results = [r.data() for r in session.run(
+                cypher, embedding=embedding, candidates=candidates, limit=limit, **params
+            )]
+            if len(results) >= limit or candidates >= budget:
+                break
+        return results
+    finally:
+        session.close()
+
+
+def _local_search(embedding, limit, role, id_key, **filters):
+    """Serves a semantic search from the in-process vector index."""
+    results = []
+    for user_id, score, payload in vector_index.search(embedding, limit, role=role, **filters):
+        row = {
+            id_key: user_id,
+            "name": payload.get("name"),
+            "dept": payload.get("department"),
+            "pic": payload.get("profile_picture"),
+            "similarity_score": round(score * 100, 2),
+        }
+        if role == "student":
+            row["batch"] = payload.get("batch")
+        else:
+            row["designation"] = payload.get("designation")
+        results.append(row)
+    return results
+
+
+def semantic_search_students(query: str, limit: int = 5, department: str = None,
+                             batch: str = None, min_cgpa: float = None):
     embedding = generate_embedding(query)
     if not embedding:
         return []
 
-    session = db.get_session()
+    filters = {"department": department, "batch": batch, "min_cgpa": min_cgpa}
     try:
-        cypher = """
-        CALL db.index.vector.queryNodes(
-            'student_bio_index',
-            $limit,
-            $embedding
-        )
-        YIELD node, score
-        RETURN node.user_id AS student_id,
+        results = _vector_query(
+            "student_bio_index",
+            """node.user_id AS student_id,
                node.name AS name,
                node.department AS dept,
-               node.profile_picture AS pic,
-               round(score * 100, 2) AS similarity_score
-        ORDER BY similarity_score DESC
-        """
-        return [r.data() for r in session.run(cypher, embedding=embedding, limit=limit)]
+               node.batch AS batch,
+               node.profile_picture AS pic""",
+            embedding, limit, **filters
+        )
     except Exception as e:
         logger.error(f"semantic_search_students error: {e}")
-        return []
-    finally:
-        session.close()
+        results = []
+
+    # Index missing, or the oversampling budget ran out: the local index is exact
+    if len(results) < limit and vector_index.ready:
+        local = _local_search(embedding, limit, "student", "student_id", **filters)
+        if len(local) > len(results):
+            return local
+    return results
 
 
-def semantic_search_faculty(query: str, limit: int = 5):
+def semantic_search_faculty(query: str, limit: int = 5, department: str = None):
     embedding = generate_embedding(query)
     if not embedding:
         return []
 
-    session = db.get_session()
     try:
-        cypher = """
-        CALL db.index.vector.queryNodes(
-            'faculty_research_index',
-            $limit,
-            $embedding
-        )
-        YIELD node, score
-        RETURN node.user_id AS faculty_id,
+        results = _vector_query(
+            "faculty_research_index",
+            """node.user_id AS faculty_id,
                node.name AS name,
                node.department AS dept,
                node.designation AS designation,
-               node.profile_picture AS pic,
-               round(score * 100, 2) AS similarity_score
-        ORDER BY similarity_score DESC
-        """
-        return [r.data() for r in session.run(cypher, embedding=embedding, limit=limit)]
+               node.profile_picture AS pic""",
+            embedding, limit, department=department
+        )
     except Exception as e:
         logger.error(f"semantic_search_faculty error: {e}")
-        return []
-    finally:
-        session.close()
+        results = []
+
+    if len(results) < limit and vector_index.ready:
+        local = _local_search(embedding, limit, "faculty", "faculty_id", department=department)
+        if len(local) > len(results):
+            return local
+    return results
@@ -0,0 +1,74 @@
+import numpy as np
+
+
+def normalize(vector) -> np.ndarray:
+    """Returns `vector` as a unit-length float32 array (zeros stay zeros)."""
+    vec = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+
+def normalize_rows(vectors, dim: int = None) -> np.ndarray:
+    """
+    Stacks `vectors` into a float32 matrix with unit-length rows.
+    Missing vectors (or ones whose length differs from `dim`) become zero
+    rows, so they score 0 against everything instead of raising.
+    """
+    vectors = list(vectors)
+    if dim is None:
+        dim = next((len(v) for v in vectors if v is not None and len(v)), 0)
+
+    matrix = np.zeros((len(vectors), dim), dtype=np.float32)
+    for i, vec in enumerate(vectors):
+        if vec is not None and len(vec) == dim:
+            matrix[i] = vec
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix /= norms
+    return matrix
+
+
+def one_vs_many(query: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """Cosine scores of a normalized query against normalized rows (one BLAS call)."""
+    if matrix.size == 0 or query.shape[0] != matrix.shape[1]:
+        return np.zeros(matrix.shape[0], dtype=np.float32)
+    return matrix @ query
+
+
+def many_vs_many(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Cosine score matrix between two sets of normalized rows (one BLAS call)."""
+    return a @ b.T
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the `k` highest scores, best first."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.zeros(0, dtype=np.intp)
+    idx = np.argpartition(-scores, k - 1)[:k]
+    return idx[np.argsort(-scores[idx], kind="stable")]
+
+
+class EmbeddingMatrix:
+    """
+    A fixed set of vectors kept pre-normalized as one float32 matrix, so
+    ranking candidates against a query costs a single matrix-vector product.
+    """
+
+    def __init__(self, ids, vectors, dim: int = None):
+        self.ids = list(ids)
+        self.matrix = normalize_rows(vectors, dim)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def scores(self, query) -> np.ndarray:
+        if query is None or len(query) == 0:
+            return np.zeros(len(self.ids), dtype=np.float32)
+        return one_vs_many(normalize(query), self.matrix)
+
+    def top_k(self, query, k: int):
+        """[(id, cosine), ...] for the `k` best rows."""
+        scores = self.scores(query)
+        return [(self.ids[i], float(scores[i])) for i in top_k(scores, k)]
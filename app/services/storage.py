@@ -0,0 +1,203 @@
+import logging
+import os
+import shutil
+import tempfile
+import uuid
+
+from fastapi import HTTPException, Request, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from starlette.datastructures import UploadFile as StarletteUploadFile
+from starlette.formparsers import MultiPartException, MultiPartParser
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_PICTURE_FOLDER = "guru_setu_profiles"
+
+# Leading bytes of the image formats we accept -> stored extension.
+# The client's Content-Type and filename are never trusted.
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", "jpg"),
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"GIF87a", "gif"),
+    (b"GIF89a", "gif"),
+)
+
+# Uploads stay in memory up to this size, then spill to a temp file
+SPOOL_BYTES = 1024 * 1024
+
+# Room for the multipart boundaries and part headers around the file
+MULTIPART_OVERHEAD_BYTES = 16 * 1024
+
+
+def sniff_image_type(head: bytes):
+    """Extension of the image format `head` starts with, or None."""
+    for signature, ext in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return ext
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"Upload exceeds {max_bytes // (1024 * 1024)} MB")
+
+
+async def _capped_body(request: Request, limit: int, max_bytes: int):
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > limit:
+            raise _too_large(max_bytes)
+        yield chunk
+
+
+async def parse_upload_form(request: Request, field: str = "file", max_bytes: int = None):
+    """
+    Parses a multipart body holding one file in `field`, enforcing the
+    upload cap on the raw body: an oversized Content-Length is rejected
+    (413) before anything is read, and the stream is cut off once it passes
+    the cap, so nothing larger ever reaches the spooled form. Returns
+    (form, upload); the caller closes the form.
+    """
+    max_bytes = max_bytes or settings.UPLOAD_MAX_BYTES
+    limit = max_bytes + MULTIPART_OVERHEAD_BYTES
+
+    length = request.headers.get("content-length")
+    if length is not None:
+        if not length.isdigit():
+            raise HTTPException(status_code=400, detail="Invalid Content-Length")
+        if int(length) > limit:
+            raise _too_large(max_bytes)
+    if not request.headers.get("content-type", "").startswith("multipart/form-data"):
+        raise HTTPException(status_code=415, detail="Expected multipart/form-data")
+
+    parser = MultiPartParser(request.headers, _capped_body(request, limit, max_bytes), max_files=1, max_fields=10)
+    try:
+        form = await parser.parse()
+    except MultiPartException as e:
+        raise HTTPException(status_code=400, detail=e.message)
+
+    upload = form.get(field)
+    if not isinstance(upload, StarletteUploadFile):
+        await form.close()
+        raise HTTPException(status_code=422, detail=f"Missing file field '{field}'")
+    return form, upload
+
+
+async def read_upload(file: UploadFile, max_bytes: int = None, chunk_bytes: int = None):
+    """
+    Copies an upload into a spooled temp file chunk by chunk, rejecting it
+    (413) as soon as it passes `max_bytes` and (415) unless its leading
+    bytes are a supported image. Returns (file object at offset 0, extension).
+    """
+    max_bytes = max_bytes or settings.UPLOAD_MAX_BYTES
+    chunk_bytes = chunk_bytes or settings.UPLOAD_CHUNK_BYTES
+
+    buffer = tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES)
+    size, ext = 0, None
+    try:
+        while True:
+            chunk = await file.read(chunk_bytes)
+            if not chunk:
+                break
+            if ext is None:
+                # First chunk is always >= 12 bytes for any real image
+                ext = sniff_image_type(chunk)
+                if ext is None:
+                    raise HTTPException(status_code=415, detail="Upload must be a JPEG, PNG, GIF or WebP image")
+            size += len(chunk)
+            if size > max_bytes:
+                raise HTTPException(status_code=413, detail=f"Upload exceeds {max_bytes // (1024 * 1024)} MB")
+            buffer.write(chunk)
+    except BaseException:
+        buffer.close()
+        raise
+
+    if ext is None:
+        buffer.close()
+        raise HTTPException(status_code=400, detail="Empty upload")
+    buffer.seek(0)
+    return buffer, ext
+
+
+# ---------------------------------------------------------
+# Backends
+# ---------------------------------------------------------
+
+class LocalStorage:
+    """Writes under LOCAL_UPLOAD_DIR, which main.py serves at /uploads."""
+
+    name = "local"
+
+    def __init__(self, root: str, base_url: str):
+        self.root = root
+        self.base_url = base_url.rstrip("/")
+
+    def _write(self, data, folder: str, filename: str):
+        directory = os.path.join(self.root, folder)
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, filename), "wb") as out:
+            shutil.copyfileobj(data, out)
+
+    async def save(self, data, ext: str, folder: str) -> str:
+        filename = f"{uuid.uuid4().hex}.{ext}"
+        await run_in_threadpool(self._write, data, folder, filename)
+        return f"{self.base_url}/{folder}/{filename}"
+
+
+class CloudinaryStorage:
+    """Uploads to Cloudinary; the blocking SDK call runs on the threadpool, never the event loop."""
+
+    name = "cloudinary"
+
+    def __init__(self):
+        import cloudinary
+        import cloudinary.uploader
+
+        cloudinary.config(
+            cloud_name=settings.CLOUDINARY_CLOUD_NAME,
+            api_key=settings.CLOUDINARY_API_KEY,
+            api_secret=settings.CLOUDINARY_API_SECRET,
+            secure=True
+        )
+        self._uploader = cloudinary.uploader
+
+    async def save(self, data, ext: str, folder: str) -> str:
+        result = await run_in_threadpool(
+            self._uploader.upload,
+            data,
+            folder=folder,
+            transformation=[{"width": 400, "height": 400, "crop": "fill", "gravity": "face"}],
+        )
+        return result.get("secure_url")
+
+
+_storage = None
+
+
+def get_storage():
+    """The configured backend (STORAGE_BACKEND); Cloudinary without credentials falls back to local."""
+    global _storage
+    if _storage is None:
+        backend = settings.STORAGE_BACKEND.lower()
+        has_cloudinary = all([settings.CLOUDINARY_CLOUD_NAME, settings.CLOUDINARY_API_KEY,
+                              settings.CLOUDINARY_API_SECRET])
+        if backend == "cloudinary" and has_cloudinary:
+            _storage = CloudinaryStorage()
+        else:
+            if backend == "cloudinary":
+                logger.warning("Cloudinary credentials missing; storing uploads on local disk")
+            _storage = LocalStorage(settings.LOCAL_UPLOAD_DIR, settings.LOCAL_UPLOAD_BASE_URL)
+    return _storage
+
+
+async def store_image(file: UploadFile, folder: str) -> str:
+    """Validates and stores an uploaded image; returns its public URL."""
+    data, ext = await read_upload(file)
+    try:
+        return await get_storage().save(data, ext, folder)
+    finally:
+        data.close()
@@ -0,0 +1,193 @@
+import logging
+import threading
+import numpy as np
+
+from app.core.database import db
+from app.services.bitmap_index import BitmapIndex, bitmap_to_mask
+from app.services.similarity import normalize, one_vs_many, top_k
+
+logger = logging.getLogger(__name__)
+
+# Display fields kept next to each vector so fallback results match the
+# shape of the Neo4j vector search results.
+PAYLOAD_FIELDS = ("name", "department", "batch", "designation", "profile_picture", "cgpa")
+
+
+class VectorIndex:
+    """
+    In-process flat (exact) vector index over User embeddings.
+
+    Rows hold pre-normalized float32 vectors; role, department and batch
+    live in a BitmapIndex (CGPA in a parallel float array) so filters are
+    applied *before* scoring and top-k stays correct however selective
+    they are. Used as the fallback when the Neo4j vector index is missing
+    or can't satisfy a filtered query.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._cgpa = np.zeros(0, dtype=np.float32)
+        self._ids = []
+        self._rows = {}
+        self._payloads = []
+        self._alive = 0
+        self._filters = BitmapIndex()
+        self.ready = False
+
+    @property
+    def size(self) -> int:
+        return self._alive.bit_count()
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def load_from_graph(self):
+        """Rebuilds the index from every User node that has an embedding."""
+        session = db.get_session()
+        try:
+            query = """
+            MATCH (u:User)
+            WHERE u.embedding IS NOT NULL AND size(u.embedding) > 0
+            RETURN u.user_id AS user_id, u.role AS role, u.embedding AS embedding,
+                   u.name AS name, u.department AS department, u.batch AS batch,
+                   u.designation AS designation, u.profile_picture AS profile_picture,
+                   u.cgpa AS cgpa
+            """
+            fresh = VectorIndex()
+            for r in session.run(query):
+                record = r.data()
+                fresh.upsert(
+                    record.pop("user_id"),
+                    record.pop("role"),
+                    record.pop("embedding"),
+                    **record,
+                )
+        finally:
+            session.close()
+
+        with self._lock:
+            self.__dict__.update({k: v for k, v in fresh.__dict__.items() if k != "_lock"})
+            self.ready = True
+        logger.info(f"Vector index loaded with {self.size} embeddings")
+
+    def upsert(self, user_id: str, role: str, embedding, **payload):
+        """Adds or replaces a user's vector and filter attributes."""
+        if not user_id or not embedding:
+            return
+        vec = normalize(embedding)
+        if not vec.any():
+            return
+
+        with self._lock:
+            if self._matrix.shape[1] not in (0, vec.shape[0]):
+                logger.warning(f"Skipping embedding for {user_id}: dimension {vec.shape[0]} != {self._matrix.shape[1]}")
+                return
+
+            row = self._rows.get(user_id)
+            if row is None:
+                row = len(self._ids)
+                self._grow(row + 1, vec.shape[0])
+                self._ids.append(user_id)
+                self._payloads.append({})
+                self._rows[user_id] = row
+
+            self._matrix[row] = vec
+            self._alive |= 1 << row
+            self._set_attributes(row, role, payload)
+
+    def update_attributes(self, user_id: str, **payload):
+        """
+        Refreshes filter/display attributes of an indexed user (e.g. after a
+        profile edit). Every given field replaces the old value; None clears it.
+        """
+        with self._lock:
+            row = self._rows.get(user_id)
+            if row is None:
+                return
+            merged = {**self._payloads[row], **payload}
+            self._set_attributes(row, merged.pop("role", None), merged)
+
+    def remove(self, user_id: str):
+        with self._lock:
+            row = self._rows.get(user_id)
+            if row is None:
+                return
+            self._alive &= ~(1 << row)
+            self._filters.clear_row(row)
+
+    def _set_attributes(self, row, role, payload):
+        attrs = {k: payload.get(k) for k in PAYLOAD_FIELDS}
+        attrs["role"] = (role or self._payloads[row].get("role") or "").lower() or None
+        self._payloads[row] = attrs
+        self._cgpa[row] = _as_float(attrs["cgpa"])
+        self._filters.set_row(row, {
+            "role": attrs["role"],
+            "department": attrs["department"],
+            "batch": attrs["batch"],
+        })
+
+    def _grow(self, rows_needed, dim):
+        capacity = self._matrix.shape[0]
+        if rows_needed <= capacity:
+            return
+        new_capacity = max(rows_needed, capacity * 2, 64)
+        grown = np.zeros((new_capacity, dim), dtype=np.float32)
+        grown[:capacity] = self._matrix
+        self._matrix = grown
+
+        cgpa = np.full(new_capacity, np.nan, dtype=np.float32)
+        cgpa[:capacity] = self._cgpa
+        self._cgpa = cgpa
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def search(self, embedding, k: int, role: str = None, department: str = None,
+               batch: str = None, min_cgpa: float = None):
+        """
+        Exact top-k cosine search restricted to rows matching every filter.
+        Returns [(user_id, score, payload)] with Neo4j-compatible scores
+        ((1 + cosine) / 2), best first.
+        """
+        if not embedding or k <= 0:
+            return []
+        query = normalize(embedding)
+        if not query.any():
+            return []
+
+        with self._lock:
+            if self._matrix.shape[1] != query.shape[0]:
+                return []
+            bits = self._filters.match(
+                {"role": role.lower() if role else None, "department": department, "batch": batch},
+                self._alive,
+            )
+            if not bits:
+                return []
+            rows = np.flatnonzero(bitmap_to_mask(bits, len(self._ids)))
+            if min_cgpa is not None:
+                # NaN (no CGPA on record) never passes, like a null in Cypher
+                rows = rows[self._cgpa[rows] >= min_cgpa]
+                if len(rows) == 0:
+                    return []
+            scores = one_vs_many(query, self._matrix[rows])
+            return [
+                (self._ids[rows[i]], (1.0 + float(scores[i])) / 2.0, dict(self._payloads[rows[i]]))
+                for i in top_k(scores, k)
+            ]
+
+
+def _as_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+vector_index = VectorIndex()